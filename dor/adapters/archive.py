@@ -0,0 +1,211 @@
+import hashlib
+import io
+import mmap
+import re
+import tarfile
+import zipfile
+from pathlib import Path
+from typing import BinaryIO, Iterable
+
+import orjson
+
+INDEX_NAME = "index.json"
+CACHE_NAME = re.compile(r"[0-9a-f]{32}(\.json)?")
+COMPRESSED_MAGIC = {
+    b"\x1f\x8b": "gzip",
+    b"BZh": "bzip2",
+    b"\xfd7zXZ\x00": "xz",
+}
+
+
+class ArchiveMiss(LookupError):
+    """A URL the archive has no response for; an archive never falls back to the network."""
+
+
+def url_key(url: str) -> str:
+    """The name `dor.utils.get_cache_filename` gives the response for `url`."""
+    return hashlib.md5(url.encode("UTF-8")).hexdigest()
+
+
+class MappedMember(io.RawIOBase):
+    """A read-only stream over a slice of a memory-mapped file; nothing is copied until it's read."""
+
+    def __init__(self, view: memoryview):
+        self._view = view
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        size = min(len(buffer), len(self._view) - self._position)
+        buffer[:size] = self._view[self._position:self._position + size]
+        self._position += size
+        return size
+
+    def close(self):
+        self._view.release()
+        super().close()
+
+
+class IIIFArchive:
+    """
+    IIIF JSON harvested ahead of time, looked up by the URL it came from.
+
+    An archive member is found through `index.json`, a map of URLs to
+    member names, or else by its cache name: the md5 of its URL, the way
+    `tmp/cache` names responses. So `tmp/cache` itself, or a tar or zip of
+    it, is an archive.
+    """
+
+    path: Path
+
+    def __init__(self, path: Path):
+        self.path = path
+        # URLs, and cache names, to member names
+        self._index: dict[str, str] = {}
+
+    def _add_names(self, names: Iterable[str]):
+        for name in names:
+            # by cache name, wherever it sits in the tree
+            if CACHE_NAME.fullmatch(Path(name).name):
+                self._index[Path(name).name.removesuffix(".json")] = name
+
+    def _load_index(self, index: dict[str, str]):
+        self._index.update(index)
+
+    def member(self, url: str) -> str:
+        name = self._index.get(url) or self._index.get(url_key(url))
+        if name is None:
+            raise ArchiveMiss(f"{url} is not in the archive {self.path}")
+        return name
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._index or url_key(url) in self._index
+
+    def __len__(self) -> int:
+        return len(set(self._index.values()))
+
+    def open_member(self, name: str) -> BinaryIO:
+        raise NotImplementedError
+
+    def read_member(self, name: str) -> bytes | memoryview:
+        with self.open_member(name) as f:
+            return f.read()
+
+    def open(self, url: str) -> BinaryIO:
+        """A stream of the response for `url`."""
+        return self.open_member(self.member(url))
+
+    def read_json(self, url: str):
+        return orjson.loads(self.read_member(self.member(url)))
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class DirectoryArchive(IIIFArchive):
+    def __init__(self, path: Path):
+        super().__init__(path)
+        self._add_names(str(file.relative_to(path)) for file in path.rglob("*") if file.is_file())
+        if (path / INDEX_NAME).exists():
+            self._load_index(orjson.loads((path / INDEX_NAME).read_bytes()))
+
+    def open_member(self, name: str) -> BinaryIO:
+        return open(self.path / name, "rb")
+
+    def read_member(self, name: str) -> bytes:
+        return (self.path / name).read_bytes()
+
+
+class TarArchive(IIIFArchive):
+    """
+    An uncompressed tar, memory-mapped: members are read in place from the
+    page cache, and threads reading side by side don't share a file position.
+    """
+
+    def __init__(self, path: Path):
+        super().__init__(path)
+        with open(path, "rb") as f:
+            magic = f.read(6)
+            for prefix, compression in COMPRESSED_MAGIC.items():
+                if magic.startswith(prefix):
+                    raise ValueError(
+                        f"{path} is {compression}-compressed, so its members can't be read in place; "
+                        f"decompress it, or use a zip"
+                    )
+            f.seek(0)
+            with tarfile.open(fileobj=f, mode="r:") as tar:
+                self._members = {
+                    member.name.removeprefix("./"): (member.offset_data, member.size)
+                    for member in tar if member.isfile()
+                }
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if self._members else None
+        self._add_names(self._members)
+        if INDEX_NAME in self._members:
+            self._load_index(orjson.loads(self.read_member(INDEX_NAME)))
+
+    def _view(self, name: str) -> memoryview:
+        offset, size = self._members[name]
+        return memoryview(self._map)[offset:offset + size]
+
+    def open_member(self, name: str) -> BinaryIO:
+        return io.BufferedReader(MappedMember(self._view(name)))
+
+    def read_member(self, name: str) -> memoryview:
+        return self._view(name)
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+
+
+class ZipArchive(IIIFArchive):
+    """A zip, read a member at a time; deflated members are inflated as they stream."""
+
+    def __init__(self, path: Path):
+        super().__init__(path)
+        self._zip = zipfile.ZipFile(path)
+        names = [info.filename for info in self._zip.infolist() if not info.is_dir()]
+        self._add_names(names)
+        if INDEX_NAME in names:
+            self._load_index(orjson.loads(self._zip.read(INDEX_NAME)))
+
+    def open_member(self, name: str) -> BinaryIO:
+        return self._zip.open(name)
+
+    def close(self):
+        self._zip.close()
+
+
+def open_archive(path: Path) -> IIIFArchive:
+    """The archive at `path`: a directory, a tar or a zip."""
+    if path.is_dir():
+        return DirectoryArchive(path)
+    if zipfile.is_zipfile(path):
+        return ZipArchive(path)
+    if path.is_file() and tarfile.is_tarfile(path):
+        return TarArchive(path)
+    raise ValueError(f"{path} is not a directory, tar or zip")
+
+
+def write_archive(path: Path, responses: Iterable[tuple[str, Path]]) -> int:
+    """
+    Writes (URL, response file) pairs to a zip at `path`, named by cache
+    name, with an `index.json` of their URLs; returns how many were written.
+    """
+    index = {}
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for url, response_path in responses:
+            if url in index:
+                continue
+            index[url] = f"{url_key(url)}.json"
+            archive.write(response_path, index[url])
+        archive.writestr(INDEX_NAME, orjson.dumps(index, option=orjson.OPT_INDENT_2))
+    return len(index)
@@ -0,0 +1,129 @@
+from collections import Counter
+from dataclasses import dataclass, field
+
+from sqlalchemy import Table, text
+from sqlalchemy.orm import Session
+
+from dor.models.checksum import Checksum
+from dor.models.intellectual_object import IntellectualObject
+from dor.models.object_file import ObjectFile
+from dor.models.premis_event import PremisEvent
+
+
+def supports_copy(session: Session) -> bool:
+    return session.get_bind().dialect.name == "postgresql"
+
+
+@dataclass
+class CopyLoader:
+    """
+    Writes the high-volume children of an intellectual object ---
+    object files, checksums and PREMIS events --- with PostgreSQL COPY
+    instead of ORM INSERTs.
+
+    `detach` strips those children off the object graph and has to run
+    before the object is added to the session; `copy` runs after the
+    session has been flushed, so the object and fileset ids are known.
+
+        loader = CopyLoader()
+        loader.detach(intellectual_object)
+        session.add(intellectual_object)
+        session.flush()
+        loader.copy(session)
+    """
+
+    object_files: list[ObjectFile] = field(default_factory=list)
+    checksums: list[Checksum] = field(default_factory=list)
+    premis_events: list[PremisEvent] = field(default_factory=list)
+
+    # each detached row remembers the parent it belonged to
+    _object_file_parents: list[tuple] = field(default_factory=list)
+    _checksum_parents: list[ObjectFile] = field(default_factory=list)
+    _premis_event_parents: list[tuple] = field(default_factory=list)
+
+    def detach(self, intellectual_object: IntellectualObject):
+        for event in intellectual_object.premis_events:
+            self._add_premis_event(event, intellectual_object=intellectual_object)
+        intellectual_object.premis_events = []
+
+        for object_file in list(intellectual_object.object_files):
+            self._add_object_file(object_file, intellectual_object=intellectual_object)
+        intellectual_object.object_files = []
+
+        for fileset in intellectual_object.filesets:
+            for event in fileset.premis_events:
+                self._add_premis_event(event, fileset=fileset)
+            fileset.premis_events = []
+
+            for object_file in list(fileset.object_files):
+                self._add_object_file(object_file, fileset=fileset)
+            fileset.object_files = []
+
+    def _add_object_file(self, object_file: ObjectFile, intellectual_object=None, fileset=None):
+        self.object_files.append(object_file)
+        self._object_file_parents.append((intellectual_object, fileset))
+
+        for checksum in object_file.checksums:
+            self.checksums.append(checksum)
+            self._checksum_parents.append(object_file)
+        object_file.checksums = []
+
+        for event in object_file.premis_events:
+            self._add_premis_event(event, object_file=object_file)
+        object_file.premis_events = []
+
+    def _add_premis_event(self, event: PremisEvent, intellectual_object=None, fileset=None, object_file=None):
+        self.premis_events.append(event)
+        self._premis_event_parents.append((intellectual_object, fileset, object_file))
+
+    def copy(self, session: Session) -> Counter:
+        """COPY every detached row in the session's transaction; returns rows per table."""
+        # COPY can't hand back generated keys, so object file ids are
+        # reserved from the sequence up front for the FKs that point at them
+        object_file_ids = self._reserve_ids(session, ObjectFile.__table__, len(self.object_files))
+        for object_file, object_file_id, (intellectual_object, fileset) in zip(
+            self.object_files, object_file_ids, self._object_file_parents
+        ):
+            object_file.id = object_file_id
+            object_file.intellectual_object_id = intellectual_object.id if intellectual_object else None
+            object_file.fileset_id = fileset.id if fileset else None
+
+        for checksum, object_file in zip(self.checksums, self._checksum_parents):
+            checksum.object_file_id = object_file.id
+
+        for event, (intellectual_object, fileset, object_file) in zip(
+            self.premis_events, self._premis_event_parents
+        ):
+            event.intellectual_object_id = intellectual_object.id if intellectual_object else None
+            event.fileset_id = fileset.id if fileset else None
+            event.object_file_id = object_file.id if object_file else None
+
+        rows = Counter()
+        dbapi_connection = session.connection().connection.dbapi_connection
+        with dbapi_connection.cursor() as cursor:
+            for table, instances, with_id in [
+                (ObjectFile.__table__, self.object_files, True),
+                (Checksum.__table__, self.checksums, False),
+                (PremisEvent.__table__, self.premis_events, False),
+            ]:
+                if instances:
+                    rows[table.name] += self._copy_table(cursor, table, instances, with_id)
+        return rows
+
+    @staticmethod
+    def _reserve_ids(session: Session, table: Table, count: int) -> list[int]:
+        if count == 0:
+            return []
+        query = text(
+            "SELECT nextval(pg_get_serial_sequence(:table_name, 'id')) FROM generate_series(1, :count)"
+        )
+        return list(session.execute(query, {"table_name": table.name, "count": count}).scalars())
+
+    @staticmethod
+    def _copy_table(cursor, table: Table, instances: list, with_id: bool) -> int:
+        columns = [column for column in table.columns if with_id or not column.primary_key]
+        column_names = ", ".join(column.name for column in columns)
+        with cursor.copy(f"COPY {table.name} ({column_names}) FROM STDIN") as copy:
+            for instance in instances:
+                copy.write_row([getattr(instance, column.key) for column in columns])
+        return len(instances)
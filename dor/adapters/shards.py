@@ -0,0 +1,124 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, TypeVar
+from uuid import UUID
+
+from sqlalchemy import Connection, Engine
+from sqlalchemy.orm import Session
+
+T = TypeVar("T")
+
+
+@dataclass
+class ShardRouter:
+    """
+    Partitions the catalog across `engines` by `bin_identifier`: every
+    revision of an object, with its filesets, files and events, lives on
+    `bin_identifier.int % len(engines)`. The identifiers are UUIDs (hashes,
+    for harvested objects) so their low bits spread objects evenly.
+    Collections are small and replicated to every shard.
+    """
+    engines: list[Engine]
+    # for scatter-gather reads; SQLite and psycopg release the GIL while they wait
+    max_workers: int | None = None
+    _executor: ThreadPoolExecutor = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers or 4 * len(self.engines), thread_name_prefix="dor-shard"
+        )
+
+    @property
+    def num_shards(self) -> int:
+        return len(self.engines)
+
+    def shard_for(self, bin_identifier: UUID) -> int:
+        return bin_identifier.int % self.num_shards
+
+    def session(self, binds: list[Engine | Connection] | None = None) -> "ShardedSession":
+        """A session per shard, bound to the shard engines or to `binds`, e.g. connections in bulk-load mode."""
+        return ShardedSession(self, binds=binds)
+
+    def dispose(self):
+        self._executor.shutdown(wait=True)
+        for engine in self.engines:
+            engine.dispose()
+
+
+class ShardedSession:
+    """
+    One ORM session per shard, used where a catalog manager expects a
+    session: point lookups go to a single shard with `route`, listings run
+    on every shard at once with `scatter` and are merged by the caller.
+    Each session is only ever used by one thread at a time.
+    """
+
+    def __init__(self, router: ShardRouter, binds: list[Engine | Connection] | None = None):
+        binds = binds or router.engines
+        if len(binds) != router.num_shards:
+            raise ValueError(f"expected {router.num_shards} shard binds, got {len(binds)}")
+        self.router = router
+        self.sessions = [Session(bind=bind, info={"shard": shard}) for shard, bind in enumerate(binds)]
+        self._writers: dict[int, ThreadPoolExecutor] = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def route(self, bin_identifier: UUID) -> Session:
+        return self.sessions[self.router.shard_for(bin_identifier)]
+
+    def scatter(self, call: Callable[[Session], T]) -> list[T]:
+        """`call(session)` on every shard in parallel; the results are in shard order."""
+        futures = [self.router._executor.submit(call, session) for session in self.sessions]
+        return [future.result() for future in futures]
+
+    def submit(self, shard: int, call: Callable[[Session], T]) -> Future:
+        """
+        Queues `call(session)` on the shard's own writer thread. Writes to
+        a shard run one after another, and writes to different shards run
+        at the same time, each holding only its own database's lock.
+        """
+        writer = self._writers.get(shard)
+        if writer is None:
+            writer = self._writers[shard] = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix=f"dor-shard-{shard}-writer"
+            )
+        return writer.submit(call, self.sessions[shard])
+
+    def commit(self):
+        for session in self.sessions:
+            session.commit()
+
+    def rollback(self):
+        for session in self.sessions:
+            session.rollback()
+
+    def close(self):
+        for writer in self._writers.values():
+            writer.shutdown(wait=True)
+        self._writers.clear()
+        for session in self.sessions:
+            session.close()
+
+
+def shard_sessions(session: Session | ShardedSession) -> list[Session]:
+    """Every shard's session; just `session` for an unsharded catalog."""
+    return session.sessions if isinstance(session, ShardedSession) else [session]
+
+
+def route(session: Session | ShardedSession, bin_identifier: UUID) -> Session:
+    """The session for the shard `bin_identifier` lives on."""
+    return session.route(bin_identifier) if isinstance(session, ShardedSession) else session
+
+
+def replica(session: Session | ShardedSession) -> Session:
+    """A session to read replicated tables (collections) from."""
+    return session.sessions[0] if isinstance(session, ShardedSession) else session
+
+
+def scatter(session: Session | ShardedSession, call: Callable[[Session], T]) -> list[T]:
+    """`call` on every shard, in parallel; a one item list for an unsharded catalog."""
+    return session.scatter(call) if isinstance(session, ShardedSession) else [call(session)]
@@ -0,0 +1,103 @@
+import os
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable
+
+from sqlalchemy import Engine
+
+CURRENT_POINTER = "CURRENT"
+SNAPSHOT_PREFIX = "catalog-"
+SNAPSHOT_SUFFIX = ".sqlite3"
+
+
+def list_snapshots(root: Path) -> list[Path]:
+    """Published snapshots, oldest first (names sort by publication time)."""
+    return sorted(root.glob(f"{SNAPSHOT_PREFIX}*{SNAPSHOT_SUFFIX}"))
+
+
+def read_current_snapshot(root: Path) -> Path | None:
+    try:
+        name = (root / CURRENT_POINTER).read_text().strip()
+    except FileNotFoundError:
+        return None
+    return root / name
+
+
+def _write_atomically(path: Path, text: str):
+    partial = path.with_name(path.name + ".partial")
+    with open(partial, "w") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(partial, path)
+
+
+def prune_snapshots(root: Path, keep: int = 2) -> list[Path]:
+    """
+    Deletes all but the newest `keep` snapshots, never the current one.
+    Workers still reading an older snapshot keep their open file until
+    they notice the new pointer.
+    """
+    current = read_current_snapshot(root)
+    snapshots = list_snapshots(root)
+    pruned = [path for path in snapshots[:-keep] if path != current] if keep > 0 else []
+    for path in pruned:
+        path.unlink(missing_ok=True)
+    return pruned
+
+
+def publish_snapshot(engine: Engine, root: Path, keep: int = 2) -> Path:
+    """
+    Copies the staging database behind `engine` into a new snapshot with
+    VACUUM INTO, a consistent and compacted copy, then points CURRENT at
+    it with an atomic rename.
+    """
+    root.mkdir(parents=True, exist_ok=True)
+    name = f"{SNAPSHOT_PREFIX}{datetime.now().strftime('%Y%m%dT%H%M%S%f')}{SNAPSHOT_SUFFIX}"
+    path = root / name
+    partial = path.with_name(name + ".partial")
+    partial.unlink(missing_ok=True)
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        connection.exec_driver_sql("VACUUM INTO ?", (str(partial),))
+    os.replace(partial, path)
+
+    _write_atomically(root / CURRENT_POINTER, name)
+    prune_snapshots(root, keep=keep)
+    return path
+
+
+@dataclass
+class SnapshotEngine:
+    """
+    An engine for whichever snapshot CURRENT points at. `get` re-reads the
+    pointer, so a new snapshot is picked up on the next request, without a
+    restart; the engine for the previous one is disposed.
+    """
+    root: Path
+    create_engine: Callable[[Path], Engine]
+    path: Path | None = None
+    engine: Engine | None = None
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def get(self) -> Engine:
+        path = read_current_snapshot(self.root)
+        if path is None:
+            raise RuntimeError(f"no snapshot has been published to {self.root}")
+        if path == self.path:
+            return self.engine
+
+        with self._lock:
+            if path != self.path:
+                previous = self.engine
+                self.engine = self.create_engine(path)
+                self.path = path
+                if previous is not None:
+                    previous.dispose()
+        return self.engine
+
+    def dispose(self):
+        if self.engine is not None:
+            self.engine.dispose()
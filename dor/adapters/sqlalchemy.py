@@ -1,5 +1,93 @@
+import warnings
+from contextlib import contextmanager
+
+from sqlalchemy import Connection, Index, inspect
 from sqlalchemy.orm import DeclarativeBase
 
+from dor.config import BULK_LOAD_PROFILE, SERVE_PROFILE, apply_storage_profile
+
 
 class Base(DeclarativeBase):
     pass
+
+
+def get_secondary_indexes() -> list[Index]:
+    return [
+        index
+        for table in Base.metadata.sorted_tables
+        for index in table.indexes
+        if not index.unique
+    ]
+
+
+def restore_secondary_indexes(connection: Connection) -> list[Index]:
+    """Creates the secondary indexes that are missing, e.g. after a bulk load was killed; returns them."""
+    table_names = set(inspect(connection).get_table_names())
+    existing = {
+        index["name"] for table_name in table_names for index in inspect(connection).get_indexes(table_name)
+    }
+    missing = [
+        index for index in get_secondary_indexes()
+        if index.table.name in table_names and index.name not in existing
+    ]
+    for index in missing:
+        index.create(connection)
+    return missing
+
+
+@contextmanager
+def bulk_load(connection: Connection, defer_indexes: bool = True):
+    """
+    Switch `connection` to the bulk-load storage profile for the duration
+    of the block. With `defer_indexes`, non-unique indexes are dropped up
+    front and rebuilt (followed by ANALYZE) once loading is finished, so
+    only defer them on a database nothing else is reading, like a staging
+    database; readers would run unindexed until the load ends. Without,
+    any indexes an earlier, killed load left dropped are rebuilt first.
+
+    If other connections are reading, SQLite keeps its WAL journal: the
+    load goes on with a warning, and with its indexes in place.
+
+    On PostgreSQL the indexes stay in place (other sessions may be reading);
+    the block only runs with synchronous_commit off and ends with ANALYZE.
+    """
+    if connection.dialect.name != "sqlite":
+        connection.exec_driver_sql("SET synchronous_commit TO OFF")
+        connection.commit()
+        try:
+            yield connection
+        finally:
+            connection.rollback()
+            connection.exec_driver_sql("RESET synchronous_commit")
+            connection.exec_driver_sql("ANALYZE")
+            connection.commit()
+        return
+
+    dbapi_connection = connection.connection.dbapi_connection
+    indexes = get_secondary_indexes() if defer_indexes else []
+
+    journal_mode = apply_storage_profile(dbapi_connection, BULK_LOAD_PROFILE)
+    if journal_mode.lower() != BULK_LOAD_PROFILE.pragmas["journal_mode"].lower():
+        warnings.warn(
+            f"other connections are reading the database, so it stays in {journal_mode} journal mode; "
+            f"loading with its indexes in place",
+            RuntimeWarning,
+            stacklevel=3,
+        )
+        indexes = []
+    if not indexes:
+        restore_secondary_indexes(connection)
+    for index in indexes:
+        index.drop(connection, checkfirst=True)
+    connection.commit()
+
+    try:
+        yield connection
+    finally:
+        connection.rollback()
+        for index in indexes:
+            index.create(connection, checkfirst=True)
+        if indexes:
+            connection.exec_driver_sql("ANALYZE")
+        connection.commit()
+        apply_storage_profile(dbapi_connection, SERVE_PROFILE)
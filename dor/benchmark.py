@@ -0,0 +1,378 @@
+import asyncio
+import itertools
+import json
+import random
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable
+
+import httpx
+from rich.table import Table
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from dor.models.collection import Collection
+from dor.models.intellectual_object import CurrentRevision, IntellectualObject
+from dor.models.object_file import ObjectFile
+from dor.models.premis_event import PremisEvent
+from dor.services.catalog import catalog
+from dor.services.documents import build_object_document
+from dor.services.stats import apply_stat_deltas, count_object_stats
+from dor.telemetry import percentile
+
+SYNTHETIC_API_URL = "https://quod.lib.umich.edu/cgi/i/image/api"
+SYNTHETIC_OBJECT_TYPES = ["types:monograph", "types:slide"]
+
+
+def make_synthetic_manifest(alternate_identifier: str, num_canvases: int) -> dict:
+    """A IIIF manifest shaped like the ones `dor catalog collection` harvests."""
+    canvases = [
+        {
+            "@id": f"{SYNTHETIC_API_URL}/canvas/{alternate_identifier}:{index}/canvas/1",
+            "label": f"Page {index + 1}",
+            "images": [{
+                "resource": {
+                    "format": "image/jp2",
+                    "service": {"@id": f"{SYNTHETIC_API_URL}/image/{alternate_identifier}:{index:08d}"},
+                },
+            }],
+        }
+        for index in range(num_canvases)
+    ]
+    return {
+        "@id": f"{SYNTHETIC_API_URL}/manifest/{alternate_identifier}",
+        "label": f"Manifest {alternate_identifier}",
+        "sequences": [{"canvases": canvases}],
+    }
+
+
+def build_synthetic_catalog(
+    session: Session,
+    num_collections: int = 4,
+    num_objects: int = 1000,
+    num_canvases: int = 4,
+    seed: int = 0,
+    chunk_size: int = 100,
+) -> int:
+    """
+    Fills an empty catalog with `num_objects` objects spread over
+    `num_collections` collections, with their documents and stats, the way
+    an import would. The same `seed` builds the same catalog. Returns the
+    number of objects.
+    """
+    # Faker and its providers are slow to load; only building needs them
+    from faker import Faker
+
+    from dor.builder import build_collection, build_intellectual_object
+
+    Faker.seed(seed)
+    random.seed(seed)
+
+    collections = []
+    for index in range(num_collections):
+        collid = f"bench{index:02d}"
+        collection = build_collection(
+            {"@id": f"{SYNTHETIC_API_URL}/collection/{collid}", "label": collid, "attribution": ""},
+            "types:box"
+        )
+        session.add(collection)
+        collections.append(collection)
+    session.flush()
+
+    for index in range(num_objects):
+        collection = collections[index % num_collections]
+        collid = collection.alternate_identifiers
+        intellectual_object = build_intellectual_object(
+            collid,
+            make_synthetic_manifest(f"{collid}:{index:06d}", num_canvases),
+            SYNTHETIC_OBJECT_TYPES[index % len(SYNTHETIC_OBJECT_TYPES)],
+        )
+        session.add(build_object_document(intellectual_object, [collection]))
+        stats = count_object_stats(intellectual_object)
+        collection.objects.append(intellectual_object)
+        session.flush()
+        apply_stat_deltas(session, collection.id, stats)
+        if (index + 1) % chunk_size == 0:
+            session.commit()
+    session.commit()
+    return num_objects
+
+
+@dataclass
+class BenchmarkTargets:
+    """Real identifiers to request, sampled from whatever catalog is being benchmarked."""
+    num_objects: int
+    collection_identifiers: list
+    collection_alt_identifiers: list[str]
+    object_types: list[str]
+    object_identifiers: list
+    object_bin_identifiers: list
+    object_ids: list[int]
+    event_identifiers: list
+    event_types: list[str]
+    digests: list[bytes]
+
+
+def select_targets(session: Session, size: int = 20) -> BenchmarkTargets:
+    objects = session.execute(
+        select(IntellectualObject.id, IntellectualObject.identifier, IntellectualObject.bin_identifier)
+        .join(CurrentRevision)
+        .order_by(IntellectualObject.id)
+        .limit(size)
+    ).all()
+    collections = session.execute(
+        select(Collection.identifier, Collection.alternate_identifiers).order_by(Collection.id)
+    ).all()
+    return BenchmarkTargets(
+        num_objects=session.execute(select(func.count()).select_from(CurrentRevision)).scalar_one(),
+        collection_identifiers=[row.identifier for row in collections],
+        collection_alt_identifiers=[row.alternate_identifiers for row in collections],
+        object_types=catalog.objects.get_distinct_types(session),
+        object_identifiers=[row.identifier for row in objects],
+        object_bin_identifiers=[row.bin_identifier for row in objects],
+        object_ids=[row.id for row in objects],
+        event_identifiers=list(session.execute(
+            select(PremisEvent.identifier).order_by(PremisEvent.id).limit(size)
+        ).scalars()),
+        event_types=catalog.events.get_distinct_types(session),
+        digests=list(session.execute(
+            select(ObjectFile.digest).order_by(ObjectFile.id).limit(size)
+        ).scalars()),
+    )
+
+
+def summarize_latencies(latencies: list[float], elapsed: float) -> dict[str, float]:
+    return {
+        "count": len(latencies),
+        "elapsed": elapsed,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+        "per_second": len(latencies) / elapsed if elapsed else 0.0,
+    }
+
+
+@dataclass
+class Scenario:
+    name: str
+    paths: list[str]
+    headers: dict[str, str] = field(default_factory=dict)
+
+
+def make_scenarios(targets: BenchmarkTargets) -> list[Scenario]:
+    console = "/admin/console"
+    deep_start = max(targets.num_objects - 10, 0)
+    return [
+        Scenario("collections", [f"{console}/collections/"]),
+        Scenario("collection stats", [
+            f"{console}/collections/{identifier}/stats" for identifier in targets.collection_identifiers
+        ]),
+        Scenario("objects", [f"{console}/objects/"]),
+        Scenario("objects (filtered)", [
+            f"{console}/objects/?collection_alt_identifier={collid}&object_type={object_type}"
+            for collid, object_type in itertools.product(
+                targets.collection_alt_identifiers, targets.object_types
+            )
+        ]),
+        Scenario("objects (deep page)", [
+            f"{console}/objects/?start={deep_start // 2}",
+            f"{console}/objects/?start={deep_start}",
+        ]),
+        Scenario("object", [f"{console}/objects/{identifier}/" for identifier in targets.object_identifiers]),
+        Scenario("object filesets", [
+            f"{console}/objects/{identifier}/filesets?fileset_start=5" for identifier in targets.object_identifiers
+        ]),
+        Scenario(
+            "object (json)",
+            [f"{console}/objects/{identifier}/" for identifier in targets.object_identifiers],
+            headers={"accept": "application/json"},
+        ),
+        Scenario("events", [f"{console}/events/"] + [
+            f"{console}/events/?event_type={event_type}" for event_type in targets.event_types
+        ]),
+        Scenario("event", [f"{console}/events/{identifier}" for identifier in targets.event_identifiers]),
+    ]
+
+
+async def drive_scenario(
+    client: httpx.AsyncClient, scenario: Scenario, num_requests: int, concurrency: int, warmup: int = 5
+) -> dict:
+    """
+    Sends `num_requests` requests, cycling through the scenario's paths,
+    from `concurrency` workers; latency is measured per request.
+    """
+    for path in itertools.islice(itertools.cycle(scenario.paths), warmup):
+        await client.get(path, headers=scenario.headers)
+
+    latencies = []
+    errors = 0
+    counter = itertools.count()
+
+    async def worker():
+        nonlocal errors
+        while (index := next(counter)) < num_requests:
+            path = scenario.paths[index % len(scenario.paths)]
+            start = time.perf_counter()
+            response = await client.get(path, headers=scenario.headers)
+            await response.aread()
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors += 1
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    summary = summarize_latencies(latencies, time.perf_counter() - started_at)
+    summary["errors"] = errors
+    return summary
+
+
+async def run_endpoint_benchmarks(
+    app, scenarios: list[Scenario], num_requests: int = 200, concurrency: int = 8
+) -> dict[str, dict]:
+    """Drives `app` in process through httpx's ASGI transport; nothing listens on a socket."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        return {
+            scenario.name: await drive_scenario(client, scenario, num_requests, concurrency)
+            for scenario in scenarios
+            if scenario.paths
+        }
+
+
+def make_manager_benchmarks(targets: BenchmarkTargets) -> dict[str, Callable[[Session, int], object]]:
+    """One call per `Catalog` manager method; each takes a session and the iteration number."""
+    def pick(values: list, index: int):
+        return values[index % len(values)] if values else None
+
+    return {
+        "objects.find": lambda s, i: catalog.objects.find(s, limit=10),
+        "objects.find (filtered)": lambda s, i: catalog.objects.find(
+            s, object_type=pick(targets.object_types, i),
+            collection_alt_identifier=pick(targets.collection_alt_identifiers, i), limit=10
+        ),
+        "objects.find (deep page)": lambda s, i: catalog.objects.find(
+            s, start=max(targets.num_objects - 10, 0), limit=10
+        ),
+        "objects.get": lambda s, i: catalog.objects.get(s, pick(targets.object_identifiers, i)),
+        "objects.get (document)": lambda s, i: catalog.objects.get(
+            s, pick(targets.object_identifiers, i), from_document=True
+        ),
+        "objects.get_document": lambda s, i: catalog.objects.get_document(s, pick(targets.object_identifiers, i)),
+        "objects.sample": lambda s, i: catalog.objects.sample(
+            s, object_type=None, collection_alt_identifier=None, seed=i
+        ),
+        "objects.get_distinct_types": lambda s, i: catalog.objects.get_distinct_types(s),
+        "collections.find": lambda s, i: catalog.collections.find(s),
+        "collections.get": lambda s, i: catalog.collections.get(s, pick(targets.collection_identifiers, i)),
+        "collections.get_stats": lambda s, i: catalog.collections.get_stats(
+            s, pick(targets.collection_identifiers, i)
+        ),
+        "filesets.find": lambda s, i: catalog.filesets.find(s, pick(targets.object_identifiers, i)),
+        "filesets.get_object_summary": lambda s, i: catalog.filesets.get_object_summary(
+            s, pick(targets.object_bin_identifiers, i)
+        ),
+        "filesets.get_views": lambda s, i: catalog.filesets.get_views(
+            s, pick(targets.object_identifiers, i), start=5
+        ),
+        "filesets.summarize": lambda s, i: list(catalog.filesets.summarize(s, pick(targets.object_ids, i))),
+        "events.get": lambda s, i: catalog.events.get(s, pick(targets.event_identifiers, i)),
+        "events.get_distinct_types": lambda s, i: catalog.events.get_distinct_types(s),
+        "events.timeline": lambda s, i: catalog.events.timeline(s, event_types=[pick(targets.event_types, i)]),
+        "events.stream": lambda s, i: sum(1 for _ in catalog.events.stream(s)),
+        "duplicates.find": lambda s, i: catalog.duplicates.find(s, limit=25),
+        "duplicates.get_totals": lambda s, i: catalog.duplicates.get_totals(s),
+        "duplicates.get_files": lambda s, i: catalog.duplicates.get_files(s, targets.digests),
+        "duplicates.stream": lambda s, i: sum(1 for _ in catalog.duplicates.stream(s)),
+    }
+
+
+def run_manager_benchmarks(
+    session: Session, benchmarks: dict[str, Callable[[Session, int], object]], iterations: int = 50
+) -> dict[str, dict]:
+    """Times each manager call; the identity map is cleared between calls so none is served from it."""
+    results = {}
+    for name, call in benchmarks.items():
+        call(session, 0)
+        session.expunge_all()
+        latencies = []
+        started_at = time.perf_counter()
+        for index in range(iterations):
+            start = time.perf_counter()
+            call(session, index)
+            latencies.append(time.perf_counter() - start)
+            session.expunge_all()
+        results[name] = summarize_latencies(latencies, time.perf_counter() - started_at)
+    return results
+
+
+@dataclass
+class BenchmarkReport:
+    parameters: dict
+    endpoints: dict[str, dict] = field(default_factory=dict)
+    managers: dict[str, dict] = field(default_factory=dict)
+    created_at: str = field(default_factory=lambda: datetime.now().isoformat(timespec="seconds"))
+
+    def write(self, path: Path):
+        path.write_text(json.dumps(asdict(self), indent=2))
+
+    @classmethod
+    def read(cls, path: Path) -> "BenchmarkReport":
+        return cls(**json.loads(path.read_text()))
+
+    def make_tables(self) -> list[Table]:
+        tables = []
+        for title, results, unit in [
+            ("Endpoints", self.endpoints, "req/s"),
+            ("Catalog managers", self.managers, "calls/s"),
+        ]:
+            table = Table(title=title)
+            table.add_column("benchmark", no_wrap=True)
+            table.add_column("count", justify="right")
+            table.add_column("p50 (ms)", justify="right")
+            table.add_column("p95 (ms)", justify="right")
+            table.add_column("p99 (ms)", justify="right")
+            table.add_column(unit, justify="right")
+            for name, summary in results.items():
+                table.add_row(
+                    name,
+                    str(summary["count"]) + (f" ({summary['errors']} errors)" if summary.get("errors") else ""),
+                    f"{summary['p50'] * 1000:.2f}",
+                    f"{summary['p95'] * 1000:.2f}",
+                    f"{summary['p99'] * 1000:.2f}",
+                    f"{summary['per_second']:.1f}",
+                )
+            tables.append(table)
+        return tables
+
+
+@dataclass
+class Regression:
+    group: str
+    name: str
+    metric: str
+    baseline: float
+    current: float
+
+    @property
+    def change(self) -> float:
+        return self.current / self.baseline - 1 if self.baseline else 0.0
+
+
+def compare_reports(baseline: BenchmarkReport, current: BenchmarkReport, threshold: float = 0.2) -> list[Regression]:
+    """
+    Benchmarks whose p95 latency grew, or whose throughput fell, by more
+    than `threshold` (0.2 is 20%). Benchmarks missing from either report
+    are not compared.
+    """
+    regressions = []
+    for group in ["endpoints", "managers"]:
+        baseline_results, current_results = getattr(baseline, group), getattr(current, group)
+        for name in baseline_results.keys() & current_results.keys():
+            before, after = baseline_results[name], current_results[name]
+            if before["p95"] and after["p95"] > before["p95"] * (1 + threshold):
+                regressions.append(Regression(group, name, "p95", before["p95"], after["p95"]))
+            if after["per_second"] < before["per_second"] * (1 - threshold):
+                regressions.append(Regression(group, name, "per_second", before["per_second"], after["per_second"]))
+    return sorted(regressions, key=lambda regression: (regression.group, regression.name))
@@ -1,4 +1,5 @@
 from pathlib import Path
+from typing import Iterable
 from faker import Faker
 import json
 import random
@@ -43,7 +44,16 @@ def make_order_label(label: str, index: int) -> str:
     return new_label
 
 
-def build_intellectual_object(collid: str, manifest_data: dict, object_type: str):
+def build_intellectual_object(
+    collid: str,
+    manifest_data: dict,
+    object_type: str,
+    canvases: Iterable[dict] | None = None
+):
+    """
+    `canvases` defaults to the first sequence in `manifest_data`; pass an
+    iterator (see `dor.manifest.open_manifest`) to build from a streamed manifest.
+    """
     identifier, alternate_identifier = extract_identifier(manifest_data['@id'])
 
     config.console.print(f":stuck_out_tongue_closed_eyes: processing {alternate_identifier}")
@@ -85,7 +95,8 @@ def build_intellectual_object(collid: str, manifest_data: dict, object_type: str
         linking_agent=linking_agent
     ))
 
-    canvases = manifest_data['sequences'][0]['canvases']
+    if canvases is None:
+        canvases = manifest_data['sequences'][0]['canvases']
     for index, canvas in enumerate(canvases):
 
         # canvas ids are so weird
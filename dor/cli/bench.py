@@ -0,0 +1,174 @@
+import asyncio
+from pathlib import Path
+from typing import Annotated
+
+import sqlalchemy
+import typer
+from rich.table import Table
+
+from dor.adapters.sqlalchemy import Base
+from dor.benchmark import (
+    BenchmarkReport,
+    Regression,
+    build_synthetic_catalog,
+    compare_reports,
+    make_manager_benchmarks,
+    make_scenarios,
+    run_endpoint_benchmarks,
+    run_manager_benchmarks,
+    select_targets,
+)
+from dor.config import TMP_ROOT, config
+
+console = config.console
+
+bench_app = typer.Typer()
+
+
+def print_regressions(regressions: list[Regression], threshold: float):
+    if not regressions:
+        console.print(f":thumbs_up: no regressions beyond {threshold:.0%}", style="bold green")
+        return
+    table = Table(title="Regressions")
+    table.add_column("benchmark", no_wrap=True)
+    table.add_column("metric", no_wrap=True)
+    table.add_column("baseline", justify="right")
+    table.add_column("current", justify="right")
+    table.add_column("change", justify="right")
+    for regression in regressions:
+        table.add_row(
+            f"{regression.group}: {regression.name}",
+            regression.metric,
+            f"{regression.baseline:.4f}",
+            f"{regression.current:.4f}",
+            f"{regression.change:+.0%}",
+        )
+    console.print(table)
+
+
+@bench_app.command()
+def run(
+    objects: Annotated[
+        int,
+        typer.Option(help="Number of objects in the synthetic catalog")
+    ] = 1000,
+    collections: Annotated[
+        int,
+        typer.Option(help="Number of collections the objects are spread over")
+    ] = 4,
+    canvases: Annotated[
+        int,
+        typer.Option(help="Number of filesets per object")
+    ] = 4,
+    seed: Annotated[
+        int,
+        typer.Option(help="Seed for the synthetic catalog")
+    ] = 0,
+    database_url: Annotated[
+        str,
+        typer.Option(help="Database to benchmark; its tables are dropped and rebuilt unless --reuse [default: tmp/bench.sqlite3]")
+    ] = None,
+    reuse: Annotated[
+        bool,
+        typer.Option(help="Benchmark the catalog already in the database instead of building one")
+    ] = False,
+    requests: Annotated[
+        int,
+        typer.Option(help="Requests per endpoint")
+    ] = 200,
+    concurrency: Annotated[
+        int,
+        typer.Option(help="Requests in flight at once")
+    ] = 8,
+    iterations: Annotated[
+        int,
+        typer.Option(help="Calls per catalog manager method")
+    ] = 50,
+    output: Annotated[
+        Path,
+        typer.Option(help="Write the results as JSON to this path")
+    ] = None,
+    baseline: Annotated[
+        Path,
+        typer.Option(help="Compare against the results of an earlier run; exits 1 on a regression")
+    ] = None,
+    threshold: Annotated[
+        float,
+        typer.Option(help="Slowdown that counts as a regression, e.g. 0.2 for 20%")
+    ] = 0.2,
+):
+    """Benchmark the console endpoints and catalog managers in process."""
+    from dor.entrypoints.api.dependencies import get_db_session
+    from dor.entrypoints.api.main import app
+
+    if not database_url:
+        database_path = TMP_ROOT / "bench.sqlite3"
+        if not reuse:
+            database_path.unlink(missing_ok=True)
+        database_url = f"sqlite:///{database_path}"
+    engine = config.create_database_engine(database_url)
+    sqlalchemy.orm.configure_mappers()
+
+    if not reuse:
+        Base.metadata.drop_all(engine)
+        Base.metadata.create_all(engine)
+        # the builder reports every object and canvas it builds
+        with sqlalchemy.orm.Session(engine) as session, console.capture():
+            build_synthetic_catalog(
+                session, num_collections=collections, num_objects=objects, num_canvases=canvases, seed=seed
+            )
+        console.print(f":building_construction: synthetic catalog : {objects} objects : {collections} collections")
+
+    def get_benchmark_session():
+        with sqlalchemy.orm.Session(engine) as session:
+            yield session
+
+    with sqlalchemy.orm.Session(engine) as session:
+        targets = select_targets(session)
+        report = BenchmarkReport(parameters={
+            "database": engine.url.render_as_string(hide_password=True),
+            "objects": targets.num_objects,
+            "collections": len(targets.collection_identifiers),
+            "canvases": canvases,
+            "seed": seed,
+            "requests": requests,
+            "concurrency": concurrency,
+            "iterations": iterations,
+        })
+
+        app.dependency_overrides[get_db_session] = get_benchmark_session
+        try:
+            report.endpoints = asyncio.run(run_endpoint_benchmarks(
+                app, make_scenarios(targets), num_requests=requests, concurrency=concurrency
+            ))
+        finally:
+            app.dependency_overrides.pop(get_db_session)
+        report.managers = run_manager_benchmarks(session, make_manager_benchmarks(targets), iterations=iterations)
+    engine.dispose()
+
+    for table in report.make_tables():
+        console.print(table)
+    if output:
+        report.write(output)
+        console.print(f":bar_chart: results written to {output}")
+    if baseline:
+        regressions = compare_reports(BenchmarkReport.read(baseline), report, threshold=threshold)
+        print_regressions(regressions, threshold)
+        if regressions:
+            raise typer.Exit(code=1)
+
+
+@bench_app.command()
+def compare(
+    baseline: Path,
+    current: Path,
+    threshold: Annotated[
+        float,
+        typer.Option(help="Slowdown that counts as a regression, e.g. 0.2 for 20%")
+    ] = 0.2,
+):
+    """Compare two saved runs; exits 1 on a regression."""
+    regressions = compare_reports(BenchmarkReport.read(baseline), BenchmarkReport.read(current), threshold=threshold)
+    print_regressions(regressions, threshold)
+    if regressions:
+        raise typer.Exit(code=1)
@@ -1,21 +1,48 @@
+import json
 import os
 import random
 import sys
 import time
 import uuid
+from contextlib import ExitStack, nullcontext
+from datetime import datetime
+from functools import cache
+from pathlib import Path
 from typing import Annotated
 
 import sqlalchemy
 import typer
+from rich.live import Live
 from rich.table import Table
-from sqlalchemy import delete, select
+from sqlalchemy import select
 
-from dor.adapters.sqlalchemy import Base
-from dor.builder import build_collection, build_intellectual_object
+from dor.adapters.archive import IIIFArchive, open_archive, write_archive
+from dor.adapters.bulk import CopyLoader, supports_copy
+from dor.adapters.shards import ShardRouter, ShardedSession, replica, route, shard_sessions
+from dor.adapters.snapshots import publish_snapshot
+from dor.adapters.sqlalchemy import Base, bulk_load
 from dor.config import config
 from dor.models.collection import Collection
-from dor.models.intellectual_object import IntellectualObject, CurrentRevision
-from dor.utils import fetch
+from dor.models.intellectual_object import CurrentRevision
+from dor.services.catalog import catalog
+from dor.services.documents import build_object_document, rebuild_object_documents
+from dor.services.generation import bump_generation
+from dor.services.harvest import (
+    JOB_FAILED,
+    HarvestProgress,
+    ImportJobSpec,
+    ImportQueue,
+    get_jobs,
+    get_unfinished_jobs,
+    harvest_collection,
+    queue_import_jobs,
+)
+from dor.services.hashing import hash_files
+from dor.services.ingest import build_intellectual_object_from_package, scan_package
+from dor.services.purge import purge_collection
+from dor.services.stats import apply_stat_deltas, count_object_stats, rebuild_collection_stats
+from dor.telemetry import ImportTelemetry
+from dor.utils import HostRateLimiter, fetch, fetch_path
 
 
 DEFAULT_OBJECT_TYPE = {
@@ -27,11 +54,47 @@ console = config.console
 
 catalog_app = typer.Typer()
 
-engine_url = config.get_database_engine_url()
-engine = sqlalchemy.create_engine(engine_url, echo=False)
 
-connection = engine.connect()
-session = sqlalchemy.orm.Session(bind=connection)
+# opened on first use, so `--help` and unrelated commands never touch the database
+@cache
+def get_connection() -> sqlalchemy.Connection:
+    engine = config.create_database_engine(echo=False)
+    return engine.connect()
+
+
+@cache
+def get_shard_router() -> ShardRouter:
+    return ShardRouter(engines=config.create_shard_engines(echo=False))
+
+
+@cache
+def get_connections() -> list[sqlalchemy.Connection]:
+    """A connection per shard with DOR_SHARDS, otherwise just the catalog's."""
+    if config.shards > 1:
+        return [engine.connect() for engine in get_shard_router().engines]
+    return [get_connection()]
+
+
+@cache
+def get_session() -> sqlalchemy.orm.Session | ShardedSession:
+    if config.shards > 1:
+        return get_shard_router().session(binds=get_connections())
+    return sqlalchemy.orm.Session(bind=get_connection())
+
+
+def bulk_load_shards(defer_indexes: bool | None = None) -> ExitStack:
+    """
+    `bulk_load` on every shard's connection. Indexes are deferred by
+    default only with DOR_SERVE_SNAPSHOTS, where the catalog database is
+    a staging database the console doesn't read.
+    """
+    if defer_indexes is None:
+        defer_indexes = config.serve_snapshots
+    stack = ExitStack()
+    for connection in get_connections():
+        stack.enter_context(bulk_load(connection, defer_indexes=defer_indexes))
+    return stack
+
 
 def seed_objects(num_objects: int):
     console.print(f":alarm_clock: {num_objects} intellectual objects seeded")
@@ -39,9 +102,123 @@ def seed_objects(num_objects: int):
 
 @catalog_app.command()
 def initialize():
-    Base.metadata.drop_all(engine)
-    Base.metadata.create_all(engine)
-    console.print(":thumbs_up: database initialized", style="bold green")
+    for shard, connection in enumerate(get_connections()):
+        if config.shards > 1 and connection.dialect.name != "sqlite":
+            connection.exec_driver_sql(f"CREATE SCHEMA IF NOT EXISTS {config.get_shard_schema(shard)}")
+            connection.commit()
+        with bulk_load(connection, defer_indexes=False):
+            Base.metadata.drop_all(connection)
+            Base.metadata.create_all(connection)
+            connection.commit()
+    shards = f" : {config.shards} shards" if config.shards > 1 else ""
+    console.print(f":thumbs_up: database initialized{shards}", style="bold green")
+
+def purge_with_progress(collid: str, chunk_size: int = 500):
+    for shard, session in enumerate(shard_sessions(get_session())):
+        shard_label = f"shard {shard} : " if config.shards > 1 else ""
+        for progress in purge_collection(session, collid, chunk_size=chunk_size):
+            console.print(
+                f":wastebasket: {collid} : {shard_label}chunk {progress.chunk} : "
+                f"{progress.objects}/{progress.total_objects} objects purged "
+                f"({sum(progress.rows.values())} rows)"
+            )
+    console.print(f":broom: {collid} purged", style="bold green")
+
+
+def publish_snapshot_if_serving(keep: int = 2):
+    """With DOR_SERVE_SNAPSHOTS, the API only sees changes once they're published."""
+    if config.serve_snapshots:
+        publish(keep=keep)
+
+
+@catalog_app.command()
+def purge(
+    collid: str,
+    chunk_size: Annotated[
+        int,
+        typer.Option(help="Number of objects deleted per transaction")
+    ] = 500,
+):
+    purge_with_progress(collid, chunk_size=chunk_size)
+    publish_snapshot_if_serving()
+
+
+@catalog_app.command()
+def publish(
+    keep: Annotated[
+        int,
+        typer.Option(help="Number of snapshots to keep, including the new one")
+    ] = 2,
+):
+    """Publish a read-only snapshot of the catalog for the API to serve."""
+    if config.shards > 1:
+        console.print(":no_entry: snapshots are not supported for a sharded catalog", style="bold red")
+        raise typer.Exit(code=1)
+    engine = get_connection().engine
+    if engine.url.get_backend_name() != "sqlite":
+        console.print(":no_entry: snapshots are only supported for SQLite", style="bold red")
+        raise typer.Exit(code=1)
+
+    started_at = time.perf_counter()
+    path = publish_snapshot(engine, config.get_snapshot_root(), keep=keep)
+    console.print(
+        f":camera_flash: published {path.name} : {path.stat().st_size} bytes : "
+        f"{time.perf_counter() - started_at:.1f}s",
+        style="bold green"
+    )
+
+
+def get_object_type(class_: str, object_type: str | None) -> str:
+    if not object_type:
+        object_type = DEFAULT_OBJECT_TYPE[class_]
+    if not object_type.startswith('types:'):
+        object_type = f"types:{object_type}"
+    return object_type.lower()
+
+
+def get_collection_url(class_: str, collid: str) -> str:
+    return f"{config.get_dlxs_image_api_url(class_)}/collection/{collid}"
+
+
+def get_writer_session() -> ShardedSession:
+    """
+    `get_session` as a ShardedSession, of one shard or many, so imports
+    running side by side can queue their writes on its writer threads.
+    """
+    session = get_session()
+    if isinstance(session, ShardedSession):
+        return session
+    connection = get_connection()
+    return ShardRouter(engines=[connection.engine]).session(binds=[connection])
+
+
+RequestsPerSecond = Annotated[
+    float,
+    typer.Option(help="Fetches per second from each DLXS host; cached pages and manifests are free "
+                      "[default: DOR_DLXS_REQUESTS_PER_SECOND, or 5]")
+]
+ArchiveOption = Annotated[
+    Path,
+    typer.Option(help="Read collection pages and manifests from this IIIF archive (a directory, tar or zip, "
+                      "see pack-archive) instead of fetching them")
+]
+
+
+def open_iiif_archive(path: Path | None) -> IIIFArchive | None:
+    if path is None:
+        return None
+    try:
+        return open_archive(path)
+    except (OSError, ValueError) as e:
+        raise typer.BadParameter(str(e), param_hint="--archive")
+
+
+def parse_collection_pair(pair: str) -> tuple[str, str]:
+    collid, _, class_ = pair.partition(":")
+    if class_ not in DEFAULT_OBJECT_TYPE:
+        raise typer.BadParameter(f"expected collid:class with class image or text, got {pair}")
+    return collid, class_
+
 
 @catalog_app.command()
 def collection(
@@ -55,107 +232,437 @@ def collection(
     ],
     limit: int = -1, 
     object_type: str = None, 
-    collection_type: str = 'types:box'
+    collection_type: str = 'types:box',
+    report: Annotated[
+        Path,
+        typer.Option(help="Write a JSON run report to this path")
+    ] = None,
+    requests_per_second: RequestsPerSecond = None,
+    archive: ArchiveOption = None,
     ):
+    session = get_session()
+    object_type = get_object_type(class_, object_type)
+    iiif_archive = open_iiif_archive(archive)
 
-    if not object_type:
-        object_type = DEFAULT_OBJECT_TYPE[class_]
-
-    if not object_type.startswith('types:'):
-        object_type = f"types:{object_type}"
-    object_type = object_type.lower()
-    
-    image_api_url = config.get_dlxs_image_api_url(class_)
-
-    collection_url = f"{image_api_url}/collection/{collid}"
-    collection = None
-
-    # delete all the objects in this collection
-    object_ids_to_delete = (
-        select(IntellectualObject.id)
-        .join(IntellectualObject.collections)
-        .where(Collection.alternate_identifiers==collid)
-    ).scalar_subquery()
-
-    stmt = (
-        delete(IntellectualObject)
-        .where(IntellectualObject.id.in_(object_ids_to_delete))
-    )
-    session.execute(stmt)
-
-    # delete the collection
-    session.execute(delete(Collection).where(Collection.alternate_identifiers==collid))
-    session.commit()
+    # delete all the objects in this collection, and the collection
+    purge_with_progress(collid)
 
     if os.getenv("EXIT", None):
         sys.exit()
 
-    num_processed = 0
-    page_index = 0
-    seen = {}
-    while True:
-        collection_data = fetch(collection_url)
-        if not collection:
-            collection = build_collection(collection_data, collection_type)
-            session.add(collection)
-
-        total_items = collection_data['total']
-        num_items = len(collection_data['manifests'])
-        page_index += 1
-        console.print(f":cat_face_with_tears_of_joy: {page_index} : {collection_data['label']} : {num_items}/{total_items}")
-        for datum in collection_data['manifests']:
-            if datum['@id'] in seen: continue
-            num_processed += 1
-            seen[datum['@id']] = True
-
-            manifest_url = datum['@id']
-            manifest_data = fetch(manifest_url)
-
-            intellectual_object = build_intellectual_object(
+    telemetry = ImportTelemetry(collid=collid)
+    limiter = HostRateLimiter(rate=requests_per_second or config.dlxs_requests_per_second)
+    page_index = None
+    with bulk_load_shards(), nullcontext() if iiif_archive is None else iiif_archive:
+        for progress in harvest_collection(
+            session,
+            collid=collid,
+            collection_url=get_collection_url(class_, collid),
+            object_type=object_type,
+            collection_type=collection_type,
+            limit=limit,
+            telemetry=telemetry,
+            limiter=limiter,
+            archive=iiif_archive,
+        ):
+            if progress.page != page_index:
+                page_index = progress.page
+                console.print(
+                    f":cat_face_with_tears_of_joy: {page_index} : {progress.collection_label} : "
+                    f"{progress.page_items}/{progress.total_items}"
+                )
+            console.print(f":frame_with_picture:\t{progress.num_processed} : importing {progress.label}")
+
+    for table in telemetry.make_tables():
+        console.print(table)
+    if report:
+        telemetry.write_report(report)
+        console.print(f":bar_chart: run report written to {report}")
+
+    publish_snapshot_if_serving()
+
+
+def read_batch_file(path: Path) -> list[str]:
+    """`collid:class` pairs, one per line; blank lines and # comments are skipped."""
+    lines = (line.split("#", 1)[0].strip() for line in path.read_text().splitlines())
+    return [line for line in lines if line]
+
+
+@catalog_app.command("import-batch")
+def import_batch(
+    collections: Annotated[
+        list[str],
+        typer.Argument(help="collid:class pairs, e.g. bhl:image; with none, resumes the unfinished jobs")
+    ] = None,
+    file: Annotated[
+        Path,
+        typer.Option(help="Read collid:class pairs from this file, one per line")
+    ] = None,
+    workers: Annotated[
+        int,
+        typer.Option(help="Number of collections imported at once")
+    ] = 4,
+    requests_per_second: RequestsPerSecond = None,
+    limit: int = -1,
+    object_type: str = None,
+    collection_type: str = 'types:box',
+    restart: Annotated[
+        bool,
+        typer.Option(help="Import collections again even if their jobs are done")
+    ] = False,
+    report: Annotated[
+        Path,
+        typer.Option(help="Write a JSON run report to this path")
+    ] = None,
+    archive: ArchiveOption = None,
+):
+    """
+    Imports many collections as a queue of jobs, `--workers` at a time,
+    fetching from each DLXS host no faster than `--requests-per-second`
+    altogether. Job status is kept in the catalog: run it again, with or
+    without the list, to finish a batch that was stopped.
+    """
+    session = get_session()
+    jobs_session = replica(session)
+    iiif_archive = open_iiif_archive(archive)
+
+    pairs = list(collections or []) + (read_batch_file(file) if file else [])
+    if pairs:
+        values = []
+        for pair in pairs:
+            collid, class_ = parse_collection_pair(pair)
+            values.append(dict(
                 collid=collid,
-                manifest_data=manifest_data,
-                object_type=object_type,
-            )
-
-            session.add(intellectual_object)
-            collection.objects.append(intellectual_object)
+                dlxs_class=class_,
+                object_type=get_object_type(class_, object_type),
+                collection_type=collection_type,
+                max_objects=limit,
+            ))
+        jobs = queue_import_jobs(jobs_session, values, restart=restart)
+    else:
+        jobs = get_unfinished_jobs(jobs_session)
+    if not jobs:
+        console.print(":zzz: no jobs to run", style="bold green")
+        return
+
+    specs = [
+        ImportJobSpec(
+            id=job.id,
+            collid=job.collid,
+            collection_url=get_collection_url(job.dlxs_class, job.collid),
+            object_type=job.object_type,
+            collection_type=job.collection_type,
+            max_objects=job.max_objects,
+        )
+        for job in jobs
+    ]
+    # up front, while the indexes purging needs are still in place
+    for spec in specs:
+        purge_with_progress(spec.collid)
+
+    def print_progress(spec: ImportJobSpec, progress: HarvestProgress):
+        console.print(
+            f":frame_with_picture:\t{spec.collid} : {progress.num_processed}/{progress.total_items} : "
+            f"importing {progress.label}"
+        )
 
-            session.commit()
+    queue = ImportQueue(
+        session=get_writer_session(),
+        limiter=HostRateLimiter(rate=requests_per_second or config.dlxs_requests_per_second),
+        archive=iiif_archive,
+        workers=workers,
+        on_progress=print_progress,
+    )
+    started_at = time.perf_counter()
+    with bulk_load_shards(), nullcontext() if iiif_archive is None else iiif_archive:
+        statuses = queue.run(specs)
+    elapsed = time.perf_counter() - started_at
+
+    table = Table(title=f"Import batch: {len(specs)} jobs in {elapsed:.1f}s")
+    table.add_column("collid", no_wrap=True)
+    table.add_column("status")
+    table.add_column("objects", justify="right")
+    table.add_column("elapsed (s)", justify="right")
+    table.add_column("error")
+    run_collids = {spec.collid for spec in specs}
+    for job in get_jobs(jobs_session):
+        if job.collid not in run_collids:
+            continue
+        telemetry = queue.telemetry.get(job.collid)
+        table.add_row(
+            job.collid,
+            job.status,
+            str(job.num_objects),
+            f"{telemetry.elapsed:.1f}" if telemetry else "",
+            job.error or "",
+        )
+    console.print(table)
+    if report:
+        report.write_text(json.dumps({
+            "elapsed": elapsed,
+            "jobs": [telemetry.to_dict() | {"status": statuses[collid]} for collid, telemetry in queue.telemetry.items()],
+        }, indent=2))
+        console.print(f":bar_chart: run report written to {report}")
+
+    publish_snapshot_if_serving()
+    if JOB_FAILED in statuses.values():
+        raise typer.Exit(code=1)
+
+
+@catalog_app.command("pack-archive")
+def pack_archive(
+    path: Annotated[
+        Path,
+        typer.Argument(help="The zip to write")
+    ],
+    collections: Annotated[
+        list[str],
+        typer.Argument(help="collid:class pairs, e.g. bhl:image")
+    ],
+    limit: Annotated[
+        int,
+        typer.Option(help="Objects per collection, as with collection --limit")
+    ] = -1,
+    requests_per_second: RequestsPerSecond = None,
+):
+    """
+    Writes the pages and manifests of each collection, fetched through
+    the cache, to a zip that collection and import-batch can replay with
+    `--archive`, without the network.
+    """
+    limiter = HostRateLimiter(rate=requests_per_second or config.dlxs_requests_per_second)
+    pairs = [parse_collection_pair(pair) for pair in collections]
+
+    def responses():
+        for collid, class_ in pairs:
+            collection_url = get_collection_url(class_, collid)
+            # the same pages and manifests harvest_collection reads, with the same limit
+            seen = set()
+            while collection_url:
+                yield collection_url, fetch_path(collection_url, limiter=limiter)
+                collection_data = fetch(collection_url)
+                for datum in collection_data['manifests']:
+                    if limit > 0 and len(seen) >= limit:
+                        break
+                    if datum['@id'] in seen:
+                        continue
+                    seen.add(datum['@id'])
+                    yield datum['@id'], fetch_path(datum['@id'], limiter=limiter)
+                if limit > 0 and len(seen) >= limit:
+                    break
+                collection_url = collection_data.get('next', None)
+            console.print(f":package: {collid} : {len(seen)} manifests")
+
+    num_responses = write_archive(path, responses())
+    console.print(f":thumbs_up: {num_responses} responses written to {path}", style="bold green")
 
-            console.print(f":frame_with_picture:\t{num_processed} : importing {datum['label']}")
-            if limit > 0 and num_processed >= limit: break
 
+@catalog_app.command()
+def ingest(
+    path: Path,
+    alternate_identifier: Annotated[
+        str,
+        typer.Option(help="Alternate identifier for the object [default: the package directory name]")
+    ] = None,
+    title: str = None,
+    collid: Annotated[
+        str,
+        typer.Option(help="Add the object to this (existing) collection")
+    ] = None,
+    workers: Annotated[
+        int,
+        typer.Option(help="Number of hashing threads")
+    ] = os.cpu_count(),
+    storage_root: Annotated[
+        Path,
+        typer.Option(help="Root for object file identifiers [default: DOR_STORAGE_ROOT if the package is under it, else PATH]")
+    ] = None,
+):
+    started_at = datetime.now()
+    path = path.resolve()
+    if not storage_root:
+        default_root = config.get_storage_root().resolve()
+        storage_root = default_root if path.is_relative_to(default_root) else path
+
+    package = scan_package(path, root=storage_root)
+    # a new object's bin is its identifier
+    session = route(get_session(), package.object.identifier)
+    existing = session.execute(
+        select(CurrentRevision).filter_by(intellectual_object_identifier=package.object.identifier)
+    ).scalar_one_or_none()
+    if existing:
+        console.print(f":no_entry: {package.object.identifier} is already in the catalog", style="bold red")
+        raise typer.Exit(code=1)
 
+    collection = None
+    if collid:
+        collection = session.execute(
+            select(Collection).filter_by(alternate_identifiers=collid)
+        ).scalar_one_or_none()
+        if collection is None:
+            console.print(f":no_entry: {collid} is not in the catalog", style="bold red")
+            raise typer.Exit(code=1)
+
+    # hash the largest files first so one big TIFF doesn't finish last on its own
+    paths = sorted(
+        (package_file.path for package_file in package.files),
+        key=lambda p: p.stat().st_size, reverse=True
+    )
+    num_bytes = 0
+    hashes = {}
+    for file_hash in hash_files(paths, workers=workers):
+        if file_hash.error:
+            console.print(f":no_entry: {file_hash.path} : {file_hash.error}", style="bold red")
+            raise typer.Exit(code=1)
+        hashes[file_hash.path] = file_hash
+        num_bytes += file_hash.size
+    elapsed = (datetime.now() - started_at).total_seconds()
+    console.print(f":abacus: {len(hashes)} files hashed : {num_bytes} bytes : {num_bytes / elapsed / 1e6:.1f} MB/s")
+
+    intellectual_object = build_intellectual_object_from_package(
+        package,
+        hashes,
+        alternate_identifier=alternate_identifier or path.name,
+        title=title or alternate_identifier or path.name,
+        started_at=started_at,
+    )
 
+    document = build_object_document(intellectual_object, [collection] if collection else [])
+    stats = count_object_stats(intellectual_object)
+    loader = CopyLoader() if supports_copy(session) else None
+    if loader:
+        loader.detach(intellectual_object)
+    session.add(intellectual_object)
+    session.add(document)
+    if collection:
+        collection.objects.append(intellectual_object)
+    session.flush()
+    if collection:
+        apply_stat_deltas(session, collection.id, stats)
+    if loader:
+        loader.copy(session)
+    bump_generation(session)
+    session.commit()
 
-        collection_url = collection_data.get('next', None)
-        if not collection_url or limit > 0 and num_processed >= limit:
-            break
-    
-        console.print(f":stopwatch: pausing until fetching {collection_url}")
-        time.sleep(random.uniform(2.0, 5.0))
+    console.print(
+        f":inbox_tray: {intellectual_object.identifier} : {len(package.filesets)} filesets ingested",
+        style="bold green"
+    )
+    publish_snapshot_if_serving()
 
 
 @catalog_app.command()
-def objects(object_type: str = None, collid: str = None):
-    
-    stmt = (
-        select(CurrentRevision.intellectual_object_identifier)
-        .join(IntellectualObject)
-    )
+def documents(
+    collid: Annotated[
+        str,
+        typer.Option(help="Only rebuild documents for objects in this collection")
+    ] = None,
+    chunk_size: Annotated[
+        int,
+        typer.Option(help="Number of objects per transaction")
+    ] = 100,
+):
+    """(Re)build the object page documents, e.g. for objects imported before they existed."""
+    num_objects = 0
+    for session in shard_sessions(get_session()):
+        num_built = 0
+        for num_built in rebuild_object_documents(session, collid, chunk_size=chunk_size):
+            console.print(f":page_facing_up: {num_objects + num_built} object documents built")
+        num_objects += num_built
+    console.print(f":thumbs_up: {num_objects} object documents rebuilt", style="bold green")
+    publish_snapshot_if_serving()
 
-    if object_type:
-        stmt = stmt.filter_by(type=object_type)
 
+@catalog_app.command()
+def stats(
+    collid: Annotated[
+        str,
+        typer.Argument(help="Show the stats for this collection")
+    ] = None,
+    rebuild: Annotated[
+        bool,
+        typer.Option(help="Recompute the stats from the catalog first [default: for COLLID, or every collection]")
+    ] = False,
+):
+    """Show a collection's precomputed stats, or rebuild them."""
+    session = get_session()
+    collection = None
     if collid:
-        stmt = (stmt.join(IntellectualObject.collections)
-                .where(Collection.alternate_identifiers==collid))
+        collection = replica(session).execute(
+            select(Collection).filter_by(alternate_identifiers=collid)
+        ).scalar_one_or_none()
+        if collection is None:
+            console.print(f":no_entry: {collid} is not in the catalog", style="bold red")
+            raise typer.Exit(code=1)
+
+    if rebuild:
+        num_rows = 0
+        for shard_session in shard_sessions(session):
+            collection_ids = None
+            if collection:
+                # each shard has its own copy of the collection
+                collection_ids = list(shard_session.execute(
+                    select(Collection.id).filter_by(identifier=collection.identifier)
+                ).scalars())
+            num_rows += rebuild_collection_stats(shard_session, collection_ids)
+            shard_session.commit()
+        console.print(f":abacus: {num_rows} stats rows rebuilt", style="bold green")
+        publish_snapshot_if_serving()
+    if collection is None:
+        return
+
+    collection_stats = catalog.collections.get_stats(session, collection.identifier)
+    totals = collection_stats.totals
+    console.print(
+        f":card_file_box: {collid} : {totals.num_objects} objects : {totals.num_filesets} filesets : "
+        f"{totals.num_files} files : {totals.num_bytes} bytes"
+    )
+    table = Table(title="Object types")
+    table.add_column("type", no_wrap=True)
+    table.add_column("objects", justify="right")
+    for key, counts in collection_stats.by_object_type.items():
+        table.add_row(key, str(counts.num_objects))
+    console.print(table)
+
+    for title, rows in [
+        ("File formats", collection_stats.by_file_format),
+        ("File functions", collection_stats.by_file_function),
+    ]:
+        table = Table(title=title)
+        table.add_column("key", no_wrap=True)
+        table.add_column("files", justify="right")
+        table.add_column("size", justify="right")
+        for key, counts in rows.items():
+            table.add_row(key, str(counts.num_files), str(counts.num_bytes))
+        console.print(table)
 
-    possible_identifiers = list(session.execute(stmt).scalars())
 
-    random.shuffle(possible_identifiers)
+@catalog_app.command()
+def objects(
+    object_type: str = None,
+    collid: str = None,
+    sample: Annotated[
+        int,
+        typer.Option(help="Number of objects to sample")
+    ] = 100,
+    seed: Annotated[
+        int,
+        typer.Option(help="Seed for a repeatable sample [default: random]")
+    ] = None,
+):
+    session = get_session()
+    if seed is None:
+        seed = random.randrange(2**31)
+
+    rows = catalog.objects.sample(
+        session,
+        object_type=object_type,
+        collection_alt_identifier=collid,
+        size=sample,
+        seed=seed
+    )
 
-    table = Table(title="Intellectual Objects")
+    table = Table(title="Intellectual Objects", caption=f"seed: {seed}")
     table.add_column("bin", no_wrap=True)
     table.add_column("identifier", no_wrap=True)
     table.add_column("alternate_identifiers", no_wrap=False)
@@ -168,39 +675,42 @@ def objects(object_type: str = None, collid: str = None):
     table.add_column("size", no_wrap=True)
     table.add_column("title", no_wrap=False)
 
-    for identifier in random.sample(possible_identifiers, min([len(possible_identifiers), 100])):
-
-        query = sqlalchemy.select(IntellectualObject).where(IntellectualObject.bin_identifier==IntellectualObject.identifier)
-        if object_type:
-            query = query.filter_by(type=object_type)
-
-        intellectual_objects = session.execute(query.join(CurrentRevision).filter_by(
-            intellectual_object_identifier=identifier)).scalars()
-        for intellectual_object in intellectual_objects:
-            table.add_row(
-                str(intellectual_object.bin_identifier),
-                str(intellectual_object.identifier),
-                intellectual_object.alternate_identifiers,
-                intellectual_object.collections_summary,
-                intellectual_object.type,
-                str(intellectual_object.revision_number),
-                intellectual_object.updated_at.strftime("%Y-%m-%d %H:%M:%S"),
-                str(intellectual_object.total_data_size),
-                intellectual_object.title
-            )
+    for row in rows:
+        table.add_row(
+            str(row.bin_identifier),
+            str(row.identifier),
+            row.alternate_identifiers,
+            row.collections_summary,
+            row.type,
+            str(row.revision_number),
+            row.updated_at.strftime("%Y-%m-%d %H:%M:%S"),
+            str(row.total_data_size),
+            row.title
+        )
 
     console = config.console
     console.print(table)
 
 
 @catalog_app.command()
-def filesets(identifier: uuid.UUID):
-
-    intellectual_object = session.query(IntellectualObject).where(
-        IntellectualObject.bin_identifier == identifier
-    ).join(CurrentRevision).one()
-
-    table = Table(title="Filesets")
+def filesets(
+    identifier: uuid.UUID,
+    limit: Annotated[
+        int,
+        typer.Option(help="Show at most N filesets; -1 shows them all")
+    ] = -1,
+    offset: Annotated[
+        int,
+        typer.Option(help="Skip the first N filesets")
+    ] = 0,
+):
+    session = get_session()
+    summary = catalog.filesets.get_object_summary(session, identifier)
+    if summary is None:
+        console.print(f":no_entry: {identifier} is not in the catalog", style="bold red")
+        raise typer.Exit(code=1)
+
+    table = Table(title="Filesets", caption=f"{summary.num_filesets} filesets")
     table.add_column("bin", no_wrap=True)
     table.add_column("object title", no_wrap=True)
     table.add_column("identifier", no_wrap=True)
@@ -210,21 +720,70 @@ def filesets(identifier: uuid.UUID):
     table.add_column("revision", no_wrap=True)
     table.add_column("created_at", no_wrap=True)
     table.add_column("order_label", no_wrap=True)
-    table.add_column("size", no_wrap=True)
-    
-    for fileset in intellectual_object.filesets:
+    table.add_column("files", no_wrap=True, justify="right")
+    table.add_column("source files", no_wrap=True, justify="right")
+    table.add_column("size", no_wrap=True, justify="right")
+
+    rows = catalog.filesets.summarize(
+        session, summary.id, start=offset, limit=limit, bin_identifier=summary.bin_identifier
+    )
+    # rows are added as they arrive, so big objects render incrementally
+    with Live(table, console=console, refresh_per_second=4):
+        for row in rows:
+            table.add_row(
+                str(summary.bin_identifier),
+                summary.title,
+                str(row.identifier),
+                row.alternate_identifiers,
+                summary.collections_summary,
+                row.title,
+                str(row.revision_number),
+                row.created_at.strftime("%Y-%m-%d %H:%M:%S"),
+                row.order_label,
+                str(row.num_files),
+                str(row.num_source_files),
+                str(row.total_data_size),
+            )
+
+
+@catalog_app.command()
+def duplicates(
+    file_format: Annotated[
+        str,
+        typer.Option(help="Only consider files of this format, e.g. image/tiff")
+    ] = None,
+    limit: Annotated[
+        int,
+        typer.Option(help="Show the top N digests by reclaimable bytes; -1 streams every digest")
+    ] = 25,
+):
+    session = get_session()
+    table = Table(title="Duplicate content")
+    table.add_column("digest", no_wrap=True)
+    table.add_column("files", justify="right")
+    table.add_column("objects", justify="right")
+    table.add_column("collections", justify="right")
+    table.add_column("size", justify="right")
+    table.add_column("reclaimable", justify="right")
+
+    if limit > 0:
+        rows = catalog.duplicates.find(session, file_format=file_format, limit=limit).items
+    else:
+        rows = catalog.duplicates.stream(session, file_format=file_format)
+
+    for row in rows:
         table.add_row(
-            str(intellectual_object.bin_identifier),
-            intellectual_object.title,
-            str(fileset.identifier),
-            fileset.alternate_identifiers,
-            intellectual_object.collections_summary,
-            fileset.title,
-            str(fileset.revision_number),
-            fileset.created_at.strftime("%Y-%m-%d %H:%M:%S"),
-            fileset.order_label,
-            str(fileset.total_data_size),
+            row.digest.hex(),
+            str(row.num_files),
+            str(row.num_objects),
+            str(row.num_collections),
+            str(row.size),
+            str(row.reclaimable_bytes),
         )
-
-    console = config.console
     console.print(table)
+
+    totals = catalog.duplicates.get_totals(session, file_format=file_format)
+    console.print(
+        f":recycle: {totals.num_digests} digests shared by {totals.num_files} files : "
+        f"{totals.reclaimable_bytes} bytes reclaimable"
+    )
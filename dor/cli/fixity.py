@@ -0,0 +1,75 @@
+from datetime import timedelta
+from pathlib import Path
+from typing import Annotated
+
+import sqlalchemy
+import typer
+
+from dor.config import config
+from dor.services.fixity import FixityEngine
+
+console = config.console
+
+fixity_app = typer.Typer()
+
+
+@fixity_app.command()
+def run(
+    older_than_days: Annotated[
+        float,
+        typer.Option(help="Only check files whose last check is older than this")
+    ] = 90,
+    limit: Annotated[
+        int,
+        typer.Option(help="Maximum number of files to check; -1 for all overdue files")
+    ] = -1,
+    workers: Annotated[
+        int,
+        typer.Option(help="Number of hashing threads")
+    ] = 4,
+    batch_size: Annotated[
+        int,
+        typer.Option(help="Number of files checked and recorded per transaction")
+    ] = 500,
+    bytes_per_second: Annotated[
+        float,
+        typer.Option(help="Read budget across all workers; 0 for unlimited")
+    ] = 0,
+    storage_root: Annotated[
+        Path,
+        typer.Option(help="Root the object file identifiers are resolved against [default: DOR_STORAGE_ROOT]")
+    ] = None,
+):
+    engine = FixityEngine(
+        storage_root=storage_root or config.get_storage_root(),
+        workers=workers,
+        batch_size=batch_size,
+        bytes_per_second=bytes_per_second or None,
+    )
+
+    num_checked = 0
+    num_failures = 0
+    num_bytes = 0
+    # with DOR_SHARDS, each shard in turn, within the one limit
+    database_engines = config.create_shard_engines() if config.shards > 1 else [config.create_database_engine()]
+    for database_engine in database_engines:
+        if limit > 0 and num_checked >= limit:
+            break
+        with sqlalchemy.orm.Session(database_engine) as session:
+            for batch in engine.run(
+                session,
+                older_than=timedelta(days=older_than_days),
+                limit=limit - num_checked if limit > 0 else None
+            ):
+                num_checked += len(batch.results)
+                num_failures += len(batch.failures)
+                num_bytes += batch.num_bytes
+                for result in batch.failures:
+                    console.print(f":warning: {result.identifier} : {result.note}", style="bold red")
+                console.print(f":mag: {num_checked} files checked : {num_bytes} bytes : {num_failures} failures")
+        database_engine.dispose()
+
+    style = "bold red" if num_failures else "bold green"
+    console.print(f":shield: fixity run finished : {num_checked} checked, {num_failures} failed", style=style)
+    if num_failures:
+        raise typer.Exit(code=1)
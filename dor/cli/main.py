@@ -1,18 +1,93 @@
+import importlib
+from contextlib import contextmanager
+from typing import Annotated
+
+import click
 import typer
-from typing import List
+from typer.core import TyperGroup
+
+
+class LazyGroup(TyperGroup):
+    """
+    Imports a subcommand's module only when that subcommand runs, so
+    `dor --help` and `dor server start` don't pay for SQLAlchemy, Faker
+    or FastAPI. `lazy_subcommands` maps a name to (module, Typer app, help).
+    """
+    lazy_subcommands = {
+        "catalog": ("dor.cli.catalog", "catalog_app", "Harvest, ingest and query the catalog."),
+        "server": ("dor.cli.server", "server_app", "Run the console server."),
+        "fixity": ("dor.cli.fixity", "fixity_app", "Verify stored files against their digests."),
+        "bench": ("dor.cli.bench", "bench_app", "Benchmark the console against a synthetic catalog."),
+    }
+
+    _formatting_help = False
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        return sorted(set(super().list_commands(ctx)) | self.lazy_subcommands.keys())
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command | None:
+        if cmd_name not in self.lazy_subcommands:
+            return super().get_command(ctx, cmd_name)
+        module_name, app_name, help = self.lazy_subcommands[cmd_name]
+        if self._formatting_help:
+            # a stand-in with enough to list it
+            return click.Group(name=cmd_name, help=help)
+        module = importlib.import_module(module_name)
+        command = typer.main.get_group(getattr(module, app_name))
+        command.name = cmd_name
+        return command
+
+    def parse_args(self, ctx: click.Context, args: list[str]) -> list[str]:
+        # --profile's value is optional; a bare one would take the subcommand's name
+        args = ["--profile=cpu" if arg == "--profile" else arg for arg in args]
+        # names the profile after the command line
+        ctx.meta["dor.args"] = [arg for arg in args if not arg.startswith("--profile")]
+        return super().parse_args(ctx, args)
+
+    def format_help(self, ctx: click.Context, formatter: click.HelpFormatter) -> None:
+        self._formatting_help = True
+        try:
+            super().format_help(ctx, formatter)
+        finally:
+            self._formatting_help = False
+
+
+app = typer.Typer(cls=LazyGroup, no_args_is_help=True)
+
 
-from dor.cli.catalog import catalog_app
-from dor.cli.server import server_app
+@contextmanager
+def profiled(mode: str, name: str):
+    from dor.config import config
+    from dor.profiling import profile
 
-app = typer.Typer(no_args_is_help=True)
-app.add_typer(catalog_app, name="catalog")
-app.add_typer(server_app, name="server")
+    try:
+        with profile(mode) as result:
+            yield
+    finally:
+        paths = result.write(config.get_profile_root(), name)
+        config.console.print(
+            f":stopwatch: {mode} profile : {result.elapsed:.2f}s : {', '.join(str(path) for path in paths)}",
+            style="bold blue",
+        )
 
 
 @app.callback()
-def banner():
+def banner(
+    ctx: typer.Context,
+    profile: Annotated[
+        str,
+        typer.Option(
+            click_type=click.Choice(["cpu", "alloc"]),
+            metavar="[cpu|alloc]",
+            help="Profile the command with cProfile (cpu, the default) or tracemalloc (alloc); "
+                 "reports are written to DOR_PROFILE_ROOT, tmp/profiles by default",
+        )
+    ] = None,
+):
     """
     DOR Console Sandbox
 
     Decoupling console development.
     """
+    if profile:
+        ctx.with_resource(profiled(profile, " ".join(ctx.meta["dor.args"])))
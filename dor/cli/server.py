@@ -1,13 +1,54 @@
+import os
+from typing import Annotated
+
 import typer
-from fastapi import FastAPI
 
 server_app = typer.Typer()
 
 
 @server_app.command()
-def start(port: int = 8000):
+def start(
+    port: int = 8000,
+    host: str = "0.0.0.0",
+    production: Annotated[
+        bool,
+        typer.Option(help="Serve with worker processes, uvloop and httptools instead of the reloader")
+    ] = False,
+    workers: Annotated[
+        int,
+        typer.Option(help="Number of worker processes in --production mode")
+    ] = os.cpu_count(),
+    keep_alive: Annotated[
+        int,
+        typer.Option(help="Seconds to hold an idle keep-alive connection open")
+    ] = 15,
+    graceful_timeout: Annotated[
+        int,
+        typer.Option(help="Seconds to let in-flight requests finish on shutdown")
+    ] = 30,
+    access_log: Annotated[
+        bool,
+        typer.Option(help="Log every request")
+    ] = True,
+):
     import uvicorn
-    # Host '0.0.0.0' makes it accessible from outside localhost (e.g., in a container)
-    # Reload=True enables hot-reloading during development
-    uvicorn.run("dor.entrypoints.api.main:app", host="0.0.0.0", port=port, reload=True)
 
+    if not production:
+        # Host '0.0.0.0' makes it accessible from outside localhost (e.g., in a container)
+        # Reload=True enables hot-reloading during development
+        uvicorn.run("dor.entrypoints.api.main:app", host=host, port=port, reload=True)
+        return
+
+    # each worker is its own process: the lifespan warms its engine and templates
+    uvicorn.run(
+        "dor.entrypoints.api.main:app",
+        host=host,
+        port=port,
+        workers=workers,
+        loop="uvloop",
+        http="httptools",
+        timeout_keep_alive=keep_alive,
+        timeout_graceful_shutdown=graceful_timeout,
+        access_log=access_log,
+        proxy_headers=True,
+    )
@@ -1,6 +1,7 @@
 from sqlalchemy import Engine, event
 import os
-from dataclasses import dataclass
+import sqlite3
+from dataclasses import dataclass, field
 from pathlib import Path
 from importlib import resources
 
@@ -11,19 +12,119 @@ from rich.console import Console
 
 TMP_ROOT = resources.files("tmp")
 
+
+@dataclass(frozen=True)
+class StorageProfile:
+    """
+    A named set of SQLite pragmas applied to every connection.
+
+    serve: WAL so console readers don't block on an import, with a large
+        page cache and memory-mapped reads.
+    bulk-load: no fsyncs and an in-memory rollback journal; only safe
+        while a single importer owns the database.
+    snapshot: for published, immutable snapshots; everything is mapped
+        and nothing can write.
+    """
+    name: str
+    pragmas: dict[str, str | int] = field(default_factory=dict)
+
+
+SERVE_PROFILE = StorageProfile(
+    name="serve",
+    pragmas={
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -64_000,
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "MEMORY",
+    },
+)
+
+BULK_LOAD_PROFILE = StorageProfile(
+    name="bulk-load",
+    pragmas={
+        "journal_mode": "MEMORY",
+        "synchronous": "OFF",
+        "cache_size": -256_000,
+        "temp_store": "MEMORY",
+    },
+)
+
+SNAPSHOT_PROFILE = StorageProfile(
+    name="snapshot",
+    pragmas={
+        "query_only": "ON",
+        "cache_size": -64_000,
+        "mmap_size": 4 * 1024 * 1024 * 1024,
+        "temp_store": "MEMORY",
+    },
+)
+
+STORAGE_PROFILES = {
+    profile.name: profile for profile in [SERVE_PROFILE, BULK_LOAD_PROFILE]
+}
+
+
+def apply_storage_profile(dbapi_connection, profile: StorageProfile) -> str:
+    """
+    Sets the profile's pragmas; returns the journal mode in effect, which
+    can differ from the profile's: SQLite won't leave WAL while other
+    connections are reading.
+    """
+    cursor = dbapi_connection.cursor()
+    for pragma, value in profile.pragmas.items():
+        if pragma != "journal_mode":
+            cursor.execute(f"PRAGMA {pragma}={value}")
+            continue
+        try:
+            cursor.execute(f"PRAGMA journal_mode={value}")
+        except sqlite3.OperationalError:
+            # database is locked: a reader is holding on to the WAL
+            pass
+    journal_mode = cursor.execute("PRAGMA journal_mode").fetchone()[0]
+    cursor.close()
+    return journal_mode
+
+
 @dataclass
 class Config:
     database_path: Path
     console: Console
+    storage_profile: StorageProfile = SERVE_PROFILE
+    # e.g. postgresql+psycopg://dor@localhost/dor; falls back to database_path
+    database_url: str | None = None
+    # the API reads published snapshots; database_path becomes the staging database
+    serve_snapshots: bool = False
+    # lets /admin requests ask for a profile with ?_profile=1
+    profile_requests: bool = False
+    # what a profiled request must send in its X-DOR-Profile-Token header
+    profile_token: str | None = None
+    # partitions the catalog by bin_identifier; see create_shard_engines
+    shards: int = 1
+    # how often API workers check whether to rebuild the typeahead indexes
+    suggest_refresh_seconds: float = 30.0
+    # shared by every import fetching from a DLXS host; cached responses are free
+    dlxs_requests_per_second: float = 5.0
 
     @classmethod
     def from_env(cls):
         return cls(
             database_path=TMP_ROOT / "dev.sqlite3",
             console=Console(),
+            storage_profile=STORAGE_PROFILES[os.getenv("DOR_STORAGE_PROFILE", "serve")],
+            database_url=os.getenv("DOR_DATABASE_URL"),
+            serve_snapshots=os.getenv("DOR_SERVE_SNAPSHOTS", "") not in ("", "0", "false"),
+            profile_requests=os.getenv("DOR_PROFILE_REQUESTS", "") not in ("", "0", "false"),
+            profile_token=os.getenv("DOR_PROFILE_TOKEN") or None,
+            shards=int(os.getenv("DOR_SHARDS", "1")),
+            suggest_refresh_seconds=float(os.getenv("DOR_SUGGEST_REFRESH_SECONDS", "30")),
+            dlxs_requests_per_second=float(os.getenv("DOR_DLXS_REQUESTS_PER_SECOND", "5")),
         )
 
     def _make_database_engine_url(self):
+        if self.database_url:
+            return sqlalchemy.engine.make_url(self.database_url)
+
         url = sqlalchemy.engine.URL.create(
             drivername="sqlite",
             database=str( self.database_path ),
@@ -32,12 +133,87 @@ class Config:
 
     def get_database_engine_url(self):
         return self._make_database_engine_url()
+
+    def create_database_engine(self, url: str | sqlalchemy.engine.URL | None = None, **kwargs) -> Engine:
+        """An engine for `url`, by default the catalog database."""
+        url = sqlalchemy.engine.make_url(url) if url else self.get_database_engine_url()
+        engine = sqlalchemy.create_engine(url, **kwargs)
+
+        if url.get_backend_name() == "sqlite":
+            @event.listens_for(engine, "connect")
+            def set_sqlite_pragma(dbapi_connection, connection_record):
+                cursor = dbapi_connection.cursor()
+                cursor.execute("PRAGMA foreign_keys=ON")
+                cursor.close()
+                apply_storage_profile(dbapi_connection, self.storage_profile)
+
+        return engine
+
+    def get_shard_schema(self, shard: int) -> str:
+        return f"dor_shard_{shard}"
+
+    def create_shard_engines(self, **kwargs) -> list[Engine]:
+        """
+        One engine per shard. For SQLite, shards are files next to the
+        catalog database (dev.shard0.sqlite3, ...); for PostgreSQL, schemas
+        (dor_shard_0, ...) in the catalog database, selected per connection
+        with search_path.
+        """
+        url = self.get_database_engine_url()
+        engines = []
+        for shard in range(self.shards):
+            if url.get_backend_name() == "sqlite":
+                path = Path(url.database)
+                engines.append(self.create_database_engine(
+                    url.set(database=str(path.with_name(f"{path.stem}.shard{shard}{path.suffix}"))), **kwargs
+                ))
+                continue
+
+            engine = self.create_database_engine(url, **kwargs)
+            schema = self.get_shard_schema(shard)
+
+            @event.listens_for(engine, "connect")
+            def set_search_path(dbapi_connection, connection_record, schema=schema):
+                cursor = dbapi_connection.cursor()
+                cursor.execute(f"SET search_path TO {schema}")
+                cursor.close()
+                dbapi_connection.commit()
+
+            engines.append(engine)
+        return engines
+
+    def create_snapshot_engine(self, path: Path, **kwargs) -> Engine:
+        """
+        Opens a published snapshot read-only and `immutable`, so SQLite skips
+        locking and change detection; the file must never be written again.
+        """
+        url = sqlalchemy.engine.URL.create(
+            drivername="sqlite",
+            database=f"file:{path}",
+            query={"mode": "ro", "immutable": "1", "uri": "true"},
+        )
+        engine = sqlalchemy.create_engine(url, **kwargs)
+
+        @event.listens_for(engine, "connect")
+        def set_snapshot_pragma(dbapi_connection, connection_record):
+            apply_storage_profile(dbapi_connection, SNAPSHOT_PROFILE)
+
+        return engine
+
+    def get_snapshot_root(self) -> Path:
+        return Path(os.getenv("DOR_SNAPSHOT_ROOT", TMP_ROOT / "snapshots"))
     
+    def get_profile_root(self) -> Path:
+        return Path(os.getenv("DOR_PROFILE_ROOT", TMP_ROOT / "profiles"))
+
     def get_cache_path(self):
         cache_path = TMP_ROOT / "cache"
         cache_path.makedirs(exist_ok=True)
         return cache_path
     
+    def get_storage_root(self) -> Path:
+        return Path(os.getenv("DOR_STORAGE_ROOT", TMP_ROOT / "storage"))
+
     def get_dlxs_image_api_url(self, class_: str):
         hostname = os.getenv("DLXS_HOST", "quod.lib.umich.edu")
         return f"https://{hostname}/cgi/{class_[0]}/{class_}/api"
@@ -45,9 +221,3 @@ class Config:
 
 config = Config.from_env()
 
-
-@event.listens_for(Engine, "connect")
-def set_sqlite_pragma(dbapi_connection, connection_record):
-    cursor = dbapi_connection.cursor()
-    cursor.execute("PRAGMA foreign_keys=ON")
-    cursor.close()
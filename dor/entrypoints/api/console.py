@@ -1,24 +1,40 @@
+import zlib
+from datetime import date, datetime, time, timedelta
+from typing import Annotated, Literal
+from urllib.parse import urlencode
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Request, status
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi import APIRouter, Depends, Query, Request, status
+from fastapi.responses import HTMLResponse, JSONResponse, Response, StreamingResponse
 from fastapi.templating import Jinja2Templates
 
 from dor.entrypoints.api.dependencies import get_db_session
+from dor.models.premis_event import PremisEvent
+from dor.serializers import ModelSerializer, dumps, premis_event_serializer
 from dor.services.catalog import catalog
-from dor.utils import Filter, converter
+from dor.services.suggest import MAX_SUGGESTIONS, Suggestions
+from dor.utils import Filter, Page
 
 
 console_router = APIRouter(prefix="/console")
 templates = Jinja2Templates(directory="templates")
 templates.env.add_extension('jinja2.ext.loopcontrols')
 
+# timeline rows, less the database id, as lines of NDJSON
+event_line_serializer = ModelSerializer(PremisEvent, exclude=("id",))
+
 def template_name(name, modal=False):
     return f"{name}{'_modal' if modal else ''}.html"
 
 
+def json_response(content: bytes) -> Response:
+    return Response(content=content, media_type="application/json")
+
+
+# routes that query the catalog are plain functions, so they run on the
+# threadpool instead of blocking the worker's event loop
 @console_router.get("/collections/")
-async def get_collections(request: Request, start: int = 0, collection_type: str = None, session=Depends(get_db_session)) -> HTMLResponse:
+def get_collections(request: Request, start: int = 0, collection_type: str = None, session=Depends(get_db_session)) -> HTMLResponse:
 
     page = catalog.collections.find(
         session=session, start=start, collection_type=collection_type)
@@ -28,8 +44,29 @@ async def get_collections(request: Request, start: int = 0, collection_type: str
     )
 
 
+@console_router.get("/collections/{identifier}/stats")
+def get_collection_stats(request: Request, identifier: UUID, session=Depends(get_db_session)) -> HTMLResponse:
+    stats = catalog.collections.get_stats(session=session, identifier=identifier)
+    if stats is None:
+        return HTMLResponse(status_code=status.HTTP_404_NOT_FOUND)
+    collection = catalog.collections.get(session=session, identifier=identifier)
+
+    if "application/json" in request.headers.get("accept", ""):
+        return json_response(dumps({
+            "identifier": collection.identifier,
+            "alternate_identifiers": collection.alternate_identifiers,
+            **vars(stats),
+        }))
+
+    return templates.TemplateResponse(
+        request=request,
+        name="collection_stats.html",
+        context={"collection": collection, "stats": stats, "title": f"Collection: {collection.title}"}
+    )
+
+
 @console_router.get("/objects/")
-async def get_objects(
+def get_objects(
     request: Request,
     start: int = 0,
     object_type: str | None = None,
@@ -75,26 +112,57 @@ async def get_objects(
     )
 
 
+@console_router.get("/suggest")
+async def get_suggestions(
+    request: Request,
+    field: Literal["alt_identifier", "collection", "title"],
+    prefix: str = "",
+    limit: Annotated[int, Query(ge=1, le=MAX_SUGGESTIONS)] = 10,
+) -> Response:
+    """Typeahead for the filter forms, from the worker's in-memory index; no database round trip."""
+    suggestions: Suggestions = request.app.state.suggestions
+    return json_response(dumps({
+        "field": field,
+        "prefix": prefix,
+        "suggestions": suggestions.search(field, prefix, limit=limit),
+        "generation": suggestions.generation,
+    }))
+
+
 @console_router.get("/objects/{identifier}/")
-async def get_object(
+def get_object(
     request: Request,
     identifier: UUID,
     fileset_start: int = 0,
     session=Depends(get_db_session)
 ) -> HTMLResponse:
 
-    object = catalog.objects.get(session=session, identifier=identifier)
+    if "application/json" in request.headers.get("accept", ""):
+        document = catalog.objects.get_document(session=session, identifier=identifier)
+        if document:
+            # stored as JSON already; just inflate it
+            return json_response(zlib.decompress(document))
+        object = catalog.objects.get_view(session=session, identifier=identifier)
+        if not object:
+            return JSONResponse(status_code=status.HTTP_404_NOT_FOUND, content=None)
+        return json_response(dumps(object))
+
+    object = catalog.objects.get_view(session=session, identifier=identifier)
 
     if not object:
         return HTMLResponse(status_code=status.HTTP_404_NOT_FOUND)
 
-    filesets_page = catalog.filesets.find(
-        session=session, object_identifier=identifier, start=fileset_start, limit=10
+    filesets_page = Page(
+        total_items=len(object.filesets),
+        offset=fileset_start,
+        limit=10,
+        items=object.filesets[fileset_start:fileset_start + 10]
     )
 
     context = dict(
         title=f"Object: {object.title}",
         object=object,
+        object_identifier=object.identifier,
         filesets_page=filesets_page,
         events=object.premis_events
     )
@@ -104,8 +172,123 @@ async def get_object(
     )
 
 
+@console_router.get("/objects/{identifier}/filesets")
+def get_object_filesets(
+    request: Request,
+    identifier: UUID,
+    fileset_start: int = 0,
+    session=Depends(get_db_session)
+) -> HTMLResponse:
+    """
+    One page of the object page's fileset list, for the browser to append
+    as it's asked for; none of the rest of the object is read or rendered.
+    """
+    filesets_page = catalog.filesets.get_views(
+        session=session, object_identifier=identifier, start=fileset_start, limit=10
+    )
+    if filesets_page is None:
+        return HTMLResponse(status_code=status.HTTP_404_NOT_FOUND)
+
+    return templates.TemplateResponse(
+        request=request,
+        name="partials/_filesets.html",
+        context={"object_identifier": identifier, "filesets_page": filesets_page}
+    )
+
+
+@console_router.get("/duplicates/")
+def get_duplicates(
+    request: Request,
+    start: int = 0,
+    file_format: str | None = None,
+    session=Depends(get_db_session)
+) -> HTMLResponse:
+
+    page = catalog.duplicates.find(session=session, file_format=file_format, start=start, limit=25)
+    totals = catalog.duplicates.get_totals(session=session, file_format=file_format)
+    files_by_digest = catalog.duplicates.get_files(
+        session=session, digests=[item.digest for item in page.items]
+    )
+
+    filters: list[Filter] = [
+        Filter(key="file_format", value=file_format, name="File Format"),
+    ]
+    active_query_parameters = { filter.key: filter.value for filter in filters if filter.value }
+    labels = [filter.make_label(active_query_parameters) for filter in filters if filter.value]
+
+    context = {
+        "title": "Duplicates",
+        "page": page,
+        "totals": totals,
+        "files_by_digest": files_by_digest,
+        "filter_labels": labels
+    }
+
+    return templates.TemplateResponse(
+        request=request, name="duplicates.html", context=context
+    )
+
+
+@console_router.get("/events/")
+def get_events(
+    request: Request,
+    event_type: Annotated[list[str], Query()] = [],
+    start_date: date | None = None,
+    end_date: date | None = None,
+    collection_alt_identifier: str | None = None,
+    after: str | None = None,
+    session=Depends(get_db_session)
+):
+    filter_args = dict(
+        event_types=event_type,
+        start_date=datetime.combine(start_date, time.min) if start_date else None,
+        # inclusive of the whole end day
+        end_date=datetime.combine(end_date + timedelta(days=1), time.min) if end_date else None,
+        collection_alt_identifier=collection_alt_identifier,
+    )
+
+    if "application/x-ndjson" in request.headers.get("accept", ""):
+        lines = event_line_serializer.dumps_lines(catalog.events.stream(session=session, **filter_args))
+        return StreamingResponse(lines, media_type="application/x-ndjson")
+
+    try:
+        page = catalog.events.timeline(session=session, cursor=after, limit=50, **filter_args)
+    except ValueError:
+        return HTMLResponse(status_code=status.HTTP_400_BAD_REQUEST)
+
+    filters: list[Filter] = [
+        Filter(key="event_type", value=event_type, name="Event Type"),
+        Filter(key="start_date", value=start_date and start_date.isoformat(), name="From"),
+        Filter(key="end_date", value=end_date and end_date.isoformat(), name="Until"),
+        Filter(key="collection_alt_identifier", value=collection_alt_identifier, name="Collection")
+    ]
+    active_query_parameters = { filter.key: filter.value for filter in filters if filter.value }
+    labels = [filter.make_label(active_query_parameters) for filter in filters if filter.value]
+
+    collection_alt_identifiers = [
+        collection.alternate_identifiers
+        for collection in catalog.collections.find(session, limit=10000).items
+    ]
+
+    context = {
+        "title": "Events",
+        "page": page,
+        "event_types": catalog.events.get_distinct_types(session),
+        "collection_alt_identifiers": collection_alt_identifiers,
+        "filter_labels": labels,
+        "first_page_url": "?" + urlencode(active_query_parameters, doseq=True),
+        "next_page_url": page.next_cursor and "?" + urlencode(
+            dict(active_query_parameters, after=page.next_cursor), doseq=True
+        ),
+    }
+
+    return templates.TemplateResponse(
+        request=request, name="events.html", context=context
+    )
+
+
 @console_router.get("/events/{identifier}")
-async def get_event(
+def get_event(
     request: Request, identifier: UUID, modal: bool = False, session=Depends(get_db_session)
 ) -> HTMLResponse:
     event = catalog.events.get(session=session, identifier=identifier)
@@ -114,7 +297,7 @@ async def get_event(
     
     # probably not useful in the UI but an example of how we could return JSON
     if "application/json" in request.headers.get("accept", ""):
-        return JSONResponse(converter.unstructure(event.to_dict()))
+        return json_response(premis_event_serializer.dumps(event))
     
     return templates.TemplateResponse(
         request=request, 
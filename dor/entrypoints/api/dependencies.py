@@ -1,11 +1,42 @@
+from functools import cache
+
 import sqlalchemy
 
+from dor.adapters.shards import ShardRouter
+from dor.adapters.snapshots import SnapshotEngine
 from dor.config import config
 
 
+@cache
+def get_database_engine() -> sqlalchemy.Engine:
+    """One engine, and so one connection pool, per worker process."""
+    return config.create_database_engine()
+
+
+@cache
+def get_snapshot_engine() -> SnapshotEngine:
+    return SnapshotEngine(root=config.get_snapshot_root(), create_engine=config.create_snapshot_engine)
+
+
+@cache
+def get_shard_router() -> ShardRouter:
+    return ShardRouter(engines=config.create_shard_engines())
+
+
+def get_engine() -> sqlalchemy.Engine:
+    """The latest published snapshot with DOR_SERVE_SNAPSHOTS, otherwise the catalog database."""
+    if config.serve_snapshots:
+        return get_snapshot_engine().get()
+    return get_database_engine()
+
+
 def get_db_session():
-    engine = sqlalchemy.create_engine(config.get_database_engine_url())
-    with sqlalchemy.orm.Session(engine) as session:
+    """A session, or with DOR_SHARDS, a session per shard (snapshots aren't sharded)."""
+    if config.shards > 1:
+        with get_shard_router().session() as session:
+            yield session
+        return
+    with sqlalchemy.orm.Session(get_engine()) as session:
         yield session
 
 
@@ -1,16 +1,155 @@
+import asyncio
+import hmac
+from contextlib import asynccontextmanager, suppress
+
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
 from fastapi import FastAPI, APIRouter, Request, status
 from fastapi.staticfiles import StaticFiles
 import logging
 
-from .console import console_router
+import sqlalchemy
+
+from dor.adapters.shards import ShardedSession
+from dor.config import config
+from dor.profiling import cumulative_time, profile_cpu, top_functions
+from dor.services.suggest import Suggestions, build_suggestions, refresh_suggestions
+from dor.telemetry import count_context_statements
+
+from .console import console_router, templates
+from .dependencies import get_engine, get_shard_router, get_snapshot_engine
 # from .filesets import filesets_router
 # from .packages import packages_router
 
-app = FastAPI()
+
+def open_session() -> sqlalchemy.orm.Session | ShardedSession:
+    if config.shards > 1:
+        return get_shard_router().session()
+    return sqlalchemy.orm.Session(get_engine())
+
+
+def load_suggestions(suggestions: Suggestions | None = None) -> Suggestions:
+    with open_session() as session:
+        if suggestions is None:
+            return build_suggestions(session)
+        return refresh_suggestions(session, suggestions)
+
+
+async def keep_suggestions_fresh(app: FastAPI, interval: float):
+    """
+    Polls the catalog generation, which imports and purges bump, and swaps
+    in rebuilt indexes when it moves. Requests keep reading the old ones
+    while the new ones are built.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            app.state.suggestions = await asyncio.to_thread(load_suggestions, app.state.suggestions)
+        except Exception:
+            logging.exception("could not refresh the suggestion indexes")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Runs once per worker: pay for mapper configuration, the first pooled
+    connection and template compilation before the first request does,
+    and build the typeahead indexes.
+    """
+    sqlalchemy.orm.configure_mappers()
+    engines = get_shard_router().engines if config.shards > 1 else [get_engine()]
+    for engine in engines:
+        with engine.connect() as connection:
+            connection.execute(sqlalchemy.text("SELECT 1"))
+    for name in templates.env.list_templates(extensions=["html"]):
+        templates.env.get_template(name)
+    try:
+        app.state.suggestions = load_suggestions()
+    except Exception:
+        logging.exception("could not build the suggestion indexes")
+        app.state.suggestions = Suggestions(generation=-1)
+    # cProfile profiles one request at a time
+    app.state.profile_lock = asyncio.Lock()
+    refresh = asyncio.create_task(keep_suggestions_fresh(app, config.suggest_refresh_seconds))
+    yield
+    refresh.cancel()
+    with suppress(asyncio.CancelledError):
+        await refresh
+    if config.shards > 1:
+        get_shard_router().dispose()
+    elif config.serve_snapshots:
+        get_snapshot_engine().dispose()
+    else:
+        engines[0].dispose()
+
+
+PROFILE_TOKEN_HEADER = "X-DOR-Profile-Token"
+
+app = FastAPI(lifespan=lifespan)
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
+
+def is_profile_admin(request: Request) -> bool:
+    token = request.headers.get(PROFILE_TOKEN_HEADER, "")
+    return bool(config.profile_token) and hmac.compare_digest(token.encode(), config.profile_token.encode())
+
+
+@app.middleware("http")
+async def profile_request(request: Request, call_next):
+    """
+    With DOR_PROFILE_REQUESTS set, `?_profile=1` on an /admin route returns
+    a profile of the request instead of the page: its SQL, template and
+    Python time, and the hottest functions. The profile is also written
+    to DOR_PROFILE_ROOT. Template time includes any SQL run while rendering.
+
+    The SQL is the request's own, on whichever engines its session uses:
+    shards, a snapshot or the catalog database. Profiled requests wait for
+    each other, but cProfile sees every thread, so the Python side also
+    counts unprofiled requests running at the same time.
+
+    Profiles show the catalog's queries, so a profiled request must send
+    DOR_PROFILE_TOKEN in its X-DOR-Profile-Token header; without a token
+    configured, or with the wrong one, it's refused with a 403.
+    """
+    if not (
+        config.profile_requests
+        and request.query_params.get("_profile") not in (None, "", "0")
+        and request.url.path.startswith("/admin")
+    ):
+        return await call_next(request)
+    if not is_profile_admin(request):
+        return JSONResponse(
+            status_code=status.HTTP_403_FORBIDDEN, content={"detail": "profiling needs the profile token"}
+        )
+
+    async with request.app.state.profile_lock:
+        with count_context_statements() as statements, profile_cpu() as result:
+            response = await call_next(request)
+            # streamed bodies are rendered as they're read
+            async for _ in response.body_iterator:
+                pass
+
+    sql_time = statements.total_time
+    template_time = cumulative_time(result.stats, "jinja2/environment.py", "render")
+    slowest = sorted(
+        zip(statements.statements, statements.durations), key=lambda pair: pair[1] or 0, reverse=True
+    )[:5]
+    paths = result.write(config.get_profile_root(), f"{request.method} {request.url.path}")
+    return JSONResponse({
+        "path": request.url.path,
+        "status_code": response.status_code,
+        "elapsed": result.elapsed,
+        "sql": {
+            "statements": statements.count,
+            "time": sql_time,
+            "slowest": [{"statement": statement, "time": duration} for statement, duration in slowest],
+        },
+        "templates": {"time": template_time},
+        "python": {"time": max(result.elapsed - sql_time - template_time, 0.0)},
+        "functions": top_functions(result.stats),
+        "files": [str(path) for path in paths],
+    })
+
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
 	exc_str = f'{exc}'.replace('\n', ' ').replace('   ', ' ')
@@ -0,0 +1,107 @@
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterator
+
+import ijson
+from ijson.common import ObjectBuilder
+
+SEQUENCE_PREFIX = "sequences.item"
+CANVASES_PREFIX = "sequences.item.canvases.item"
+REQUIRED_PROPERTIES = {"@id", "label"}
+
+# a manifest file, or a way to open a manifest's stream, such as from an archive
+ManifestSource = Path | Callable[[], BinaryIO]
+
+
+@dataclass
+class StreamedManifest:
+    """
+    A IIIF manifest read incrementally: `header` holds the top-level
+    properties other than `sequences`; `canvases` yields canvases one at a
+    time, and can only be iterated once.
+    """
+    header: dict
+    canvases: Iterator[dict]
+
+
+def _build_value(events, event: str, value):
+    """Builds the JSON value that starts with (`event`, `value`) from `events`."""
+    builder = ObjectBuilder()
+    builder.event(event, value)
+    depth = 1 if event in ("start_map", "start_array") else 0
+    while depth:
+        _, event, value = next(events)
+        builder.event(event, value)
+        if event in ("start_map", "start_array"):
+            depth += 1
+        elif event in ("end_map", "end_array"):
+            depth -= 1
+    return builder.value
+
+
+def _skip_value(events):
+    """Consumes the value `events` is positioned at, without building it."""
+    depth = 0
+    for _, event, _ in events:
+        if event in ("start_map", "start_array"):
+            depth += 1
+        elif event in ("end_map", "end_array"):
+            depth -= 1
+        if depth == 0:
+            return
+
+
+def _opener(source: ManifestSource) -> Callable[[], BinaryIO]:
+    return source if callable(source) else partial(open, source, "rb")
+
+
+def read_header(source: ManifestSource) -> dict:
+    """
+    The manifest's top-level properties, without building `sequences`.
+    Stops at `sequences` if `@id` and `label` came before it, as they
+    usually do; otherwise skips over it to read the rest.
+    """
+    header = {}
+    with _opener(source)() as f:
+        events = ijson.parse(f)
+        for prefix, event, value in events:
+            if prefix != "" or event != "map_key":
+                continue
+            if value == "sequences":
+                if REQUIRED_PROPERTIES <= header.keys():
+                    break
+                _skip_value(events)
+                continue
+            _, next_event, next_value = next(events)
+            header[value] = _build_value(events, next_event, next_value)
+    return header
+
+
+def first_sequence_canvases(f: BinaryIO) -> Iterator[dict]:
+    """
+    The canvases of the manifest's first sequence, one at a time, as
+    `manifest_data['sequences'][0]['canvases']` would list them.
+    """
+    events = ijson.parse(f)
+    for prefix, event, value in events:
+        if prefix == CANVASES_PREFIX and event == "start_map":
+            yield _build_value(events, event, value)
+        elif prefix == SEQUENCE_PREFIX and event == "end_map":
+            return
+
+
+@contextmanager
+def open_manifest(source: ManifestSource) -> Iterator[StreamedManifest]:
+    """
+    Streams the manifest at `source`, a path or a function that opens a
+    binary stream of it. The manifest's JSON is never held whole, and
+    `canvases` yields the first sequence's canvases one at a time, like
+    the builder reads them. Whatever the caller builds from the canvases
+    stays in memory, though: an object's ORM graph still grows with its
+    canvas count.
+    """
+    header = read_header(source)
+    with _opener(source)() as f:
+        yield StreamedManifest(header=header, canvases=first_sequence_canvases(f))
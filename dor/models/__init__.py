@@ -0,0 +1,14 @@
+# relationship() targets are resolved by class name when mappers configure, so
+# every model has to be registered whichever one a command happens to import
+from dor.models import (  # noqa: F401
+    catalog_generation,
+    checksum,
+    collection,
+    collection_stat,
+    fileset,
+    import_job,
+    intellectual_object,
+    object_document,
+    object_file,
+    premis_event,
+)
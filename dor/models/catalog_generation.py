@@ -0,0 +1,18 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from dor.adapters.sqlalchemy import Base
+
+
+class CatalogGeneration(Base):
+    """
+    A single row counting the imports and purges that have finished, so
+    caches built from the catalog know when to rebuild. Maintained by
+    dor.services.generation.
+    """
+    __tablename__ = "catalog_generation"
+    id: Mapped[int] = mapped_column(primary_key=True)
+    generation: Mapped[int] = mapped_column(Integer, default=0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
@@ -15,7 +15,7 @@ class Checksum(Base):
     algorithm: Mapped[str] = mapped_column(String)
     # xdatetime: Mapped[datetime] = mapped_column(DateTime(timezone=True))
     digest: Mapped[bytes] = mapped_column(
-        LargeBinary(32), unique=False, nullable=False)
+        LargeBinary(32), unique=False, nullable=False, index=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
     object_file_id: Mapped[int] = mapped_column(ForeignKey(
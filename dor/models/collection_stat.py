@@ -0,0 +1,26 @@
+from sqlalchemy import BigInteger, ForeignKey, Integer, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from dor.adapters.sqlalchemy import Base
+
+
+class CollectionStat(Base):
+    """
+    Rolled-up counts for one collection along one dimension, e.g.
+    ("file_format", "image/tiff"); ("total", "") has the collection's
+    totals. Maintained by dor.services.stats.
+    """
+    __tablename__ = "catalog_collection_stat"
+    id: Mapped[int] = mapped_column(primary_key=True)
+    collection_id: Mapped[int] = mapped_column(ForeignKey(
+        "catalog_collection.id", ondelete="CASCADE"), nullable=False)
+    dimension: Mapped[str] = mapped_column(String)
+    key: Mapped[str] = mapped_column(String)
+    num_objects: Mapped[int] = mapped_column(Integer, default=0)
+    num_filesets: Mapped[int] = mapped_column(Integer, default=0)
+    num_files: Mapped[int] = mapped_column(Integer, default=0)
+    num_bytes: Mapped[int] = mapped_column(BigInteger, default=0)
+
+    __table_args__ = (
+        UniqueConstraint('collection_id', 'dimension', 'key', name='uq_collection_stat'),
+    )
@@ -22,7 +22,7 @@ class Fileset(Base):
     order_label: Mapped[str] = mapped_column(String)
 
     intellectual_object_id: Mapped[int] = mapped_column(
-        ForeignKey("catalog_intellectual_object.id"), nullable=True, index=True
+        ForeignKey("catalog_intellectual_object.id", ondelete="CASCADE"), nullable=True, index=True
     )
 
     intellectual_object: Mapped["IntellectualObject"] = relationship(back_populates="filesets")
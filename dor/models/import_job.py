@@ -0,0 +1,29 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from dor.adapters.sqlalchemy import Base
+
+
+class ImportJob(Base):
+    """
+    One collection in the `dor catalog import-batch` queue, and how far it
+    got, so a stopped batch picks up where it left off. Maintained by
+    dor.services.harvest; with shards, kept on the first shard.
+    """
+    __tablename__ = "catalog_import_job"
+    id: Mapped[int] = mapped_column(primary_key=True)
+    collid: Mapped[str] = mapped_column(String, unique=True)
+    dlxs_class: Mapped[str] = mapped_column(String)
+    object_type: Mapped[str] = mapped_column(String)
+    collection_type: Mapped[str] = mapped_column(String)
+    # -1 for the whole collection
+    max_objects: Mapped[int] = mapped_column(Integer, default=-1)
+    # pending, running, done or failed
+    status: Mapped[str] = mapped_column(String, default="pending")
+    num_objects: Mapped[int] = mapped_column(Integer, default=0)
+    error: Mapped[str] = mapped_column(String, nullable=True)
+    queued_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    started_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True)
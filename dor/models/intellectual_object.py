@@ -3,7 +3,7 @@ from decimal import Decimal
 from typing import List
 import uuid
 
-from sqlalchemy import ARRAY, Column, DateTime, ForeignKey, Integer, String, UniqueConstraint, Uuid, and_, func
+from sqlalchemy import ARRAY, Column, DateTime, ForeignKey, Index, Integer, String, UniqueConstraint, Uuid, and_, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship, foreign, remote
 from sqlalchemy.ext.mutable import MutableList
 from sqlalchemy.ext.hybrid import hybrid_property
@@ -63,6 +63,8 @@ class IntellectualObject(Base):
 
     __table_args__ = (
         UniqueConstraint('identifier', 'revision_number', name='uq_intellectual_object_revision'),
+        # object listings page in this order, on one shard or merged across several
+        Index("ix_catalog_intellectual_object_alternate_identifiers", "alternate_identifiers", "identifier"),
     )
 
     @property
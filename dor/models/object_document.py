@@ -0,0 +1,33 @@
+from datetime import datetime
+import uuid
+
+from sqlalchemy import DateTime, ForeignKey, Integer, LargeBinary, UniqueConstraint, Uuid
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from dor.adapters.sqlalchemy import Base
+
+
+class ObjectDocument(Base):
+    """
+    A denormalized, compressed JSON document per intellectual object revision,
+    holding everything the object page needs; see dor.services.documents.
+    """
+    __tablename__ = "catalog_object_document"
+    id: Mapped[int] = mapped_column(primary_key=True)
+    intellectual_object_identifier: Mapped[uuid.UUID] = mapped_column(Uuid)
+    revision_number: Mapped[int] = mapped_column(Integer)
+    # the layout of `document`, bumped when the view dataclasses change
+    version: Mapped[int] = mapped_column(Integer)
+    # zlib-compressed UTF-8 JSON
+    document: Mapped[bytes] = mapped_column(LargeBinary)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    intellectual_object_id: Mapped[int] = mapped_column(ForeignKey(
+        "catalog_intellectual_object.id", ondelete="CASCADE"), unique=True, nullable=False)
+
+    intellectual_object: Mapped["IntellectualObject"] = relationship(passive_deletes=True)
+
+    __table_args__ = (
+        UniqueConstraint(
+            'intellectual_object_identifier', 'revision_number', name='uq_object_document_revision'
+        ),
+    )
@@ -3,11 +3,12 @@ from pathlib import Path
 from typing import List
 import uuid
 
-from sqlalchemy import ARRAY, Column, DateTime, ForeignKey, Integer, LargeBinary, String, UniqueConstraint, Uuid
+from sqlalchemy import ARRAY, BigInteger, Column, DateTime, ForeignKey, Integer, LargeBinary, String, UniqueConstraint, Uuid
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.ext.mutable import MutableList
 
 from dor.adapters.sqlalchemy import Base
+from dor.models.checksum import Checksum
 
 
 class ObjectFile(Base):
@@ -17,14 +18,16 @@ class ObjectFile(Base):
     # identifier: Mapped[uuid.UUID] = mapped_column(Uuid, unique=True)
     file_format: Mapped[str] = mapped_column(String, index=True)
     file_function: Mapped[str] = mapped_column(String, index=True)
-    size: Mapped[int] = mapped_column(Integer)
+    # local package files can be larger than 2 GiB
+    size: Mapped[int] = mapped_column(BigInteger)
     digest: Mapped[bytes] = mapped_column(
-        LargeBinary(32), unique=False, nullable=False)
+        LargeBinary(32), unique=False, nullable=False, index=True)
     revision_number: Mapped[int] = mapped_column(Integer)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
-    last_fixity_check: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True))
+    # None until the file's first fixity check
+    last_fixity_check: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), index=True)
     intellectual_object_id: Mapped[int] = mapped_column(
         ForeignKey("catalog_intellectual_object.id", ondelete="CASCADE"), index=True, nullable=True
     )
@@ -2,7 +2,7 @@ from datetime import datetime
 from typing import List
 import uuid
 
-from sqlalchemy import ARRAY, Column, DateTime, ForeignKey, Integer, LargeBinary, String, UniqueConstraint, Uuid
+from sqlalchemy import ARRAY, Column, DateTime, ForeignKey, Index, Integer, LargeBinary, String, UniqueConstraint, Uuid
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.ext.mutable import MutableList
 
@@ -37,6 +37,14 @@ class PremisEvent(Base):
     object_file: Mapped["ObjectFile"] = relationship(
         back_populates="premis_events")
 
+    # the event timeline pages through (date_time, id), by type or across all types
+    __table_args__ = (
+        Index("ix_catalog_premis_event_type_date_time", "type", "date_time", "id"),
+        Index("ix_catalog_premis_event_date_time", "date_time", "id"),
+    )
+
     def to_dict(self):
         """Converts the SQLAlchemy model instance to a dictionary."""
-        return {c.name: getattr(self, c.name) for c in self.__table__.columns}
+        # imported here; the serializers import the models
+        from dor.serializers import premis_event_serializer
+        return premis_event_serializer.to_dict(self)
@@ -0,0 +1,174 @@
+import cProfile
+import io
+import pstats
+import re
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+PROFILE_MODES = ["cpu", "alloc"]
+TRACEMALLOC_FRAMES = 32
+
+
+@dataclass
+class ProfileResult:
+    """
+    What a profiled block did: a readable report and the same samples as
+    collapsed stacks (`frame;frame;frame value` per line), the format
+    flamegraph.pl and speedscope read. `stats` is kept for cpu profiles
+    so they can be saved as .pstats and compared with pstats or snakeviz.
+    """
+    mode: str
+    elapsed: float = 0.0
+    report: str = ""
+    collapsed: list[str] = field(default_factory=list)
+    stats: pstats.Stats | None = None
+
+    def write(self, root: Path, name: str) -> list[Path]:
+        """Writes `<name>-<timestamp>.<mode>.txt`, `.collapsed` and, for cpu profiles, `.pstats` under `root`."""
+        root.mkdir(parents=True, exist_ok=True)
+        stem = f"{slugify(name)}-{datetime.now().strftime('%Y%m%dT%H%M%S%f')}.{self.mode}"
+        paths = [root / f"{stem}.txt", root / f"{stem}.collapsed"]
+        paths[0].write_text(self.report)
+        paths[1].write_text("\n".join(self.collapsed) + "\n")
+        if self.stats is not None:
+            paths.append(root / f"{stem}.pstats")
+            self.stats.dump_stats(paths[-1])
+        return paths
+
+
+def slugify(name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]+", "-", name).strip("-") or "profile"
+
+
+def format_function(function: tuple[str, int, str]) -> str:
+    filename, lineno, name = function
+    if filename == "~":
+        # a builtin, e.g. <method 'execute' of 'sqlite3.Cursor' objects>
+        return name
+    return f"{name} ({Path(filename).name}:{lineno})"
+
+
+def collapse_pstats(stats: pstats.Stats, max_depth: int = 64, min_seconds: float = 1e-5) -> list[str]:
+    """
+    Collapsed stacks from cProfile's caller graph. cProfile records edges,
+    not whole stacks, so a function's own time is split between its
+    callers in proportion to the time each call edge took. Paths worth
+    less than `min_seconds` are dropped, which keeps the walk tractable.
+    """
+    callees = {}
+    for function, (_, _, _, _, callers) in stats.stats.items():
+        for caller, (_, _, _, cumulative) in callers.items():
+            callees.setdefault(caller, []).append((function, cumulative))
+    # whatever was called from outside the profiled block, e.g. the first
+    # frames entered after profiling started, is a root for the time it took
+    roots = {}
+    for function, (_, _, _, cumulative, callers) in stats.stats.items():
+        called = sum(edge[3] for caller, edge in callers.items() if caller != function)
+        if cumulative and (not callers or cumulative - called >= min_seconds):
+            roots[function] = (cumulative - called) / cumulative if callers else 1.0
+
+    totals = {}
+
+    def walk(function, stack: tuple, share: float):
+        _, _, own, cumulative, _ = stats.stats[function]
+        stack = stack + (format_function(function),)
+        if own * share > 0:
+            key = ";".join(stack)
+            totals[key] = totals.get(key, 0.0) + own * share
+        if len(stack) >= max_depth:
+            return
+        for callee, edge_cumulative in callees.get(function, []):
+            if format_function(callee) in stack or not cumulative:
+                continue
+            callee_cumulative = stats.stats[callee][3]
+            if callee_cumulative and share * edge_cumulative >= min_seconds:
+                walk(callee, stack, share * edge_cumulative / callee_cumulative)
+
+    for root, share in roots.items():
+        walk(root, (), share)
+    # microseconds, as integers, which is what flame graph tools expect
+    return [f"{key} {round(seconds * 1e6)}" for key, seconds in sorted(totals.items()) if round(seconds * 1e6)]
+
+
+def top_functions(stats: pstats.Stats, limit: int = 25) -> list[dict]:
+    """The `limit` functions with the most cumulative time, for a JSON report."""
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:limit]
+    return [
+        {"function": format_function(function), "calls": calls, "own": own, "cumulative": cumulative}
+        for function, (_, calls, own, cumulative, _) in rows
+    ]
+
+
+def cumulative_time(stats: pstats.Stats, filename_suffix: str, name: str) -> float:
+    """Cumulative time in `name` from files ending in `filename_suffix`, e.g. jinja2's Template.render."""
+    return sum(
+        cumulative
+        for (filename, _, function_name), (_, _, _, cumulative, _) in stats.stats.items()
+        if function_name == name and filename.endswith(filename_suffix)
+    )
+
+
+@contextmanager
+def profile_cpu(limit: int = 40):
+    """Runs the block under cProfile; the result is filled in when it exits."""
+    result = ProfileResult(mode="cpu")
+    profiler = cProfile.Profile()
+    started_at = time.perf_counter()
+    profiler.enable()
+    try:
+        yield result
+    finally:
+        profiler.disable()
+        result.elapsed = time.perf_counter() - started_at
+        result.stats = pstats.Stats(profiler)
+        report = io.StringIO()
+        pstats.Stats(profiler, stream=report).sort_stats("cumulative").print_stats(limit)
+        result.report = report.getvalue()
+        result.collapsed = collapse_pstats(result.stats)
+
+
+@contextmanager
+def profile_alloc(limit: int = 40):
+    """
+    Runs the block under tracemalloc and reports the memory it allocated
+    and still held at the end, by line and by stack (in bytes).
+    """
+    result = ProfileResult(mode="alloc")
+    already_tracing = tracemalloc.is_tracing()
+    if not already_tracing:
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+    before = tracemalloc.take_snapshot()
+    started_at = time.perf_counter()
+    try:
+        yield result
+    finally:
+        result.elapsed = time.perf_counter() - started_at
+        after = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        if not already_tracing:
+            tracemalloc.stop()
+        filters = [tracemalloc.Filter(False, tracemalloc.__file__)]
+        after, before = after.filter_traces(filters), before.filter_traces(filters)
+
+        lines = [f"peak traced memory: {peak} bytes", "", "top allocations by line:"]
+        for statistic in after.compare_to(before, "lineno")[:limit]:
+            lines.append(f"  {statistic}")
+        result.report = "\n".join(lines) + "\n"
+
+        result.collapsed = [
+            ";".join(
+                f"{Path(frame.filename).name}:{frame.lineno}" for frame in statistic.traceback
+            ) + f" {statistic.size_diff}"
+            for statistic in after.compare_to(before, "traceback")
+            if statistic.size_diff > 0
+        ]
+
+
+def profile(mode: str):
+    if mode not in PROFILE_MODES:
+        raise ValueError(f"unknown profile mode {mode!r}; expected one of {', '.join(PROFILE_MODES)}")
+    return profile_cpu() if mode == "cpu" else profile_alloc()
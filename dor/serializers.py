@@ -0,0 +1,107 @@
+from dataclasses import dataclass, field
+from decimal import Decimal
+from operator import attrgetter, itemgetter
+from typing import Any, Iterable, Iterator
+
+import orjson
+import sqlalchemy
+from sqlalchemy import Row
+
+from dor.models.checksum import Checksum
+from dor.models.collection import Collection
+from dor.models.fileset import Fileset
+from dor.models.intellectual_object import IntellectualObject
+from dor.models.object_file import ObjectFile
+from dor.models.premis_event import PremisEvent
+
+# naive datetimes are UTC; all of them come out as 2024-01-31T12:00:00Z, as
+# the cattrs converter in dor.utils writes them
+OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z | orjson.OPT_OMIT_MICROSECONDS
+
+
+def default(value: Any) -> Any:
+    """What orjson can't encode natively: digests as hex, sums as numbers."""
+    if isinstance(value, bytes):
+        return value.hex()
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def dumps(value: Any) -> bytes:
+    """orjson with the catalog's defaults; dataclasses such as ObjectView encode as they are."""
+    return orjson.dumps(value, default=default, option=OPTIONS)
+
+
+def dumps_lines(values: Iterable[Any]) -> Iterator[bytes]:
+    for value in values:
+        yield orjson.dumps(value, default=default, option=OPTIONS | orjson.OPT_APPEND_NEWLINE)
+
+
+@dataclass
+class ModelSerializer:
+    """
+    Encodes instances of one model, or rows selected from it, as JSON
+    bytes. The column names and getters are worked out once, up front,
+    rather than by reflecting on the table for every value.
+    """
+    model: type
+    exclude: tuple[str, ...] = ()
+    fields: tuple[str, ...] = field(init=False)
+    _get_attributes: attrgetter = field(init=False, repr=False)
+    _row_getters: dict = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self):
+        self.fields = tuple(
+            attribute.key for attribute in sqlalchemy.inspect(self.model).column_attrs
+            if attribute.key not in self.exclude
+        )
+        self._get_attributes = attrgetter(*self.fields)
+
+    def _row_getter(self, row_fields: tuple[str, ...]) -> tuple[tuple[str, ...], itemgetter]:
+        # rows from the same query share their fields, so this runs once per query
+        getter = self._row_getters.get(row_fields)
+        if getter is None:
+            indexes = [index for index, name in enumerate(row_fields) if name not in self.exclude]
+            names = tuple(row_fields[index] for index in indexes)
+            getter = self._row_getters[row_fields] = (names, itemgetter(*indexes))
+        return getter
+
+    def to_dict(self, item) -> dict[str, Any]:
+        """An ORM instance, or a Row with any of its columns, as a dict of its (not excluded) fields."""
+        if isinstance(item, Row):
+            names, get_values = self._row_getter(item._fields)
+            values = get_values(item)
+            return dict(zip(names, values if len(names) != 1 else (values,)))
+        values = self._get_attributes(item)
+        return dict(zip(self.fields, values if len(self.fields) != 1 else (values,)))
+
+    def dumps(self, item) -> bytes:
+        return dumps(self.to_dict(item))
+
+    def dumps_many(self, items: Iterable) -> bytes:
+        return dumps([self.to_dict(item) for item in items])
+
+    def dumps_lines(self, items: Iterable) -> Iterator[bytes]:
+        """Newline-delimited JSON, one line per item, for streaming."""
+        return dumps_lines(self.to_dict(item) for item in items)
+
+
+collection_serializer = ModelSerializer(Collection)
+intellectual_object_serializer = ModelSerializer(IntellectualObject)
+fileset_serializer = ModelSerializer(Fileset)
+object_file_serializer = ModelSerializer(ObjectFile)
+checksum_serializer = ModelSerializer(Checksum)
+premis_event_serializer = ModelSerializer(PremisEvent)
+
+serializers: dict[type, ModelSerializer] = {
+    serializer.model: serializer
+    for serializer in [
+        collection_serializer,
+        intellectual_object_serializer,
+        fileset_serializer,
+        object_file_serializer,
+        checksum_serializer,
+        premis_event_serializer,
+    ]
+}
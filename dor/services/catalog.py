@@ -1,15 +1,26 @@
+import heapq
+import itertools
+import random
 from uuid import UUID
 from dataclasses import dataclass
+from datetime import datetime
 
 import sqlalchemy
-from sqlalchemy import Select, func, select
+from sqlalchemy import BigInteger, Select, case, distinct, func, select, tuple_
 from sqlalchemy.orm import Session
 
-from dor.models.collection import Collection
+from dor.adapters.shards import ShardedSession, replica, route, scatter, shard_sessions
+from dor.models.collection import Collection, collection_object_table
 from dor.models.fileset import Fileset
 from dor.models.intellectual_object import CurrentRevision, IntellectualObject
+from dor.models.object_document import ObjectDocument
+from dor.models.object_file import ObjectFile
 from dor.models.premis_event import PremisEvent
-from dor.utils import Page
+from dor.services.documents import (
+    DOCUMENT_VERSION, FilesetView, ObjectView, build_fileset_view, decode_document, load_object_view
+)
+from dor.services.stats import CollectionStats, get_collection_stats, merge_collection_stats
+from dor.utils import KeysetPage, Page, decode_cursor, encode_cursor
 
 
 def calculate_totals_query(query):
@@ -17,15 +28,90 @@ def calculate_totals_query(query):
     return select(func.count()).select_from(subquery_alias)
 
 
+def collections_summary_expression(intellectual_object_id):
+    """SQL for `IntellectualObject.collections_summary`, correlated on `intellectual_object_id`."""
+    return (
+        select(func.aggregate_strings(Collection.alternate_identifiers, "/"))
+        .join(collection_object_table, collection_object_table.c.collection_id == Collection.id)
+        .where(collection_object_table.c.intellectual_object_id == intellectual_object_id)
+        .scalar_subquery()
+    )
+
+
+def total_data_size_expression(intellectual_object_id):
+    """SQL for `IntellectualObject.total_data_size`, correlated on `intellectual_object_id`."""
+    return (
+        select(func.coalesce(func.sum(ObjectFile.size), 0))
+        .join(Fileset, ObjectFile.fileset_id == Fileset.id)
+        .where(
+            Fileset.intellectual_object_id == intellectual_object_id,
+            ObjectFile.file_function == "function:source"
+        )
+        .scalar_subquery()
+    )
+
+
+def num_filesets_expression(intellectual_object_id):
+    """SQL for `len(IntellectualObject.filesets)`, correlated on `intellectual_object_id`."""
+    return (
+        select(func.count(Fileset.id))
+        .where(Fileset.intellectual_object_id == intellectual_object_id)
+        .scalar_subquery()
+    )
+
+
+# rounds of random seeks before a sample is topped up from the lowest ids
+SAMPLE_ROUNDS = 8
+
+
+def sample_ids(session: Session, id_query: Select, size: int, seed: int) -> list[int]:
+    """
+    Up to `size` ids from `id_query`, which selects IntellectualObject.id,
+    chosen with a seeded random number generator without reading them all:
+    each draw is a random id between the lowest and the highest that
+    `id_query` selects, and an index seek to the first id at or after it.
+    Ids after a gap are drawn a little more often than the rest. A set of
+    `size` ids or fewer is read whole.
+    """
+    id_column = IntellectualObject.id
+    lowest_ids = session.execute(id_query.order_by(id_column).limit(size + 1)).scalars().all()
+    rng = random.Random(seed)
+    if len(lowest_ids) <= size:
+        return rng.sample(lowest_ids, len(lowest_ids))
+
+    low = lowest_ids[0]
+    high = session.execute(id_query.order_by(id_column.desc()).limit(1)).scalar_one()
+    sampled: dict[int, None] = {}
+    for _ in range(SAMPLE_ROUNDS):
+        starts = sqlalchemy.values(sqlalchemy.column("start", BigInteger), name="starts").data(
+            [(rng.randint(low, high),) for _ in range(size - len(sampled))]
+        ).cte()
+        seek = id_query.where(id_column >= starts.c.start).order_by(id_column).limit(1).scalar_subquery()
+        for sampled_id in session.execute(select(seek).select_from(starts)).scalars():
+            if sampled_id is not None:
+                sampled.setdefault(sampled_id)
+        if len(sampled) >= size:
+            break
+    for sampled_id in lowest_ids:
+        if len(sampled) >= size:
+            break
+        sampled.setdefault(sampled_id)
+    return list(sampled)[:size]
+
+
 @dataclass(kw_only=True)
 class Manager:
-    def _find(self, session: Session, query: Select, start: int, limit: int):
+    def _find(self, session: Session, query: Select, start: int, limit: int, scalars: bool = True, key=None):
+        if isinstance(session, ShardedSession):
+            return self._gather(session, query, start, limit, scalars, key)
+
         total_items_query = calculate_totals_query(query)
         total_items = session.execute(total_items_query).scalar_one()
 
         query = query.limit(limit).offset(start)
 
-        items = session.execute(query).scalars()
+        result = session.execute(query)
+        items = result.scalars() if scalars else result.all()
         return Page(
             total_items=total_items,
             offset=start,
@@ -33,6 +119,28 @@ class Manager:
             items=list(items)
         )
 
+    def _gather(self, session: ShardedSession, query: Select, start: int, limit: int, scalars: bool, key):
+        """
+        `_find` across shards: each shard counts its matches and returns its
+        first `start + limit` rows, and the rows are merged on `key`, which
+        has to sort them the way the query orders them.
+        """
+        total_items_query = calculate_totals_query(query)
+
+        def find_on_shard(shard_session: Session):
+            total_items = shard_session.execute(total_items_query).scalar_one()
+            result = shard_session.execute(query.limit(start + limit))
+            return total_items, list(result.scalars() if scalars else result.all())
+
+        results = session.scatter(find_on_shard)
+        items = heapq.merge(*(items for _, items in results), key=key)
+        return Page(
+            total_items=sum(total_items for total_items, _ in results),
+            offset=start,
+            limit=limit,
+            items=list(itertools.islice(items, start, start + limit))
+        )
+
 
 @dataclass(kw_only=True)
 class ObjectsManager(Manager):
@@ -46,7 +154,21 @@ class ObjectsManager(Manager):
         start: int = 0,
         limit: int = 100
     ):
-        query = select(IntellectualObject) \
+        """
+        A page of current objects with their collections summary, total data
+        size and fileset count, computed in the page query rather than per row,
+        in alternate identifier order.
+        """
+        query = select(
+            IntellectualObject.identifier,
+            IntellectualObject.alternate_identifiers,
+            IntellectualObject.type,
+            IntellectualObject.updated_at,
+            IntellectualObject.title,
+            collections_summary_expression(IntellectualObject.id).label("collections_summary"),
+            total_data_size_expression(IntellectualObject.id).label("total_data_size"),
+            num_filesets_expression(IntellectualObject.id).label("num_filesets"),
+        ) \
             .join(Collection, IntellectualObject.collections) \
             .join(CurrentRevision)
         if object_type:
@@ -55,10 +177,27 @@ class ObjectsManager(Manager):
             query = query.filter(IntellectualObject.alternate_identifiers.startswith(alt_identifier))
         if collection_alt_identifier:
             query = query.filter(Collection.alternate_identifiers == collection_alt_identifier)
+        query = query.order_by(IntellectualObject.alternate_identifiers, IntellectualObject.identifier)
+
+        return self._find(
+            session=session, query=query, start=start, limit=limit, scalars=False,
+            key=lambda row: (row.alternate_identifiers or "", row.identifier)
+        )
 
-        return self._find(session=session, query=query, start=start, limit=limit)
+    def get(
+        self, session: Session, identifier: UUID, from_document: bool = False
+    ) -> IntellectualObject | ObjectView | None:
+        """
+        With `from_document`, serves the current revision's precomputed
+        document if it has one, and falls back to the models if not.
+        """
+        # every revision shares its bin, and the first revision's identifier is the bin's
+        session = route(session, identifier)
+        if from_document:
+            document = self.get_document(session, identifier)
+            if document:
+                return decode_document(document)
 
-    def get(self, session: Session, identifier: UUID) -> IntellectualObject | None:
         query = select(IntellectualObject)
         query = query.join(CurrentRevision)
         query = query.filter(IntellectualObject.identifier==identifier)
@@ -69,26 +208,117 @@ class ObjectsManager(Manager):
         except sqlalchemy.exc.NoResultFound:
             return None
 
+    def get_view(self, session: Session, identifier: UUID) -> ObjectView | None:
+        """
+        The current revision as the object page shows it: its document, or
+        if it has none, a view loaded from the models in a fixed number of
+        queries.
+        """
+        session = route(session, identifier)
+        object = self.get(session, identifier, from_document=True)
+        if object is None or isinstance(object, ObjectView):
+            return object
+        return load_object_view(session, object)
+
+    def get_document(self, session: Session, identifier: UUID) -> bytes | None:
+        """The compressed document for the current revision: one lookup on two unique indexes."""
+        session = route(session, identifier)
+        query = select(ObjectDocument.document) \
+            .join(CurrentRevision, CurrentRevision.intellectual_object_id == ObjectDocument.intellectual_object_id) \
+            .filter(
+                CurrentRevision.intellectual_object_identifier == identifier,
+                ObjectDocument.version == DOCUMENT_VERSION
+            )
+        return session.execute(query).scalar_one_or_none()
+
+    def sample(
+        self,
+        session: Session,
+        object_type: str | None = None,
+        collection_alt_identifier: str | None = None,
+        size: int = 100,
+        seed: int = 0,
+    ):
+        """
+        Up to `size` current objects chosen at random with a seed (see
+        `sample_ids`), with their collections summary and total data size,
+        in a single query once they're chosen (per shard; the shards'
+        samples are sampled again with the same seed).
+        """
+        sampled_ids = select(IntellectualObject.id).join(CurrentRevision)
+        if object_type:
+            sampled_ids = sampled_ids.filter(IntellectualObject.type == object_type)
+        if collection_alt_identifier:
+            sampled_ids = sampled_ids \
+                .join(IntellectualObject.collections) \
+                .filter(Collection.alternate_identifiers == collection_alt_identifier)
+
+        query = select(
+            IntellectualObject.bin_identifier,
+            IntellectualObject.identifier,
+            IntellectualObject.alternate_identifiers,
+            collections_summary_expression(IntellectualObject.id).label("collections_summary"),
+            IntellectualObject.type,
+            IntellectualObject.revision_number,
+            IntellectualObject.updated_at,
+            total_data_size_expression(IntellectualObject.id).label("total_data_size"),
+            IntellectualObject.title,
+        )
+
+        def sample_shard(shard_session: Session):
+            ids = sample_ids(shard_session, sampled_ids, size, seed)
+            if not ids:
+                return []
+            return shard_session.execute(query.where(IntellectualObject.id.in_(ids))).all()
+
+        if not isinstance(session, ShardedSession):
+            return sample_shard(session)
+
+        rows = sorted(itertools.chain.from_iterable(session.scatter(sample_shard)), key=lambda row: row.identifier)
+        return random.Random(seed).sample(rows, min(size, len(rows)))
+
     def get_distinct_types(self, session: Session) -> list[str]:
         query = select(IntellectualObject.type).distinct()
-        return list(session.execute(query).scalars())
+        return sorted(set(itertools.chain.from_iterable(
+            scatter(session, lambda s: s.execute(query).scalars().all())
+        )))
     
 
 @dataclass(kw_only=True)
 class CollectionsManager(Manager):
+    """Collections are replicated to every shard, so they're read from any one of them."""
+
     def find(self, session: Session, collection_type: str | None = None, start: int = 0, limit: int = 100):
         query = select(Collection)
         if collection_type:
             query = query.filter_by(type=collection_type)
-        return self._find(session=session, query=query, start=start, limit=limit)
+        return self._find(session=replica(session), query=query, start=start, limit=limit)
 
     def get(self, session: Session, identifier: UUID):
         query = select(Collection)
         query = query.filter_by(identifier=identifier)
 
-        item = session.execute(query).scalar_one()
+        item = replica(session).execute(query).scalar_one()
         return item
 
+    def get_stats(self, session: Session, identifier: UUID) -> CollectionStats | None:
+        """
+        The collection's precomputed stats (see dor.services.stats), summed
+        across shards, or None if there's no such collection.
+        """
+        def get_shard_stats(shard_session: Session) -> CollectionStats | None:
+            collection_id = shard_session.execute(
+                select(Collection.id).filter_by(identifier=identifier)
+            ).scalar_one_or_none()
+            if collection_id is None:
+                return None
+            return get_collection_stats(shard_session, collection_id)
+
+        shard_stats = [stats for stats in scatter(session, get_shard_stats) if stats is not None]
+        if len(shard_stats) <= 1:
+            return shard_stats[0] if shard_stats else None
+        return merge_collection_stats(shard_stats)
+
 
 @dataclass(kw_only=True)
 class FilesetsManager(Manager):
@@ -104,30 +334,424 @@ class FilesetsManager(Manager):
             .join(IntellectualObject) \
             .join(CurrentRevision) \
             .filter(IntellectualObject.identifier==object_identifier)
-        return self._find(session=session, query=query, start=start, limit=limit)
+        return self._find(session=route(session, object_identifier), query=query, start=start, limit=limit)
+
+    def get_views(
+        self, session: Session, object_identifier: UUID, start: int = 0, limit: int = 10
+    ) -> Page | None:
+        """
+        A page of the current revision's filesets, as FilesetViews for the
+        object page's fileset list, without reading the rest of the object:
+        three queries however many filesets it has. The views have no
+        events; the list doesn't show them. None if there's no such object.
+        """
+        session = route(session, object_identifier)
+        summary = session.execute(
+            select(IntellectualObject.id, num_filesets_expression(IntellectualObject.id).label("num_filesets"))
+            .join(CurrentRevision)
+            .filter(IntellectualObject.identifier == object_identifier)
+        ).one_or_none()
+        if summary is None:
+            return None
+
+        filesets = session.execute(
+            select(Fileset)
+            .filter(Fileset.intellectual_object_id == summary.id)
+            .order_by(Fileset.id)
+            .offset(start)
+            .limit(limit)
+        ).scalars().all()
+        fileset_object_files = {fileset.id: [] for fileset in filesets}
+        if filesets:
+            for object_file in session.execute(
+                select(ObjectFile).where(ObjectFile.fileset_id.in_(fileset_object_files)).order_by(ObjectFile.id)
+            ).scalars():
+                fileset_object_files[object_file.fileset_id].append(object_file)
+
+        items: list[FilesetView] = [
+            build_fileset_view(fileset, fileset_object_files[fileset.id]) for fileset in filesets
+        ]
+        return Page(total_items=summary.num_filesets, offset=start, limit=limit, items=items)
+
+    def get_object_summary(self, session: Session, bin_identifier: UUID):
+        """The current revision of an object, with its collections summary and fileset count."""
+        query = select(
+            IntellectualObject.id,
+            IntellectualObject.bin_identifier,
+            IntellectualObject.title,
+            collections_summary_expression(IntellectualObject.id).label("collections_summary"),
+            num_filesets_expression(IntellectualObject.id).label("num_filesets"),
+        ).join(CurrentRevision).filter(IntellectualObject.bin_identifier == bin_identifier)
+        return route(session, bin_identifier).execute(query).one_or_none()
+
+    def summarize(
+        self,
+        session: Session,
+        intellectual_object_id: int,
+        start: int = 0,
+        limit: int = -1,
+        yield_per: int = 500,
+        bin_identifier: UUID | None = None,
+    ):
+        """
+        Streams an object's filesets in page order, each with its file counts
+        and source file size, from one grouped query. Ids are per shard, so a
+        sharded catalog also needs the object's `bin_identifier`.
+        """
+        if isinstance(session, ShardedSession):
+            if bin_identifier is None:
+                raise ValueError("summarizing filesets in a sharded catalog needs the object's bin_identifier")
+            session = session.route(bin_identifier)
+
+        is_source = ObjectFile.file_function == "function:source"
+        query = (
+            select(
+                Fileset.identifier,
+                Fileset.alternate_identifiers,
+                Fileset.title,
+                Fileset.revision_number,
+                Fileset.created_at,
+                Fileset.order_label,
+                func.count(ObjectFile.id).label("num_files"),
+                func.count(case((is_source, ObjectFile.id))).label("num_source_files"),
+                func.coalesce(func.sum(case((is_source, ObjectFile.size))), 0).label("total_data_size"),
+            )
+            .outerjoin(ObjectFile, ObjectFile.fileset_id == Fileset.id)
+            .filter(Fileset.intellectual_object_id == intellectual_object_id)
+            .group_by(Fileset.id)
+            .order_by(Fileset.id)
+            .offset(start)
+        )
+        if limit > 0:
+            query = query.limit(limit)
+        yield from session.execute(query, execution_options={"yield_per": yield_per})
 
 
 @dataclass(kw_only=True)
 class EventsManager():
 
     def get(self, session: Session, identifier: UUID) -> PremisEvent | None:
+        # an event's identifier doesn't say which bin it's in
         query = select(PremisEvent).filter_by(identifier=identifier)
-        try:
-            return session.execute(query).scalar_one()
-        except sqlalchemy.exc.NoResultFound:
-            return None
+        events = scatter(session, lambda s: s.execute(query).scalar_one_or_none())
+        return next((event for event in events if event is not None), None)
+
+    def get_distinct_types(self, session: Session) -> list[str]:
+        query = select(PremisEvent.type).distinct().order_by(PremisEvent.type)
+        return sorted(set(itertools.chain.from_iterable(
+            scatter(session, lambda s: s.execute(query).scalars().all())
+        )))
+
+    def _timeline_query(
+        self,
+        event_types: list[str] | None = None,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        collection_alt_identifier: str | None = None,
+    ) -> Select:
+        # an event hangs off an object, a fileset or a file; resolve all three
+        # in the same query rather than lazy-loading parents per row
+        fileset_id = func.coalesce(PremisEvent.fileset_id, ObjectFile.fileset_id)
+        object_id = func.coalesce(
+            PremisEvent.intellectual_object_id,
+            ObjectFile.intellectual_object_id,
+            Fileset.intellectual_object_id
+        )
+        query = (
+            select(
+                PremisEvent.id,
+                PremisEvent.identifier,
+                PremisEvent.type,
+                PremisEvent.date_time,
+                PremisEvent.outcome,
+                PremisEvent.detail,
+                PremisEvent.linking_agent,
+                case(
+                    (PremisEvent.object_file_id.is_not(None), "file"),
+                    (PremisEvent.fileset_id.is_not(None), "fileset"),
+                    else_="object"
+                ).label("level"),
+                IntellectualObject.identifier.label("object_identifier"),
+                IntellectualObject.alternate_identifiers.label("object_alternate_identifiers"),
+                IntellectualObject.title.label("object_title"),
+                Fileset.identifier.label("fileset_identifier"),
+                Fileset.title.label("fileset_title"),
+                ObjectFile.identifier.label("object_file_identifier"),
+            )
+            .outerjoin(ObjectFile, ObjectFile.id == PremisEvent.object_file_id)
+            .outerjoin(Fileset, Fileset.id == fileset_id)
+            .outerjoin(IntellectualObject, IntellectualObject.id == object_id)
+        )
+        if event_types:
+            query = query.filter(PremisEvent.type.in_(event_types))
+        if start_date:
+            query = query.filter(PremisEvent.date_time >= start_date)
+        if end_date:
+            query = query.filter(PremisEvent.date_time < end_date)
+        if collection_alt_identifier:
+            query = query.filter(
+                select(collection_object_table.c.intellectual_object_id)
+                .join(Collection, Collection.id == collection_object_table.c.collection_id)
+                .where(
+                    collection_object_table.c.intellectual_object_id == object_id,
+                    Collection.alternate_identifiers == collection_alt_identifier
+                )
+                .exists()
+            )
+        return query.order_by(PremisEvent.date_time, PremisEvent.id)
+
+    def timeline(
+        self,
+        session: Session,
+        event_types: list[str] | None = None,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        collection_alt_identifier: str | None = None,
+        cursor: str | None = None,
+        limit: int = 100,
+    ) -> KeysetPage:
+        """
+        Events in `[start_date, end_date)`, oldest first, a page at a time.
+        Pages are keyed on (date_time, id) so deep pages cost the same as
+        the first; pass the previous page's `next_cursor` as `cursor`.
+
+        Across shards, the key is (date_time, id * num_shards + shard): each
+        shard pages from the cursor and the pages are merged on that key.
+        """
+        query = self._timeline_query(event_types, start_date, end_date, collection_alt_identifier)
+        num_shards = len(shard_sessions(session))
+        after = decode_cursor(cursor) if cursor else None
+
+        def timeline_on_shard(shard_session: Session):
+            shard = shard_session.info.get("shard", 0)
+            shard_query = query
+            if after:
+                date_time, key = after
+                # the last id on this shard at or before the cursor's key
+                shard_query = shard_query.filter(
+                    tuple_(PremisEvent.date_time, PremisEvent.id) > tuple_(date_time, (key - shard) // num_shards)
+                )
+            rows = shard_session.execute(shard_query.limit(limit + 1)).all()
+            return [(row.date_time, row.id * num_shards + shard, row) for row in rows]
+
+        keyed_rows = list(itertools.islice(heapq.merge(*scatter(session, timeline_on_shard)), limit + 1))
+
+        next_cursor = None
+        if len(keyed_rows) > limit:
+            keyed_rows = keyed_rows[:limit]
+            next_cursor = encode_cursor(keyed_rows[-1][0], keyed_rows[-1][1])
+        rows = [row for _, _, row in keyed_rows]
+        return KeysetPage(items=rows, limit=limit, cursor=cursor, next_cursor=next_cursor)
+
+    def stream(
+        self,
+        session: Session,
+        event_types: list[str] | None = None,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        collection_alt_identifier: str | None = None,
+        batch_size: int = 1000,
+    ):
+        """Yields every matching event in timeline order, `batch_size` rows at a time."""
+        query = self._timeline_query(event_types, start_date, end_date, collection_alt_identifier)
+        if not isinstance(session, ShardedSession):
+            yield from session.execute(query, execution_options={"yield_per": batch_size})
+            return
+
+        num_shards = len(session.sessions)
+
+        def keyed_stream(shard: int, shard_session: Session):
+            for row in shard_session.execute(query, execution_options={"yield_per": batch_size}):
+                yield (row.date_time, row.id * num_shards + shard), row
+
+        streams = [keyed_stream(shard, shard_session) for shard, shard_session in enumerate(session.sessions)]
+        for _, row in heapq.merge(*streams, key=lambda item: item[0]):
+            yield row
+
+
+@dataclass
+class DuplicateGroup:
+    """A shared digest, merged from every shard's files; it has the fields of a `DuplicatesManager._query` row."""
+    digest: bytes
+    num_files: int
+    num_objects: int
+    num_collections: int
+    size: int
+    reclaimable_bytes: int
+
+
+@dataclass
+class DuplicateTotals:
+    num_digests: int = 0
+    num_files: int = 0
+    reclaimable_bytes: int = 0
+
+
+@dataclass(kw_only=True)
+class DuplicatesManager(Manager):
+    """
+    Object files that share a digest. Identical digests mean identical
+    content, so every copy past the first is reclaimable.
+
+    Copies can be on different shards, so a sharded catalog merges every
+    shard's digests, in digest order, rather than grouping in SQL; that
+    reads every file's digest, even for a page.
+    """
+
+    def _query(self, file_format: str | None = None) -> Select:
+        # object-level files point at their object; fileset files only at their fileset
+        object_id = func.coalesce(ObjectFile.intellectual_object_id, Fileset.intellectual_object_id)
+        num_files = func.count(distinct(ObjectFile.id))
+        query = (
+            select(
+                ObjectFile.digest,
+                num_files.label("num_files"),
+                func.count(distinct(object_id)).label("num_objects"),
+                func.count(distinct(collection_object_table.c.collection_id)).label("num_collections"),
+                func.max(ObjectFile.size).label("size"),
+                ((num_files - 1) * func.max(ObjectFile.size)).label("reclaimable_bytes"),
+            )
+            .outerjoin(Fileset, ObjectFile.fileset_id == Fileset.id)
+            .outerjoin(
+                collection_object_table,
+                collection_object_table.c.intellectual_object_id == object_id
+            )
+            .group_by(ObjectFile.digest)
+            .having(num_files > 1)
+        )
+        if file_format:
+            query = query.filter(ObjectFile.file_format == file_format)
+        return query
+
+    def _shard_query(self, file_format: str | None = None) -> Select:
+        """Every digest on a shard, in digest order, with its collections by alternate identifier."""
+        object_id = func.coalesce(ObjectFile.intellectual_object_id, Fileset.intellectual_object_id)
+        query = (
+            select(
+                ObjectFile.digest,
+                func.count(distinct(ObjectFile.id)).label("num_files"),
+                func.count(distinct(object_id)).label("num_objects"),
+                func.max(ObjectFile.size).label("size"),
+                func.aggregate_strings(Collection.alternate_identifiers, "/").label("collections"),
+            )
+            .outerjoin(Fileset, ObjectFile.fileset_id == Fileset.id)
+            .outerjoin(
+                collection_object_table,
+                collection_object_table.c.intellectual_object_id == object_id
+            )
+            .outerjoin(Collection, Collection.id == collection_object_table.c.collection_id)
+            .group_by(ObjectFile.digest)
+            .order_by(ObjectFile.digest)
+        )
+        if file_format:
+            query = query.filter(ObjectFile.file_format == file_format)
+        return query
+
+    def _merge_shards(self, session: ShardedSession, file_format: str | None = None, batch_size: int = 1000):
+        query = self._shard_query(file_format)
+        streams = [
+            shard_session.execute(query, execution_options={"yield_per": batch_size})
+            for shard_session in session.sessions
+        ]
+        merged = heapq.merge(*streams, key=lambda row: row.digest)
+        for digest, rows in itertools.groupby(merged, key=lambda row: row.digest):
+            rows = list(rows)
+            num_files = sum(row.num_files for row in rows)
+            if num_files < 2:
+                continue
+            size = max(row.size for row in rows)
+            collections = {
+                collection for row in rows if row.collections for collection in row.collections.split("/")
+            }
+            yield DuplicateGroup(
+                digest=digest,
+                num_files=num_files,
+                num_objects=sum(row.num_objects for row in rows),
+                num_collections=len(collections),
+                size=size,
+                reclaimable_bytes=(num_files - 1) * size,
+            )
+
+    def find(self, session: Session, file_format: str | None = None, start: int = 0, limit: int = 100):
+        if isinstance(session, ShardedSession):
+            groups = sorted(
+                self._merge_shards(session, file_format),
+                key=lambda group: (-group.reclaimable_bytes, group.digest)
+            )
+            return Page(total_items=len(groups), offset=start, limit=limit, items=groups[start:start + limit])
+
+        query = self._query(file_format).order_by(sqlalchemy.desc("reclaimable_bytes"), ObjectFile.digest)
+        return self._find(session=session, query=query, start=start, limit=limit, scalars=False)
+
+    def stream(self, session: Session, file_format: str | None = None, batch_size: int = 1000):
+        """Yields duplicate groups in digest order, as the GROUP BY walks the digest index."""
+        if isinstance(session, ShardedSession):
+            yield from self._merge_shards(session, file_format, batch_size=batch_size)
+            return
+
+        query = self._query(file_format).order_by(ObjectFile.digest)
+        yield from session.execute(query, execution_options={"yield_per": batch_size})
+
+    def get_totals(self, session: Session, file_format: str | None = None):
+        if isinstance(session, ShardedSession):
+            totals = DuplicateTotals()
+            for group in self._merge_shards(session, file_format):
+                totals.num_digests += 1
+                totals.num_files += group.num_files
+                totals.reclaimable_bytes += group.reclaimable_bytes
+            return totals
+
+        subquery = self._query(file_format).subquery()
+        query = select(
+            func.count().label("num_digests"),
+            func.coalesce(func.sum(subquery.c.num_files), 0).label("num_files"),
+            func.coalesce(func.sum(subquery.c.reclaimable_bytes), 0).label("reclaimable_bytes"),
+        )
+        return session.execute(query).one()
+
+    def get_files(self, session: Session, digests: list[bytes]):
+        """The files, objects and collections behind each digest in `digests`."""
+        object_id = func.coalesce(ObjectFile.intellectual_object_id, Fileset.intellectual_object_id)
+        query = (
+            select(
+                ObjectFile.digest,
+                ObjectFile.identifier,
+                ObjectFile.file_format,
+                IntellectualObject.identifier.label("object_identifier"),
+                IntellectualObject.alternate_identifiers.label("object_alternate_identifiers"),
+            )
+            .outerjoin(Fileset, ObjectFile.fileset_id == Fileset.id)
+            .join(IntellectualObject, IntellectualObject.id == object_id)
+            .filter(ObjectFile.digest.in_(digests))
+            .order_by(ObjectFile.digest, ObjectFile.identifier)
+        )
+        files_by_digest = {digest: [] for digest in digests}
+        for rows in scatter(session, lambda s: s.execute(query).all()):
+            for row in rows:
+                files_by_digest[row.digest].append(row)
+        if isinstance(session, ShardedSession):
+            for files in files_by_digest.values():
+                files.sort(key=lambda row: row.identifier)
+        return files_by_digest
 
 
 @dataclass
 class Catalog:
+    """
+    The managers take a `Session`, or a `ShardedSession` for a catalog
+    partitioned by bin (see dor.adapters.shards): lookups by object go to
+    the object's shard, and listings are gathered from every shard.
+    """
     objects: ObjectsManager
     collections: CollectionsManager
     filesets: FilesetsManager
     events: EventsManager
+    duplicates: DuplicatesManager
 
 catalog = Catalog(
     objects=ObjectsManager(),
     collections=CollectionsManager(),
     filesets=FilesetsManager(),
-    events=EventsManager()
+    events=EventsManager(),
+    duplicates=DuplicatesManager()
 )
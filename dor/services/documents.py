@@ -0,0 +1,306 @@
+import zlib
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Iterator
+from uuid import UUID
+
+import orjson
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.orm import Session
+
+from dor.models.collection import Collection
+from dor.models.fileset import Fileset
+from dor.models.intellectual_object import CurrentRevision, IntellectualObject
+from dor.models.object_document import ObjectDocument
+from dor.models.object_file import ObjectFile
+from dor.models.premis_event import PremisEvent
+from dor.serializers import dumps
+from dor.utils import converter
+
+# bump when the view dataclasses change; older documents are ignored until rebuilt
+DOCUMENT_VERSION = 1
+SOURCE_FILE_FUNCTION = "function:source"
+
+
+@dataclass
+class ObjectFileView:
+    identifier: str
+    file_format: str
+    file_function: str
+    size: int
+    digest: str
+    created_at: datetime
+    last_fixity_check: datetime | None
+
+    @property
+    def name(self) -> str:
+        return Path(self.identifier).name
+
+
+@dataclass
+class EventView:
+    identifier: UUID
+    type: str
+    date_time: datetime
+    outcome: str | None = None
+    detail: str | None = None
+    linking_agent: str | None = None
+
+
+@dataclass
+class FilesetView:
+    identifier: UUID
+    alternate_identifiers: str | None
+    title: str
+    revision_number: int
+    created_at: datetime
+    order_label: str
+    total_data_size: int
+    object_files: list[ObjectFileView] = field(default_factory=list)
+    premis_events: list[EventView] = field(default_factory=list)
+
+    @property
+    def source_object_file(self) -> ObjectFileView | None:
+        for object_file in self.object_files:
+            if object_file.file_function == SOURCE_FILE_FUNCTION:
+                return object_file
+        return None
+
+
+@dataclass
+class CollectionView:
+    identifier: UUID
+    alternate_identifiers: str
+    title: str
+
+
+@dataclass
+class ObjectView:
+    """
+    An intellectual object revision as `object.html` and the JSON API see
+    it; attribute names follow the models so templates take either.
+    """
+    identifier: UUID
+    bin_identifier: UUID
+    alternate_identifiers: str | None
+    type: str
+    revision_number: int
+    created_at: datetime
+    updated_at: datetime
+    title: str | None
+    description: str | None
+    total_data_size: int
+    collections: list[CollectionView] = field(default_factory=list)
+    object_files: list[ObjectFileView] = field(default_factory=list)
+    premis_events: list[EventView] = field(default_factory=list)
+    filesets: list[FilesetView] = field(default_factory=list)
+
+    @property
+    def collections_summary(self) -> str:
+        return '/'.join([c.alternate_identifiers for c in self.collections])
+
+
+def build_object_file_view(object_file) -> ObjectFileView:
+    return ObjectFileView(
+        identifier=object_file.identifier,
+        file_format=object_file.file_format,
+        file_function=object_file.file_function,
+        size=object_file.size,
+        digest=object_file.digest.hex(),
+        created_at=object_file.created_at,
+        last_fixity_check=object_file.last_fixity_check,
+    )
+
+
+def build_event_view(event) -> EventView:
+    return EventView(
+        identifier=event.identifier,
+        type=event.type,
+        date_time=event.date_time,
+        outcome=event.outcome,
+        detail=event.detail,
+        linking_agent=event.linking_agent,
+    )
+
+
+def build_fileset_view(
+    fileset: Fileset, object_files: Iterable[ObjectFile], premis_events: Iterable[PremisEvent] = ()
+) -> FilesetView:
+    object_files = [build_object_file_view(object_file) for object_file in object_files]
+    return FilesetView(
+        identifier=fileset.identifier,
+        alternate_identifiers=fileset.alternate_identifiers,
+        title=fileset.title,
+        revision_number=fileset.revision_number,
+        created_at=fileset.created_at,
+        order_label=fileset.order_label,
+        total_data_size=sum(f.size for f in object_files if f.file_function == SOURCE_FILE_FUNCTION),
+        object_files=object_files,
+        premis_events=[build_event_view(event) for event in premis_events],
+    )
+
+
+def build_object_view(
+    intellectual_object: IntellectualObject,
+    collections: Iterable[Collection | CollectionView],
+    fileset_object_files: dict[int, list[ObjectFile]] | None = None,
+    fileset_events: dict[int, list[PremisEvent]] | None = None,
+) -> ObjectView:
+    """
+    Works on an object fresh from the builder, before it is flushed, as
+    well as on a persistent one; `collections` is passed in because a new
+    object isn't a member of its collection yet. Each fileset's files and
+    events come from its relationships unless they're passed in by fileset
+    id, as `load_object_view` does.
+    """
+    filesets = []
+    for fileset in intellectual_object.filesets:
+        if fileset_object_files is not None:
+            object_files = fileset_object_files.get(fileset.id, [])
+        else:
+            object_files = fileset.object_files
+        if fileset_events is not None:
+            premis_events = fileset_events.get(fileset.id, [])
+        else:
+            premis_events = fileset.premis_events
+        filesets.append(build_fileset_view(fileset, object_files, premis_events))
+
+    return ObjectView(
+        identifier=intellectual_object.identifier,
+        bin_identifier=intellectual_object.bin_identifier,
+        alternate_identifiers=intellectual_object.alternate_identifiers,
+        type=intellectual_object.type,
+        revision_number=intellectual_object.revision_number,
+        created_at=intellectual_object.created_at,
+        updated_at=intellectual_object.updated_at,
+        title=intellectual_object.title,
+        description=intellectual_object.description,
+        total_data_size=sum(fileset.total_data_size for fileset in filesets),
+        collections=[
+            CollectionView(
+                identifier=collection.identifier,
+                alternate_identifiers=collection.alternate_identifiers,
+                title=collection.title,
+            )
+            for collection in collections
+        ],
+        object_files=[build_object_file_view(object_file) for object_file in intellectual_object.object_files],
+        premis_events=[build_event_view(event) for event in intellectual_object.premis_events],
+        filesets=filesets,
+    )
+
+
+def load_object_view(session: Session, intellectual_object: IntellectualObject) -> ObjectView:
+    """
+    The view of a persistent object in the same handful of queries however
+    many filesets it has: the files and events of all its filesets are
+    fetched at once instead of fileset by fileset.
+    """
+    fileset_ids = select(Fileset.id).where(Fileset.intellectual_object_id == intellectual_object.id)
+    fileset_object_files = defaultdict(list)
+    for object_file in session.execute(
+        select(ObjectFile).where(ObjectFile.fileset_id.in_(fileset_ids)).order_by(ObjectFile.id)
+    ).scalars():
+        fileset_object_files[object_file.fileset_id].append(object_file)
+    fileset_events = defaultdict(list)
+    for event in session.execute(
+        select(PremisEvent).where(PremisEvent.fileset_id.in_(fileset_ids)).order_by(PremisEvent.id)
+    ).scalars():
+        fileset_events[event.fileset_id].append(event)
+    return build_object_view(
+        intellectual_object,
+        intellectual_object.collections,
+        fileset_object_files=fileset_object_files,
+        fileset_events=fileset_events,
+    )
+
+
+def encode_document(view: ObjectView) -> bytes:
+    return zlib.compress(dumps(view))
+
+
+def decode_document(document: bytes) -> ObjectView:
+    return converter.structure(orjson.loads(zlib.decompress(document)), ObjectView)
+
+
+def build_object_document(
+    intellectual_object: IntellectualObject, collections: Iterable[Collection | CollectionView]
+) -> ObjectDocument:
+    """Call before `CopyLoader.detach`, which takes the object's children away."""
+    return ObjectDocument(
+        intellectual_object=intellectual_object,
+        intellectual_object_identifier=intellectual_object.identifier,
+        revision_number=intellectual_object.revision_number,
+        version=DOCUMENT_VERSION,
+        document=encode_document(build_object_view(intellectual_object, collections)),
+        created_at=datetime.now(),
+    )
+
+
+def rebuild_object_documents(
+    session: Session, collection_alt_identifier: str | None = None, chunk_size: int = 100
+) -> Iterator[int]:
+    """
+    (Re)builds the documents for current objects, e.g. ones imported before
+    documents existed, committing every `chunk_size` objects; yields the
+    running count. Objects are read in keyset order, a chunk at a time.
+    """
+    query = select(CurrentRevision.intellectual_object_id) \
+        .order_by(CurrentRevision.intellectual_object_id) \
+        .limit(chunk_size)
+    if collection_alt_identifier:
+        query = query.join(
+            IntellectualObject, IntellectualObject.id == CurrentRevision.intellectual_object_id
+        ).join(IntellectualObject.collections).filter(
+            Collection.alternate_identifiers == collection_alt_identifier
+        )
+
+    num_built, last_id = 0, None
+    while True:
+        chunk_query = query if last_id is None else query.where(CurrentRevision.intellectual_object_id > last_id)
+        chunk = session.execute(chunk_query).scalars().all()
+        if not chunk:
+            break
+        session.execute(
+            delete(ObjectDocument).where(ObjectDocument.intellectual_object_id.in_(chunk)),
+            execution_options={"synchronize_session": False}
+        )
+        intellectual_objects = session.execute(
+            select(IntellectualObject).where(IntellectualObject.id.in_(chunk))
+        ).scalars()
+        for intellectual_object in intellectual_objects:
+            session.add(build_object_document(intellectual_object, intellectual_object.collections))
+        session.commit()
+        session.expunge_all()
+        num_built, last_id = num_built + len(chunk), chunk[-1]
+        yield num_built
+
+
+def refresh_object_documents(session: Session, object_file_ids: Iterable[int]) -> int:
+    """
+    Rewrites the documents of the objects these files belong to, the ones
+    that have a document, so they show what the models hold now, e.g. after
+    a fixity check; doesn't commit. Returns how many were rewritten.
+    """
+    object_ids = select(func.coalesce(ObjectFile.intellectual_object_id, Fileset.intellectual_object_id)) \
+        .outerjoin(Fileset, Fileset.id == ObjectFile.fileset_id) \
+        .where(ObjectFile.id.in_(list(object_file_ids)))
+    intellectual_objects = session.execute(
+        select(IntellectualObject)
+        .join(ObjectDocument, ObjectDocument.intellectual_object_id == IntellectualObject.id)
+        .where(IntellectualObject.id.in_(object_ids))
+    ).scalars().all()
+    for intellectual_object in intellectual_objects:
+        session.execute(
+            update(ObjectDocument)
+            .where(ObjectDocument.intellectual_object_id == intellectual_object.id)
+            .values(
+                version=DOCUMENT_VERSION,
+                document=encode_document(load_object_view(session, intellectual_object)),
+                created_at=datetime.now(),
+            ),
+            execution_options={"synchronize_session": False}
+        )
+    return len(intellectual_objects)
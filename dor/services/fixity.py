@@ -0,0 +1,150 @@
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterator
+from uuid import uuid4
+
+from sqlalchemy import and_, insert, select, union_all, update
+from sqlalchemy.orm import Session
+
+from dor.models.checksum import Checksum
+from dor.models.object_file import ObjectFile
+from dor.models.premis_event import PremisEvent
+from dor.services.documents import refresh_object_documents
+from dor.services.hashing import hash_files
+from dor.utils import TokenBucket
+
+FIXITY_EVENT_TYPE = "fixity check"
+LINKING_AGENT = "dor fixity"
+
+
+@dataclass
+class FixityResult:
+    object_file_id: int
+    identifier: str
+    outcome: str
+    note: str | None = None
+
+
+@dataclass
+class FixityBatch:
+    results: list[FixityResult] = field(default_factory=list)
+    num_bytes: int = 0
+
+    @property
+    def failures(self) -> list[FixityResult]:
+        return [result for result in self.results if result.outcome != "success"]
+
+
+def select_overdue_object_files(checked_before: datetime, limit: int, algorithm: str = "sha256"):
+    """
+    The most overdue object files, never-checked ones first, then oldest
+    check first, with their recorded digest. The never-checked and the
+    overdue files are two queries, each in the order of the
+    ObjectFile.last_fixity_check index (which PostgreSQL keeps NULLs last
+    in), so only the `limit` rows each returns are sorted together.
+    """
+    files = (
+        select(ObjectFile.id, ObjectFile.identifier, Checksum.digest, ObjectFile.last_fixity_check)
+        .join(Checksum, and_(
+            Checksum.object_file_id == ObjectFile.id,
+            Checksum.algorithm == algorithm,
+        ))
+    )
+    never_checked = files.where(ObjectFile.last_fixity_check.is_(None)).limit(limit).subquery()
+    overdue = files \
+        .where(ObjectFile.last_fixity_check < checked_before) \
+        .order_by(ObjectFile.last_fixity_check) \
+        .limit(limit) \
+        .subquery()
+    both = union_all(select(*never_checked.c), select(*overdue.c)).subquery()
+    return (
+        select(both.c.id, both.c.identifier, both.c.digest)
+        .order_by(both.c.last_fixity_check.is_not(None), both.c.last_fixity_check)
+        .limit(limit)
+    )
+
+
+@dataclass
+class FixityEngine:
+    """
+    Verifies stored bytes against `Checksum.digest`, most overdue first.
+
+    Each batch is hashed on `workers` threads, throttled to
+    `bytes_per_second` if set, then recorded in one transaction: a
+    "fixity check" PremisEvent per file, and `last_fixity_check` bumped
+    for the whole batch, and the checked objects' documents rewritten so
+    the object page shows the new check times.
+    """
+    storage_root: Path
+    workers: int = 4
+    batch_size: int = 500
+    bytes_per_second: float | None = None
+    algorithm: str = "sha256"
+
+    def __post_init__(self):
+        self.limiter = TokenBucket(rate=self.bytes_per_second) if self.bytes_per_second else None
+
+    def run(self, session: Session, older_than: timedelta, limit: int | None = None) -> Iterator[FixityBatch]:
+        started_at = datetime.now()
+        # never past the start of the run, or files checked in this run come round again
+        checked_before = min(started_at - older_than, started_at)
+        num_checked = 0
+
+        while limit is None or num_checked < limit:
+            batch_limit = self.batch_size if limit is None else min(self.batch_size, limit - num_checked)
+            rows = session.execute(
+                select_overdue_object_files(checked_before, batch_limit, self.algorithm)
+            ).all()
+            if not rows:
+                break
+
+            batch = self.check(rows)
+            self.record(session, batch)
+            session.commit()
+
+            num_checked += len(rows)
+            yield batch
+
+    def check(self, rows) -> FixityBatch:
+        batch = FixityBatch()
+        paths = [self.storage_root / identifier for _, identifier, _ in rows]
+        file_hashes = hash_files(paths, workers=self.workers, algorithm=self.algorithm, limiter=self.limiter)
+        for (object_file_id, identifier, expected_digest), file_hash in zip(rows, file_hashes):
+            batch.num_bytes += file_hash.size
+            if file_hash.error:
+                result = FixityResult(object_file_id, identifier, "failure", file_hash.error)
+            elif file_hash.digest != expected_digest:
+                result = FixityResult(
+                    object_file_id, identifier, "failure",
+                    f"expected {expected_digest.hex()}, found {file_hash.digest.hex()}"
+                )
+            else:
+                result = FixityResult(object_file_id, identifier, "success")
+            batch.results.append(result)
+        return batch
+
+    def record(self, session: Session, batch: FixityBatch):
+        checked_at = datetime.now()
+        session.execute(insert(PremisEvent), [
+            dict(
+                identifier=uuid4(),
+                type=FIXITY_EVENT_TYPE,
+                date_time=checked_at,
+                detail=f"{self.algorithm} digest verified against the catalog",
+                outcome=result.outcome,
+                outcome_detail_note=result.note,
+                linking_agent=LINKING_AGENT,
+                object_file_id=result.object_file_id,
+            )
+            for result in batch.results
+        ])
+        session.execute(
+            update(ObjectFile)
+            .where(ObjectFile.id.in_([result.object_file_id for result in batch.results]))
+            .values(last_fixity_check=checked_at),
+            execution_options={"synchronize_session": False}
+        )
+        # the update bypassed any files the session has loaded
+        session.expire_all()
+        refresh_object_documents(session, [result.object_file_id for result in batch.results])
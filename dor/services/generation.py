@@ -0,0 +1,24 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.orm import Session
+
+from dor.adapters.shards import ShardedSession, scatter
+from dor.models.catalog_generation import CatalogGeneration
+
+
+def bump_generation(session: Session) -> None:
+    """Counts a finished import or purge. Does not commit."""
+    now = datetime.now(tz=timezone.utc)
+    result = session.execute(
+        update(CatalogGeneration).values(generation=CatalogGeneration.generation + 1, updated_at=now),
+        execution_options={"synchronize_session": False}
+    )
+    if result.rowcount == 0:
+        session.execute(insert(CatalogGeneration).values(generation=1, updated_at=now))
+
+
+def get_generation(session: Session | ShardedSession) -> int:
+    """The catalog's generation, summed across shards; 0 before the first import."""
+    query = select(func.coalesce(func.max(CatalogGeneration.generation), 0))
+    return sum(scatter(session, lambda s: s.execute(query).scalar_one()))
@@ -0,0 +1,377 @@
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import partial
+from typing import Callable, Iterator, TypeVar
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from dor.adapters.archive import IIIFArchive
+from dor.adapters.bulk import CopyLoader, supports_copy
+from dor.adapters.shards import ShardedSession, replica, shard_sessions
+from dor.manifest import open_manifest
+from dor.models.collection import Collection
+from dor.models.import_job import ImportJob
+from dor.serializers import collection_serializer
+from dor.services.documents import CollectionView, build_object_document
+from dor.services.generation import bump_generation
+from dor.services.stats import apply_stat_deltas, count_object_stats
+from dor.telemetry import ImportTelemetry
+from dor.utils import HostRateLimiter, fetch, fetch_path, is_cached
+
+T = TypeVar("T")
+
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+
+@dataclass
+class HarvestProgress:
+    """Yielded after each object: the collection page it was on, and the object's label."""
+    collection_label: str
+    page: int
+    page_items: int
+    total_items: int
+    num_processed: int
+    label: str
+
+
+def copy_collection(collection: Collection) -> Collection:
+    return Collection(**{
+        key: value for key, value in collection_serializer.to_dict(collection).items() if key != "id"
+    })
+
+
+def add_collection(session: Session | ShardedSession, collection: Collection) -> list[Collection]:
+    """Adds `collection` to every shard; returns each shard's copy, in shard order."""
+    shard_collections = []
+    for shard_session in shard_sessions(session):
+        if shard_collections:
+            collection = copy_collection(collection)
+        shard_session.add(collection)
+        shard_collections.append(collection)
+    return shard_collections
+
+
+def add_to_shard(shard_session: Session, collection: Collection) -> Collection:
+    shard_session.add(collection)
+    return collection
+
+
+def run_on_shard(session: Session | ShardedSession, shard: int, call: Callable[[Session], T]) -> Future:
+    """
+    `call(shard session)` on the shard's writer thread, where the writes of
+    harvests running side by side queue up; on a plain session, right away.
+    """
+    if isinstance(session, ShardedSession):
+        return session.submit(shard, call)
+    future = Future()
+    try:
+        future.set_result(call(session))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+
+def committed(call: Callable[[Session], T]) -> Callable[[Session], T]:
+    """`call`, then a commit; a failure is rolled back so the shard's session stays usable for the next write."""
+    def run(session: Session) -> T:
+        try:
+            result = call(session)
+            session.commit()
+            return result
+        except BaseException:
+            session.rollback()
+            raise
+    return run
+
+
+def write_object(
+    shard_session: Session,
+    shard_collection: Collection,
+    intellectual_object,
+    document,
+    stats,
+    telemetry: ImportTelemetry,
+    manifest,
+    use_copy: bool,
+):
+    """Adds one built object to its shard and commits; rolls back on failure."""
+    loader = CopyLoader() if use_copy else None
+    if loader:
+        loader.detach(intellectual_object)
+
+    try:
+        shard_session.add(intellectual_object)
+        shard_session.add(document)
+        # from the object's side, so the collection's objects aren't loaded for the append
+        intellectual_object.collections.append(shard_collection)
+        telemetry.rows.update(instance.__table__.name for instance in shard_session.new)
+
+        with telemetry.measure("flush", manifest):
+            shard_session.flush()
+            apply_stat_deltas(shard_session, shard_collection.id, stats)
+        if loader:
+            with telemetry.measure("copy", manifest):
+                telemetry.rows.update(loader.copy(shard_session))
+        with telemetry.measure("commit", manifest):
+            shard_session.commit()
+    except BaseException:
+        shard_session.rollback()
+        raise
+
+
+def harvest_collection(
+    session: Session | ShardedSession,
+    collid: str,
+    collection_url: str,
+    object_type: str,
+    collection_type: str = "types:box",
+    limit: int = -1,
+    telemetry: ImportTelemetry | None = None,
+    limiter: HostRateLimiter | None = None,
+    archive: IIIFArchive | None = None,
+) -> Iterator[HarvestProgress]:
+    """
+    Imports the DLXS collection at `collection_url`, page by page, yielding
+    after each object. Fetches that miss the cache wait their turn with
+    `limiter`. With `archive`, pages and manifests are read from it
+    instead, and nothing is fetched. The collection should be purged first.
+
+    With shards, or a one-shard ShardedSession, every write goes through the
+    shard's writer thread, so harvests can run side by side on one session:
+    each fetches and builds its objects while the writers commit them.
+    """
+    # Faker and its providers are slow to load; only harvesting needs them
+    from dor.builder import build_collection, build_intellectual_object
+
+    telemetry = telemetry or ImportTelemetry(collid=collid)
+    use_copy = supports_copy(replica(session))
+    sharded = isinstance(session, ShardedSession)
+    num_shards = len(shard_sessions(session))
+    # with shards, a few writes are allowed in flight while the next objects are built
+    pending = deque()
+
+    collection_view = None
+    shard_collections = []
+    num_processed = 0
+    page_index = 0
+    seen = set()
+    while collection_url:
+        if archive is not None:
+            with telemetry.measure("page read (archive)"):
+                collection_data = archive.read_json(collection_url)
+        else:
+            page_stage = "page fetch (hit)" if is_cached(collection_url) else "page fetch (miss)"
+            with telemetry.measure(page_stage):
+                collection_data = fetch(collection_url, limiter=limiter)
+        if collection_view is None:
+            collection = build_collection(collection_data, collection_type)
+            # a snapshot for the documents; the shards' copies are only touched by their writers
+            collection_view = CollectionView(
+                identifier=collection.identifier,
+                alternate_identifiers=collection.alternate_identifiers,
+                title=collection.title,
+            )
+            copies = [collection] + [copy_collection(collection) for _ in range(num_shards - 1)]
+            # every shard gets the collection, even if none of its objects do
+            shard_collections = [
+                run_on_shard(session, shard, committed(partial(add_to_shard, collection=copy))).result()
+                for shard, copy in enumerate(copies)
+            ]
+            telemetry.rows["catalog_collection"] += num_shards
+
+        page_index += 1
+        for datum in collection_data['manifests']:
+            if datum['@id'] in seen:
+                continue
+            num_processed += 1
+            seen.add(datum['@id'])
+
+            manifest_url = datum['@id']
+            if archive is not None:
+                manifest = telemetry.start_manifest(manifest_url, cached=True, cache="archive")
+                with telemetry.measure("fetch (archive)", manifest):
+                    manifest_source = partial(archive.open_member, archive.member(manifest_url))
+            else:
+                manifest = telemetry.start_manifest(manifest_url, cached=is_cached(manifest_url))
+                with telemetry.measure(f"fetch ({manifest.cache})", manifest):
+                    manifest_source = fetch_path(manifest_url, limiter=limiter)
+
+            # the manifest is parsed as the object is built; the object itself is built whole
+            with telemetry.measure("build", manifest), open_manifest(manifest_source) as streamed:
+                intellectual_object = build_intellectual_object(
+                    collid=collid,
+                    manifest_data=streamed.header,
+                    object_type=object_type,
+                    canvases=streamed.canvases,
+                )
+            manifest.canvases = len(intellectual_object.filesets)
+
+            with telemetry.measure("document", manifest):
+                document = build_object_document(intellectual_object, [collection_view])
+            stats = count_object_stats(intellectual_object)
+
+            shard = session.router.shard_for(intellectual_object.bin_identifier) if sharded else 0
+            while len(pending) >= 2 * num_shards:
+                pending.popleft().result()
+            write = partial(
+                write_object,
+                shard_collection=shard_collections[shard],
+                intellectual_object=intellectual_object,
+                document=document,
+                stats=stats,
+                telemetry=telemetry,
+                manifest=manifest,
+                use_copy=use_copy,
+            )
+            pending.append(run_on_shard(session, shard, write))
+
+            yield HarvestProgress(
+                collection_label=collection_data['label'],
+                page=page_index,
+                page_items=len(collection_data['manifests']),
+                total_items=collection_data['total'],
+                num_processed=num_processed,
+                label=datum['label'],
+            )
+            if limit > 0 and num_processed >= limit:
+                break
+
+        if limit > 0 and num_processed >= limit:
+            break
+        collection_url = collection_data.get('next', None)
+
+    while pending:
+        pending.popleft().result()
+    for shard in range(num_shards):
+        run_on_shard(session, shard, committed(bump_generation)).result()
+    telemetry.finish()
+
+
+@dataclass(frozen=True)
+class ImportJobSpec:
+    """What a worker needs to run a queued job, read before the queue starts."""
+    id: int
+    collid: str
+    collection_url: str
+    object_type: str
+    collection_type: str
+    max_objects: int
+
+
+def queue_import_jobs(
+    session: Session,
+    jobs: list[dict],
+    restart: bool = False,
+) -> list[ImportJob]:
+    """
+    Adds `jobs` (ImportJob column values) to the queue, or puts queued ones
+    back to pending with the new values. Jobs already done are left alone
+    unless `restart`. Commits; returns the jobs to run, in order.
+    """
+    now = datetime.now(tz=timezone.utc)
+    existing = {
+        job.collid: job
+        for job in session.execute(
+            select(ImportJob).where(ImportJob.collid.in_([values["collid"] for values in jobs]))
+        ).scalars()
+    }
+    queued = []
+    for values in jobs:
+        job = existing.get(values["collid"])
+        if job is None:
+            job = ImportJob(**values, queued_at=now)
+            session.add(job)
+        elif job.status == JOB_DONE and not restart:
+            continue
+        else:
+            for key, value in values.items():
+                setattr(job, key, value)
+            job.queued_at = now
+        job.status = JOB_PENDING
+        job.num_objects = 0
+        job.error = None
+        job.started_at = job.finished_at = None
+        queued.append(job)
+    session.commit()
+    return queued
+
+
+def get_unfinished_jobs(session: Session) -> list[ImportJob]:
+    """Jobs a stopped batch didn't finish: pending, failed, or running when it stopped."""
+    return list(session.execute(
+        select(ImportJob).where(ImportJob.status != JOB_DONE).order_by(ImportJob.id)
+    ).scalars())
+
+
+def get_jobs(session: Session) -> list[ImportJob]:
+    return list(session.execute(select(ImportJob).order_by(ImportJob.id)).scalars())
+
+
+def update_job(session: Session, job_id: int, **values):
+    session.execute(
+        update(ImportJob).where(ImportJob.id == job_id).values(**values),
+        execution_options={"synchronize_session": False}
+    )
+
+
+@dataclass
+class ImportQueue:
+    """
+    Runs import jobs `workers` at a time, each harvesting one collection.
+    The workers share `limiter`, so together they fetch from a host no
+    faster than it allows, and `session`, whose shard writers apply their
+    writes one at a time. Job status is written to the first shard as jobs
+    start and finish. With `archive`, every job reads from it instead.
+    """
+    session: ShardedSession
+    limiter: HostRateLimiter | None = None
+    archive: IIIFArchive | None = None
+    workers: int = 4
+    on_progress: Callable[[ImportJobSpec, HarvestProgress], None] | None = None
+    telemetry: dict[str, ImportTelemetry] = field(default_factory=dict)
+
+    def _update_job(self, job_id: int, **values):
+        run_on_shard(self.session, 0, committed(partial(update_job, job_id=job_id, **values))).result()
+
+    def run_job(self, spec: ImportJobSpec) -> str:
+        telemetry = self.telemetry[spec.collid] = ImportTelemetry(collid=spec.collid)
+        self._update_job(spec.id, status=JOB_RUNNING, started_at=datetime.now(tz=timezone.utc))
+        num_objects = 0
+        try:
+            for progress in harvest_collection(
+                self.session,
+                collid=spec.collid,
+                collection_url=spec.collection_url,
+                object_type=spec.object_type,
+                collection_type=spec.collection_type,
+                limit=spec.max_objects,
+                telemetry=telemetry,
+                limiter=self.limiter,
+                archive=self.archive,
+            ):
+                num_objects = progress.num_processed
+                if self.on_progress:
+                    self.on_progress(spec, progress)
+        except Exception as e:
+            telemetry.finish()
+            self._update_job(
+                spec.id, status=JOB_FAILED, num_objects=num_objects, error=f"{type(e).__name__}: {e}",
+                finished_at=datetime.now(tz=timezone.utc),
+            )
+            return JOB_FAILED
+        self._update_job(
+            spec.id, status=JOB_DONE, num_objects=num_objects, finished_at=datetime.now(tz=timezone.utc)
+        )
+        return JOB_DONE
+
+    def run(self, specs: list[ImportJobSpec]) -> dict[str, str]:
+        """Runs every job; returns each collid's final status."""
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="dor-import") as executor:
+            futures = {spec.collid: executor.submit(self.run_job, spec) for spec in specs}
+            return {collid: future.result() for collid, future in futures.items()}
@@ -0,0 +1,60 @@
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from dor.utils import TokenBucket
+
+# hashlib releases the GIL for large updates, so threads hash in parallel
+BUFFER_SIZE = 8 * 1024 * 1024
+
+
+@dataclass
+class FileHash:
+    path: Path
+    size: int
+    digest: bytes | None
+    error: str | None = None
+
+
+def hash_file(
+    path: Path,
+    algorithm: str = "sha256",
+    limiter: TokenBucket | None = None,
+    buffer_size: int = BUFFER_SIZE,
+) -> FileHash:
+    """
+    Streams `path` through `algorithm` in `buffer_size` reads, so memory use
+    doesn't depend on the file size. `limiter` is charged one token per byte.
+    """
+    hasher = hashlib.new(algorithm)
+    buffer = bytearray(buffer_size)
+    view = memoryview(buffer)
+    size = 0
+    try:
+        with open(path, "rb", buffering=0) as f:
+            while True:
+                num_read = f.readinto(buffer)
+                if not num_read:
+                    break
+                if limiter:
+                    limiter.acquire(num_read)
+                hasher.update(view[:num_read])
+                size += num_read
+    except OSError as e:
+        return FileHash(path=path, size=size, digest=None, error=e.strerror or str(e))
+    return FileHash(path=path, size=size, digest=hasher.digest())
+
+
+def hash_files(
+    paths: Iterable[Path],
+    workers: int = 4,
+    algorithm: str = "sha256",
+    limiter: TokenBucket | None = None,
+) -> Iterator[FileHash]:
+    """Hashes `paths` on `workers` threads, yielding results in input order."""
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(
+            lambda path: hash_file(path, algorithm=algorithm, limiter=limiter), paths
+        )
@@ -0,0 +1,200 @@
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from uuid import uuid4
+
+from dor.models.checksum import Checksum
+from dor.models.fileset import Fileset
+from dor.models.intellectual_object import CurrentRevision, IntellectualObject
+from dor.models.object_file import ObjectFile
+from dor.models.premis_event import PremisEvent
+from dor.services.hashing import FileHash
+from dor.utils import create_uuid_from_string
+
+LINKING_AGENT = "dor catalog ingest"
+
+FILESET_TYPE = "types:fileset"
+
+FILE_FORMATS = {
+    ".tif": "image/tiff",
+    ".tiff": "image/tiff",
+    ".jp2": "image/jp2",
+    ".xml": "application/xml",
+    ".json": "application/json",
+}
+
+
+@dataclass
+class PackageFile:
+    path: Path
+    identifier: str
+    file_format: str
+    file_function: str
+
+
+@dataclass
+class PackageDirectory:
+    """An object or fileset directory: descriptor/, data/ and metadata/."""
+    identifier: uuid.UUID
+    type: str
+    files: list[PackageFile] = field(default_factory=list)
+
+    @property
+    def data_files(self) -> list[PackageFile]:
+        return [f for f in self.files if f.identifier.split("/")[-2] == "data"]
+
+
+@dataclass
+class Package:
+    object: PackageDirectory
+    filesets: list[PackageDirectory]
+
+    @property
+    def files(self) -> list[PackageFile]:
+        return self.object.files + [f for fileset in self.filesets for f in fileset.files]
+
+
+def get_file_function(path: Path) -> str:
+    """
+    `descriptor/` files are descriptors; otherwise the last `function:`
+    segment of the file name, as in
+    `00000001.function:source.format:image.function:technical.mix.xml`.
+    """
+    if path.parent.name == "descriptor":
+        return "function:descriptor"
+    functions = [part for part in path.name.split(".") if part.startswith("function:")]
+    return functions[-1] if functions else "function:unknown"
+
+
+def get_directory_type(directory: Path) -> str | None:
+    """The type from `descriptor/<identifier>.<type>.mets2.xml`, if there is one."""
+    for descriptor in (directory / "descriptor").glob("*.mets2.xml"):
+        return descriptor.name.removesuffix(".mets2.xml").split(".")[-1]
+    return None
+
+
+def scan_directory(directory: Path, root: Path, type_: str) -> PackageDirectory:
+    try:
+        identifier = uuid.UUID(directory.name)
+    except ValueError:
+        identifier = create_uuid_from_string(directory.name)
+
+    package_directory = PackageDirectory(identifier=identifier, type=type_)
+    for subdirectory in ["descriptor", "data", "metadata"]:
+        for path in sorted((directory / subdirectory).glob("*")):
+            if not path.is_file():
+                continue
+            package_directory.files.append(PackageFile(
+                path=path,
+                identifier=path.relative_to(root).as_posix(),
+                file_format=FILE_FORMATS.get(path.suffix.lower(), "application/octet-stream"),
+                file_function=get_file_function(path),
+            ))
+    return package_directory
+
+
+def scan_package(path: Path, root: Path) -> Package:
+    """
+    Finds the object and fileset directories under `path`, laid out the way
+    `build_object_files_for_canvas` names them; file identifiers are
+    relative to `root`.
+    """
+    object_directory = None
+    filesets = []
+    for directory in sorted(p for p in path.iterdir() if p.is_dir()):
+        type_ = get_directory_type(directory)
+        if type_ is None:
+            continue
+        package_directory = scan_directory(directory, root, type_)
+        if type_ == FILESET_TYPE:
+            filesets.append(package_directory)
+        elif object_directory is None:
+            object_directory = package_directory
+        else:
+            raise ValueError(f"{path} contains more than one object descriptor")
+
+    if object_directory is None:
+        raise ValueError(f"{path} has no object descriptor")
+
+    # directory names are identifiers, so order pages by their data files
+    filesets.sort(key=lambda fileset: [f.path.name for f in fileset.data_files])
+    return Package(object=object_directory, filesets=filesets)
+
+
+def build_object_files(package_directory: PackageDirectory, hashes: dict[Path, FileHash], created_at: datetime):
+    object_files = []
+    for package_file in package_directory.files:
+        file_hash = hashes[package_file.path]
+        object_file = ObjectFile(
+            identifier=package_file.identifier,
+            file_format=package_file.file_format,
+            file_function=package_file.file_function,
+            size=file_hash.size,
+            digest=file_hash.digest,
+            revision_number=1,
+            created_at=created_at,
+            updated_at=created_at,
+            last_fixity_check=created_at,
+        )
+        object_file.checksums.append(Checksum(
+            algorithm="sha256",
+            digest=file_hash.digest,
+            created_at=created_at,
+            updated_at=created_at,
+        ))
+        object_files.append(object_file)
+    return object_files
+
+
+def build_intellectual_object_from_package(
+    package: Package,
+    hashes: dict[Path, FileHash],
+    alternate_identifier: str,
+    title: str,
+    started_at: datetime,
+) -> IntellectualObject:
+    created_at = datetime.now()
+    identifier = package.object.identifier
+    intellectual_object = IntellectualObject(
+        bin_identifier=identifier,
+        identifier=identifier,
+        alternate_identifiers=alternate_identifier,
+        type=package.object.type,
+        revision_number=1,
+        created_at=created_at,
+        updated_at=created_at,
+        title=title,
+    )
+    intellectual_object.revision = CurrentRevision(
+        revision_number=intellectual_object.revision_number,
+        intellectual_object=intellectual_object,
+        intellectual_object_identifier=intellectual_object.identifier
+    )
+    intellectual_object.object_files.extend(build_object_files(package.object, hashes, created_at))
+
+    for event_type, date_time in [("ingestion start", started_at), ("ingestion end", created_at)]:
+        intellectual_object.premis_events.append(PremisEvent(
+            identifier=uuid4(),
+            type=event_type,
+            date_time=date_time,
+            detail=f"ingested from {package.object.identifier}",
+            outcome="success",
+            linking_agent=LINKING_AGENT,
+        ))
+
+    for index, package_fileset in enumerate(package.filesets):
+        data_files = package_fileset.data_files
+        name = data_files[0].path.name.split(".")[0] if data_files else str(package_fileset.identifier)
+        fileset = Fileset(
+            identifier=package_fileset.identifier,
+            alternate_identifiers=f"{alternate_identifier}:{name}",
+            title=name,
+            revision_number=1,
+            created_at=created_at,
+            order_label=f"#{index + 1}",
+        )
+        fileset.object_files.extend(build_object_files(package_fileset, hashes, created_at))
+        intellectual_object.filesets.append(fileset)
+
+    return intellectual_object
@@ -0,0 +1,122 @@
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Iterator
+
+from sqlalchemy import delete, func, or_, select
+from sqlalchemy.orm import Session
+
+from dor.models.checksum import Checksum
+from dor.models.collection import Collection, collection_object_table
+from dor.models.collection_stat import CollectionStat
+from dor.models.fileset import Fileset
+from dor.models.intellectual_object import CurrentRevision, IntellectualObject
+from dor.models.object_document import ObjectDocument
+from dor.models.object_file import ObjectFile
+from dor.models.premis_event import PremisEvent
+from dor.services.generation import bump_generation
+from dor.services.stats import subtract_object_stats
+
+
+@dataclass
+class PurgeProgress:
+    chunk: int
+    objects: int
+    total_objects: int
+    rows: Counter = field(default_factory=Counter)
+
+
+def select_collection_object_ids(collid: str):
+    return (
+        select(IntellectualObject.id)
+        .join(IntellectualObject.collections)
+        .where(Collection.alternate_identifiers == collid)
+    )
+
+
+def purge_objects(session: Session, object_ids: list[int]) -> Counter:
+    """
+    Deletes the given intellectual objects, dependents first, without
+    relying on ON DELETE CASCADE, and takes them out of their collections'
+    stats. Does not commit.
+    """
+    subtract_object_stats(session, object_ids)
+
+    fileset_ids = select(Fileset.id).where(Fileset.intellectual_object_id.in_(object_ids))
+    object_file_ids = select(ObjectFile.id).where(or_(
+        ObjectFile.intellectual_object_id.in_(object_ids),
+        ObjectFile.fileset_id.in_(fileset_ids),
+    ))
+
+    rows = Counter()
+    for model, whereclause in [
+        (PremisEvent, or_(
+            PremisEvent.object_file_id.in_(object_file_ids),
+            PremisEvent.fileset_id.in_(fileset_ids),
+            PremisEvent.intellectual_object_id.in_(object_ids),
+        )),
+        (Checksum, Checksum.object_file_id.in_(object_file_ids)),
+        (ObjectFile, ObjectFile.id.in_(object_file_ids)),
+        (Fileset, Fileset.intellectual_object_id.in_(object_ids)),
+        (CurrentRevision, CurrentRevision.intellectual_object_id.in_(object_ids)),
+        (ObjectDocument, ObjectDocument.intellectual_object_id.in_(object_ids)),
+    ]:
+        result = session.execute(
+            delete(model).where(whereclause),
+            execution_options={"synchronize_session": False}
+        )
+        rows[model.__tablename__] += result.rowcount
+
+    result = session.execute(
+        delete(collection_object_table)
+        .where(collection_object_table.c.intellectual_object_id.in_(object_ids))
+    )
+    rows[collection_object_table.name] += result.rowcount
+
+    result = session.execute(
+        delete(IntellectualObject).where(IntellectualObject.id.in_(object_ids)),
+        execution_options={"synchronize_session": False}
+    )
+    rows[IntellectualObject.__tablename__] += result.rowcount
+    return rows
+
+
+def purge_collection(session: Session, collid: str, chunk_size: int = 500) -> Iterator[PurgeProgress]:
+    """
+    Deletes every object in the collection `collid`, then the collection,
+    committing after each chunk of `chunk_size` objects so no single
+    transaction holds the write lock for long. Yields progress per chunk.
+    """
+    total_objects = session.execute(
+        select(func.count()).select_from(select_collection_object_ids(collid).subquery())
+    ).scalar_one()
+
+    chunk = 0
+    num_purged = 0
+    while True:
+        object_ids = list(session.execute(
+            select_collection_object_ids(collid)
+            .order_by(IntellectualObject.id)
+            .limit(chunk_size)
+        ).scalars())
+        if not object_ids:
+            break
+
+        rows = purge_objects(session, object_ids)
+        session.commit()
+
+        chunk += 1
+        num_purged += len(object_ids)
+        yield PurgeProgress(chunk=chunk, objects=num_purged, total_objects=total_objects, rows=rows)
+
+    session.execute(
+        delete(CollectionStat).where(CollectionStat.collection_id.in_(
+            select(Collection.id).where(Collection.alternate_identifiers == collid)
+        )),
+        execution_options={"synchronize_session": False}
+    )
+    session.execute(
+        delete(Collection).where(Collection.alternate_identifiers == collid),
+        execution_options={"synchronize_session": False}
+    )
+    bump_generation(session)
+    session.commit()
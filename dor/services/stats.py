@@ -0,0 +1,212 @@
+from dataclasses import dataclass, field
+
+from sqlalchemy import Select, delete, func, insert, literal, select, union_all
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from dor.models.collection import collection_object_table
+from dor.models.collection_stat import CollectionStat
+from dor.models.fileset import Fileset
+from dor.models.intellectual_object import IntellectualObject
+from dor.models.object_file import ObjectFile
+
+TOTAL = ("total", "")
+COUNTS = ["num_objects", "num_filesets", "num_files", "num_bytes"]
+
+
+@dataclass
+class StatCounts:
+    num_objects: int = 0
+    num_filesets: int = 0
+    num_files: int = 0
+    num_bytes: int = 0
+
+
+def count_object_stats(intellectual_object: IntellectualObject) -> dict[tuple[str, str], StatCounts]:
+    """
+    What one object adds to each of its collections' stats; the same
+    numbers `select_collection_stats` computes in SQL. Call before
+    `CopyLoader.detach`.
+    """
+    stats = {
+        TOTAL: StatCounts(num_objects=1, num_filesets=len(intellectual_object.filesets)),
+        ("object_type", intellectual_object.type): StatCounts(num_objects=1),
+    }
+    object_files = list(intellectual_object.object_files) + [
+        object_file for fileset in intellectual_object.filesets for object_file in fileset.object_files
+    ]
+    for object_file in object_files:
+        for key in [TOTAL, ("file_format", object_file.file_format), ("file_function", object_file.file_function)]:
+            counts = stats.setdefault(key, StatCounts())
+            counts.num_files += 1
+            counts.num_bytes += object_file.size
+    return stats
+
+
+def select_collection_stats(collection_ids: list[int] | None = None, object_ids: list[int] | None = None) -> Select:
+    """
+    Stats rows (collection_id, dimension, key, counts...) computed from the
+    catalog, for `collection_ids` or only counting `object_ids`.
+    """
+    membership = collection_object_table.c
+
+    def members(query: Select) -> Select:
+        if collection_ids is not None:
+            query = query.where(membership.collection_id.in_(collection_ids))
+        if object_ids is not None:
+            query = query.where(membership.intellectual_object_id.in_(object_ids))
+        return query
+
+    def counts(num_objects=literal(0), num_filesets=literal(0), num_files=literal(0), num_bytes=literal(0)):
+        return [
+            num_objects.label("num_objects"),
+            num_filesets.label("num_filesets"),
+            num_files.label("num_files"),
+            num_bytes.label("num_bytes"),
+        ]
+
+    # object-level files point at their object; fileset files only at their fileset
+    owned_files = (
+        select(
+            ObjectFile.file_format,
+            ObjectFile.file_function,
+            ObjectFile.size,
+            func.coalesce(ObjectFile.intellectual_object_id, Fileset.intellectual_object_id).label("object_id"),
+        )
+        .outerjoin(Fileset, ObjectFile.fileset_id == Fileset.id)
+        .subquery()
+    )
+
+    parts = [
+        members(select(
+            membership.collection_id, literal("total").label("dimension"), literal("").label("key"),
+            *counts(num_objects=func.count()),
+        ).group_by(membership.collection_id)),
+        members(select(
+            membership.collection_id, literal("object_type"), IntellectualObject.type,
+            *counts(num_objects=func.count()),
+        ).join(IntellectualObject, IntellectualObject.id == membership.intellectual_object_id)
+         .group_by(membership.collection_id, IntellectualObject.type)),
+        members(select(
+            membership.collection_id, literal("total"), literal(""),
+            *counts(num_filesets=func.count()),
+        ).join(Fileset, Fileset.intellectual_object_id == membership.intellectual_object_id)
+         .group_by(membership.collection_id)),
+    ]
+    for dimension, column in [
+        ("total", literal("")),
+        ("file_format", owned_files.c.file_format),
+        ("file_function", owned_files.c.file_function),
+    ]:
+        parts.append(members(select(
+            membership.collection_id, literal(dimension), column,
+            *counts(num_files=func.count(), num_bytes=func.sum(owned_files.c.size)),
+        ).join(owned_files, owned_files.c.object_id == membership.intellectual_object_id)
+         .group_by(membership.collection_id, column)))
+
+    combined = union_all(*parts).subquery()
+    return select(
+        combined.c.collection_id,
+        combined.c.dimension,
+        combined.c.key,
+        *[func.sum(getattr(combined.c, name)).label(name) for name in COUNTS],
+    ).group_by(combined.c.collection_id, combined.c.dimension, combined.c.key)
+
+
+def apply_stat_deltas(session: Session, collection_id: int, stats: dict[tuple[str, str], StatCounts], sign: int = 1):
+    """Adds (or with `sign=-1`, subtracts) `stats` to a collection's rows, creating any that are missing."""
+    if not stats:
+        return
+    rows = [
+        dict(
+            collection_id=collection_id,
+            dimension=dimension,
+            key=key,
+            **{name: sign * getattr(counts, name) for name in COUNTS},
+        )
+        for (dimension, key), counts in stats.items()
+    ]
+    dialect_insert = postgresql.insert if session.get_bind().dialect.name == "postgresql" else sqlite.insert
+    statement = dialect_insert(CollectionStat).values(rows)
+    statement = statement.on_conflict_do_update(
+        index_elements=["collection_id", "dimension", "key"],
+        set_={name: getattr(CollectionStat, name) + getattr(statement.excluded, name) for name in COUNTS},
+    )
+    session.execute(statement)
+
+
+def subtract_object_stats(session: Session, object_ids: list[int]):
+    """Takes objects about to be purged out of every collection they belong to."""
+    by_collection: dict[int, dict] = {}
+    for row in session.execute(select_collection_stats(object_ids=object_ids)):
+        by_collection.setdefault(row.collection_id, {})[(row.dimension, row.key)] = StatCounts(
+            **{name: getattr(row, name) for name in COUNTS}
+        )
+    for collection_id, stats in by_collection.items():
+        apply_stat_deltas(session, collection_id, stats, sign=-1)
+    session.execute(
+        delete(CollectionStat).where(
+            CollectionStat.collection_id.in_(list(by_collection)),
+            *[getattr(CollectionStat, name) == 0 for name in COUNTS],
+        ),
+        execution_options={"synchronize_session": False}
+    )
+
+
+def rebuild_collection_stats(session: Session, collection_ids: list[int] | None = None) -> int:
+    """Recomputes stats from the catalog in two statements. Does not commit."""
+    statement = delete(CollectionStat)
+    if collection_ids is not None:
+        statement = statement.where(CollectionStat.collection_id.in_(collection_ids))
+    session.execute(statement, execution_options={"synchronize_session": False})
+    session.execute(
+        insert(CollectionStat).from_select(
+            ["collection_id", "dimension", "key", *COUNTS],
+            select_collection_stats(collection_ids=collection_ids),
+        )
+    )
+    # rowcount isn't reliable for INSERT ... SELECT on every driver
+    query = select(func.count()).select_from(CollectionStat)
+    if collection_ids is not None:
+        query = query.where(CollectionStat.collection_id.in_(collection_ids))
+    return session.execute(query).scalar_one()
+
+
+@dataclass
+class CollectionStats:
+    totals: StatCounts
+    by_object_type: dict[str, StatCounts] = field(default_factory=dict)
+    by_file_format: dict[str, StatCounts] = field(default_factory=dict)
+    by_file_function: dict[str, StatCounts] = field(default_factory=dict)
+
+
+def get_collection_stats(session: Session, collection_id: int) -> CollectionStats:
+    stats = CollectionStats(totals=StatCounts())
+    query = select(CollectionStat) \
+        .filter_by(collection_id=collection_id) \
+        .order_by(CollectionStat.dimension, CollectionStat.num_bytes.desc(), CollectionStat.key)
+    for row in session.execute(query).scalars():
+        counts = StatCounts(**{name: getattr(row, name) for name in COUNTS})
+        if (row.dimension, row.key) == TOTAL:
+            stats.totals = counts
+        elif row.dimension in ("object_type", "file_format", "file_function"):
+            getattr(stats, f"by_{row.dimension}")[row.key] = counts
+    return stats
+
+
+def merge_collection_stats(shard_stats: list[CollectionStats]) -> CollectionStats:
+    """Adds up a collection's stats from each shard, largest first as `get_collection_stats` orders them."""
+    merged = CollectionStats(totals=StatCounts())
+    for stats in shard_stats:
+        for name in COUNTS:
+            setattr(merged.totals, name, getattr(merged.totals, name) + getattr(stats.totals, name))
+        for dimension in ("by_object_type", "by_file_format", "by_file_function"):
+            merged_rows = getattr(merged, dimension)
+            for key, counts in getattr(stats, dimension).items():
+                total = merged_rows.setdefault(key, StatCounts())
+                for name in COUNTS:
+                    setattr(total, name, getattr(total, name) + getattr(counts, name))
+    for dimension in ("by_object_type", "by_file_format", "by_file_function"):
+        rows = getattr(merged, dimension)
+        setattr(merged, dimension, dict(sorted(rows.items(), key=lambda item: (-item[1].num_bytes, item[0]))))
+    return merged
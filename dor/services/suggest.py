@@ -0,0 +1,100 @@
+import itertools
+import time
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from dor.adapters.shards import ShardedSession, replica, scatter
+from dor.models.collection import Collection
+from dor.models.intellectual_object import CurrentRevision, IntellectualObject
+from dor.services.generation import get_generation
+
+SUGGEST_FIELDS = ["alt_identifier", "collection", "title"]
+MAX_SUGGESTIONS = 50
+
+
+def pack(strings: list[str]) -> tuple[str, array]:
+    """`strings` as one string and the offset each starts at, plus the end."""
+    offsets = array("L", itertools.accumulate(map(len, strings), initial=0))
+    return "".join(strings), offsets
+
+
+class PrefixIndex:
+    """
+    Distinct strings, sorted case-insensitively and packed into a single
+    str with an array of offsets: a few bytes per entry over the text
+    itself, rather than a str object each. `search` bisects to the first
+    match, so a lookup is O(log n) whatever the size of the index.
+    """
+
+    def __init__(self, values: Iterable[str | None]):
+        entries = sorted({(value.casefold(), value) for value in values if value})
+        self._keys, self._key_offsets = pack([key for key, _ in entries])
+        if all(key == value for key, value in entries):
+            self._values, self._value_offsets = self._keys, self._key_offsets
+        else:
+            self._values, self._value_offsets = pack([value for _, value in entries])
+
+    def __len__(self) -> int:
+        return len(self._key_offsets) - 1
+
+    def _key(self, index: int) -> str:
+        return self._keys[self._key_offsets[index]:self._key_offsets[index + 1]]
+
+    def _value(self, index: int) -> str:
+        return self._values[self._value_offsets[index]:self._value_offsets[index + 1]]
+
+    def search(self, prefix: str, limit: int = 10) -> list[str]:
+        """Up to `limit` values starting with `prefix`, ignoring case, in order."""
+        prefix = prefix.casefold()
+        index = bisect_left(range(len(self)), prefix, key=self._key)
+        suggestions = []
+        for index in range(index, min(index + limit, len(self))):
+            if not self._key(index).startswith(prefix):
+                break
+            suggestions.append(self._value(index))
+        return suggestions
+
+
+@dataclass
+class Suggestions:
+    """A prefix index per suggestable field, as of catalog `generation`."""
+    generation: int = 0
+    indexes: dict[str, PrefixIndex] = field(default_factory=dict)
+    elapsed: float = 0.0
+
+    def search(self, field: str, prefix: str, limit: int = 10) -> list[str]:
+        index = self.indexes.get(field)
+        return index.search(prefix, limit=min(limit, MAX_SUGGESTIONS)) if index else []
+
+
+def build_suggestions(session: Session | ShardedSession) -> Suggestions:
+    """Reads every current object's alternate identifier and title, and every collection's, into new indexes."""
+    started_at = time.perf_counter()
+    generation = get_generation(session)
+    current_objects = select(IntellectualObject.alternate_identifiers, IntellectualObject.title) \
+        .join(CurrentRevision)
+    rows = list(itertools.chain.from_iterable(
+        scatter(session, lambda s: s.execute(current_objects).all())
+    ))
+    collections = replica(session).execute(select(Collection.alternate_identifiers)).scalars()
+    return Suggestions(
+        generation=generation,
+        indexes={
+            "alt_identifier": PrefixIndex(row.alternate_identifiers for row in rows),
+            "collection": PrefixIndex(collections),
+            "title": PrefixIndex(row.title for row in rows),
+        },
+        elapsed=time.perf_counter() - started_at,
+    )
+
+
+def refresh_suggestions(session: Session | ShardedSession, suggestions: Suggestions) -> Suggestions:
+    """`suggestions` if the catalog is still at its generation, otherwise rebuilt ones."""
+    if get_generation(session) == suggestions.generation and suggestions.indexes:
+        return suggestions
+    return build_suggestions(session)
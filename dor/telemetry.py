@@ -0,0 +1,237 @@
+import json
+import math
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from rich.table import Table
+from sqlalchemy import Engine, event
+from sqlalchemy.orm import Session
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile; returns 0.0 for an empty list."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = math.ceil(pct / 100 * len(ordered))
+    return ordered[max(rank, 1) - 1]
+
+
+@dataclass
+class StatementLog:
+    statements: list[str] = field(default_factory=list)
+    # None for a statement that failed
+    durations: list[float | None] = field(default_factory=list)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    @property
+    def total_time(self) -> float:
+        return sum(duration for duration in self.durations if duration is not None)
+
+
+@contextmanager
+def count_statements(engine: Engine):
+    """
+    Records every statement `engine` executes inside the block, and how
+    long each took, from any session or connection; executemany counts once.
+    """
+    log = StatementLog()
+
+    def before(conn, cursor, statement, parameters, context, executemany):
+        context._statement_log_entry = (len(log.statements), time.perf_counter())
+        log.statements.append(statement)
+        log.durations.append(None)
+
+    def after(conn, cursor, statement, parameters, context, executemany):
+        index, started_at = context._statement_log_entry
+        log.durations[index] = time.perf_counter() - started_at
+
+    event.listen(engine, "before_cursor_execute", before)
+    event.listen(engine, "after_cursor_execute", after)
+    try:
+        yield log
+    finally:
+        event.remove(engine, "before_cursor_execute", before)
+        event.remove(engine, "after_cursor_execute", after)
+
+
+# the log `count_context_statements` records into, in the contexts it covers
+_context_log: ContextVar[StatementLog | None] = ContextVar("context_statement_log", default=None)
+_context_listener_lock = threading.Lock()
+_context_listening = False
+
+
+def _before_context_statement(conn, cursor, statement, parameters, context, executemany):
+    log = _context_log.get()
+    if log is not None:
+        context._context_statement_log_entry = (log, len(log.statements), time.perf_counter())
+        log.statements.append(statement)
+        log.durations.append(None)
+
+
+def _after_context_statement(conn, cursor, statement, parameters, context, executemany):
+    entry = getattr(context, "_context_statement_log_entry", None)
+    if entry is not None:
+        log, index, started_at = entry
+        log.durations[index] = time.perf_counter() - started_at
+
+
+@contextmanager
+def count_context_statements():
+    """
+    Records the statements executed inside the block, on any engine, by
+    this context and the threads and tasks it starts (which copy it), so
+    statements that other requests run at the same time aren't counted.
+    The listeners are added to every engine the first time, and stay.
+    """
+    global _context_listening
+    with _context_listener_lock:
+        if not _context_listening:
+            event.listen(Engine, "before_cursor_execute", _before_context_statement)
+            event.listen(Engine, "after_cursor_execute", _after_context_statement)
+            _context_listening = True
+
+    log = StatementLog()
+    token = _context_log.set(log)
+    try:
+        yield log
+    finally:
+        _context_log.reset(token)
+
+
+@dataclass
+class ManifestTiming:
+    url: str
+    cache: str = "miss"
+    canvases: int = 0
+    stages: dict[str, float] = field(default_factory=dict)
+
+
+@dataclass
+class ImportTelemetry:
+    """
+    Collects per-stage timings and inserted row counts for an import run.
+
+    Stages are timed with `measure`; rows are counted from the session's
+    pending objects on every flush, so they cover whatever the ORM writes.
+    """
+
+    collid: str
+    started_at: float = field(default_factory=time.perf_counter)
+    finished_at: float | None = None
+    stages: dict[str, list[float]] = field(default_factory=lambda: defaultdict(list))
+    rows: Counter = field(default_factory=Counter)
+    manifests: list[ManifestTiming] = field(default_factory=list)
+
+    @contextmanager
+    def measure(self, stage: str, manifest: ManifestTiming | None = None):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.stages[stage].append(elapsed)
+            if manifest is not None:
+                manifest.stages[stage] = elapsed
+
+    def start_manifest(self, url: str, cached: bool, cache: str | None = None) -> ManifestTiming:
+        """`cache` names where the manifest came from, other than the fetch cache, like "archive"."""
+        manifest = ManifestTiming(url=url, cache=cache or ("hit" if cached else "miss"))
+        self.manifests.append(manifest)
+        return manifest
+
+    def watch(self, session: Session):
+        @event.listens_for(session, "after_flush")
+        def count_rows(session, flush_context):
+            for instance in session.new:
+                self.rows[instance.__table__.name] += 1
+
+    def finish(self):
+        self.finished_at = time.perf_counter()
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished_at or time.perf_counter()) - self.started_at
+
+    @property
+    def num_objects(self) -> int:
+        return len(self.manifests)
+
+    @property
+    def num_canvases(self) -> int:
+        return sum(manifest.canvases for manifest in self.manifests)
+
+    def summarize_stages(self) -> dict[str, dict[str, float]]:
+        return {
+            stage: {
+                "count": len(values),
+                "total": sum(values),
+                "p50": percentile(values, 50),
+                "p95": percentile(values, 95),
+            }
+            for stage, values in self.stages.items()
+        }
+
+    def to_dict(self) -> dict:
+        elapsed = self.elapsed
+        return {
+            "collid": self.collid,
+            "elapsed": elapsed,
+            "objects": self.num_objects,
+            "canvases": self.num_canvases,
+            "objects_per_second": self.num_objects / elapsed if elapsed else 0.0,
+            "canvases_per_second": self.num_canvases / elapsed if elapsed else 0.0,
+            "stages": self.summarize_stages(),
+            "rows": dict(self.rows),
+            "manifests": [
+                {
+                    "url": manifest.url,
+                    "cache": manifest.cache,
+                    "canvases": manifest.canvases,
+                    "stages": manifest.stages,
+                }
+                for manifest in self.manifests
+            ],
+        }
+
+    def write_report(self, path: Path):
+        path.write_text(json.dumps(self.to_dict(), indent=2))
+
+    def make_tables(self) -> list[Table]:
+        report = self.to_dict()
+
+        stage_table = Table(title=f"Import: {self.collid}")
+        stage_table.add_column("stage", no_wrap=True)
+        stage_table.add_column("count", justify="right")
+        stage_table.add_column("total (s)", justify="right")
+        stage_table.add_column("p50 (ms)", justify="right")
+        stage_table.add_column("p95 (ms)", justify="right")
+        for stage, summary in report["stages"].items():
+            stage_table.add_row(
+                stage,
+                str(summary["count"]),
+                f"{summary['total']:.2f}",
+                f"{summary['p50'] * 1000:.1f}",
+                f"{summary['p95'] * 1000:.1f}",
+            )
+
+        throughput_table = Table(title="Throughput")
+        throughput_table.add_column("metric", no_wrap=True)
+        throughput_table.add_column("value", justify="right")
+        throughput_table.add_row("elapsed (s)", f"{report['elapsed']:.2f}")
+        throughput_table.add_row("objects", str(report["objects"]))
+        throughput_table.add_row("canvases", str(report["canvases"]))
+        throughput_table.add_row("objects/sec", f"{report['objects_per_second']:.2f}")
+        throughput_table.add_row("canvases/sec", f"{report['canvases_per_second']:.2f}")
+        for table_name, count in sorted(report["rows"].items()):
+            throughput_table.add_row(f"rows: {table_name}", str(count))
+
+        return [stage_table, throughput_table]
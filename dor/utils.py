@@ -1,14 +1,18 @@
 from cattrs import Converter
 from uuid import UUID
 from datetime import datetime
-from urllib.parse import urlencode
+from urllib.parse import urlencode, urlsplit
+import base64
 import hashlib
 import json
 import subprocess
 import shlex
+import threading
+import time
 import uuid
 from pathlib import Path
 from dataclasses import dataclass, field
+from typing import Callable
 import math
 
 from dor.config import TMP_ROOT
@@ -23,42 +27,58 @@ def create_uuid_from_string(val: str):
     return uuid.UUID(hex=hex_string)
 
 
-def fetch(url: str):
-
+def get_cache_filename(url: str) -> Path:
     cache_path = TMP_ROOT / "cache"
     cache_path.mkdir(parents=True, exist_ok=True)
-    cache_filename = cache_path / hashlib.md5(url.encode("UTF-8")).hexdigest()
-    if cache_filename.exists():
-        return json.loads(cache_filename.read_text())
+    return cache_path / hashlib.md5(url.encode("UTF-8")).hexdigest()
+
+
+def is_cached(url: str) -> bool:
+    return get_cache_filename(url).exists()
 
 
+def fetch_path(url: str, limiter: "HostRateLimiter | None" = None) -> Path:
+    """
+    The cached response for `url`, fetched first if it isn't cached yet;
+    only a fetch waits its turn with `limiter`.
+    """
+    cache_filename = get_cache_filename(url)
+    if cache_filename.exists():
+        return cache_filename
+    if limiter:
+        limiter.acquire(url)
+
     # thank you, Gemini
     curl_command = f"curl {url}"
+    # stream the response to disk; large manifests never sit in memory whole
+    partial_filename = cache_filename.with_suffix(".part")
     try:
         command_parts = shlex.split(curl_command)
-        result = subprocess.run(
-            command_parts,
-            capture_output=True,
-            text=True,
-            check=True,
-            encoding='utf-8'  # Explicitly set encoding for clarity
-        )
-
-        output = result.stdout.strip()
-        cache_filename.write_text(output, encoding="utf-8")
-
-        return json.loads(output)
+        with open(partial_filename, "wb") as f:
+            subprocess.run(
+                command_parts,
+                stdout=f,
+                stderr=subprocess.PIPE,
+                check=True,
+            )
+        partial_filename.replace(cache_filename)
+
+        return cache_filename
     except subprocess.CalledProcessError as e:
+        partial_filename.unlink(missing_ok=True)
         print(f"Error executing curl command: '{curl_command}'")
         print(f"Return Code: {e.returncode}")
-        print(f"Standard Output:\n{e.stdout}")
-        print(f"Standard Error:\n{e.stderr}")
+        print(f"Standard Error:\n{e.stderr.decode('utf-8', errors='replace')}")
         raise
     except Exception as e:
         print(f"An unexpected error occurred: {e}")
         raise
 
 
+def fetch(url: str, limiter: "HostRateLimiter | None" = None):
+    return json.loads(fetch_path(url, limiter=limiter).read_text())
+
+
 # page.total_items      # total number of items in the query
 # page.total_pages      # total number of pagination pages, based on limit
 # page.offset           # the start offset, starts at 0
@@ -111,6 +131,84 @@ class Page:
         return f"{start}-{end}"
 
 
+@dataclass
+class KeysetPage:
+    """A page of keyset-paginated results; `next_cursor` is None on the last page."""
+    items: list = field(default_factory=list)
+    limit: int = 100
+    cursor: str | None = None
+    next_cursor: str | None = None
+
+
+def encode_cursor(date_time: datetime, id: int) -> str:
+    return base64.urlsafe_b64encode(f"{date_time.isoformat()}|{id}".encode("UTF-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        date_time, id = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("UTF-8").split("|")
+        return datetime.fromisoformat(date_time), int(id)
+    except ValueError as e:
+        raise ValueError(f"invalid cursor: {cursor}") from e
+
+
+@dataclass
+class TokenBucket:
+    """
+    Thread-safe token bucket: `acquire` blocks until `tokens` fit within
+    `rate` tokens per second, allowing bursts of up to `capacity`.
+    Requests larger than the bucket are let through and paid back as debt.
+    """
+    rate: float
+    capacity: float | None = None
+    clock: Callable[[], float] = time.monotonic
+    sleep: Callable[[float], None] = time.sleep
+
+    def __post_init__(self):
+        if self.capacity is None:
+            self.capacity = self.rate
+        self._tokens = self.capacity
+        self._updated_at = self.clock()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        with self._lock:
+            now = self.clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            self.sleep(wait)
+        return wait
+
+
+@dataclass
+class HostRateLimiter:
+    """
+    A TokenBucket per host, so every thread fetching from one host shares
+    its `rate` requests per second, and hosts don't hold each other up.
+    """
+    rate: float
+    capacity: float | None = None
+    clock: Callable[[], float] = time.monotonic
+    sleep: Callable[[float], None] = time.sleep
+    _buckets: dict[str, TokenBucket] = field(default_factory=dict, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def bucket(self, url: str) -> TokenBucket:
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(
+                    rate=self.rate, capacity=self.capacity, clock=self.clock, sleep=self.sleep
+                )
+            return self._buckets[host]
+
+    def acquire(self, url: str) -> float:
+        return self.bucket(url).acquire()
+
+
 converter = Converter()
 converter.register_unstructure_hook(
     datetime, lambda d: d.strftime("%Y-%m-%dT%H:%M:%SZ"))
@@ -136,9 +234,10 @@ class FilterLabel:
 @dataclass
 class Filter:
     key: str
-    value: str | None
+    value: str | list[str] | None
     name: str
 
     def make_label(self, query_params: dict[str, str]) -> FilterLabel:
-        remove_url = "?" + (urlencode(remove_parameter(query_params, self.key)))
-        return FilterLabel(title=f"{self.name}: {self.value}", remove_url=remove_url)
+        remove_url = "?" + (urlencode(remove_parameter(query_params, self.key), doseq=True))
+        value = ", ".join(self.value) if isinstance(self.value, list) else self.value
+        return FilterLabel(title=f"{self.name}: {value}", remove_url=remove_url)
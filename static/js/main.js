@@ -38,15 +38,85 @@ if ( dialog ) {
 }
 
 // ---- FILESET CONTENTS DISPLAY
-document.querySelectorAll(`button[data-action="toggle-view-all-files"]`).forEach((btn) => {
-  btn.addEventListener('click', () => {
-    const wrapper = btn.closest("[data-view-all-files]");
-    wrapper.dataset.viewAllFiles = !!!(wrapper.dataset.viewAllFiles == "true");
-    btn.classList.toggle("toggled", wrapper.dataset.viewAllFiles == 'true');
-  })
+// delegated, so filesets loaded later get it too
+document.addEventListener('click', (event) => {
+  const btn = event.target.closest(`button[data-action="toggle-view-all-files"]`);
+  if ( !btn ) { return; }
+  const wrapper = btn.closest("[data-view-all-files]");
+  wrapper.dataset.viewAllFiles = !!!(wrapper.dataset.viewAllFiles == "true");
+  btn.classList.toggle("toggled", wrapper.dataset.viewAllFiles == 'true');
+})
+
+// ---- FILESET PAGES
+document.addEventListener('click', async (event) => {
+  const btn = event.target.closest(`button[data-action="load-more-filesets"]`);
+  if ( !btn ) { return; }
+  btn.disabled = true;
+  await loadMoreFilesets(btn);
+})
+
+// ---- TYPEAHEAD
+document.querySelectorAll(`input[data-suggest-field]`).forEach((input) => {
+  const datalist = document.getElementById(input.getAttribute("list"));
+  let timer;
+  input.addEventListener("input", () => {
+    clearTimeout(timer);
+    timer = setTimeout(() => loadSuggestions(input, datalist), 150);
+  });
 })
 
 // FUNCTIONS
+async function loadMoreFilesets(btn) {
+  const response = await fetch(btn.dataset.href, {
+    credentials: "include",
+  });
+  if (!response.ok) {
+    btn.disabled = false;
+    throw new Error(`Request error: ${response.status}`);
+  }
+
+  const text = await response.text();
+  const newDocument = new DOMParser().parseFromString(text, "text/html");
+  const filesetsEl = document.querySelector('[data-slot="filesets"]');
+  const newFilesetsEl = newDocument.querySelector('[data-slot="filesets"]');
+  filesetsEl.append(...newFilesetsEl.children);
+  filesetsEl.dataset.rangeEnd = newFilesetsEl.dataset.rangeEnd;
+
+  const rangeEl = document.querySelector('[data-slot="filesets-range"]');
+  rangeEl.textContent = rangeEl.textContent.replace(/-\d+ of/, `-${newFilesetsEl.dataset.rangeEnd} of`);
+
+  const newBtn = newDocument.querySelector(`button[data-action="load-more-filesets"]`);
+  if ( newBtn ) {
+    btn.replaceWith(newBtn);
+  } else {
+    btn.remove();
+  }
+}
+
+async function loadSuggestions(input, datalist) {
+  const params = new URLSearchParams({
+    field: input.dataset.suggestField,
+    prefix: input.value,
+  });
+  const response = await fetch(`${input.dataset.suggestHref}?${params}`, {
+    credentials: "include",
+  });
+  if (!response.ok) {
+    return;
+  }
+
+  const data = await response.json();
+  // a slower response for an earlier prefix
+  if (data.prefix != input.value) {
+    return;
+  }
+  datalist.replaceChildren(...data.suggestions.map((suggestion) => {
+    const option = document.createElement("option");
+    option.value = suggestion;
+    return option;
+  }));
+}
+
 async function loadPageIntoModal(href, dialog) {
   // we could send an accept header for "application/json",
   // but then we'd have to build the UI, meh
@@ -0,0 +1,133 @@
+import pytest
+import sqlalchemy
+from sqlalchemy.orm import Session
+
+from dor.adapters.sqlalchemy import Base
+from dor.config import config
+from dor.telemetry import count_statements
+
+
+def make_manifest_data(alternate_identifier: str, num_canvases: int) -> dict:
+    api_url = "https://quod.lib.umich.edu/cgi/i/image/api"
+    canvases = [
+        {
+            "@id": f"{api_url}/canvas/{alternate_identifier}:{index}/canvas/1",
+            "label": f"Page {index + 1}",
+            "images": [{
+                "resource": {
+                    "format": "image/jp2",
+                    "service": {"@id": f"{api_url}/image/{alternate_identifier}:{index:08d}"},
+                },
+            }],
+        }
+        for index in range(num_canvases)
+    ]
+    return {
+        "@id": f"{api_url}/manifest/{alternate_identifier}",
+        "label": f"Manifest {alternate_identifier}",
+        "sequences": [{"canvases": canvases}],
+    }
+
+
+def make_dlxs_collection(collid: str, num_objects: int, page_size: int = 2) -> tuple[str, dict[str, dict]]:
+    """A DLXS collection's URL, and its pages, `page_size` manifests each, and manifests by URL."""
+    api_url = "https://quod.lib.umich.edu/cgi/i/image/api"
+    manifests = [make_manifest_data(f"{collid}:{index:04d}", num_canvases=2) for index in range(num_objects)]
+    responses = {manifest["@id"]: manifest for manifest in manifests}
+    collection_url = url = f"{api_url}/collection/{collid}"
+    for start in range(0, num_objects, page_size):
+        next_url = f"{collection_url}?start={start + page_size}"
+        responses[url] = {
+            "@id": collection_url,
+            "label": collid,
+            "attribution": "",
+            "total": num_objects,
+            "manifests": [
+                {"@id": manifest["@id"], "label": manifest["@id"]} for manifest in manifests[start:start + page_size]
+            ],
+            "next": next_url if start + page_size < num_objects else None,
+        }
+        url = next_url
+    return collection_url, responses
+
+
+@pytest.fixture
+def manifest_data() -> dict:
+    return make_manifest_data("amjewess:0001", num_canvases=3)
+
+
+@pytest.fixture
+def manifest_factory():
+    return make_manifest_data
+
+
+@pytest.fixture
+def dlxs_collection_factory():
+    return make_dlxs_collection
+
+
+@pytest.fixture
+def session():
+    engine = sqlalchemy.create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
+@pytest.fixture
+def engine_factory(tmp_path):
+    """`engine_factory(name)` is a new, empty SQLite catalog at `tmp_path / f"{name}.sqlite3"`."""
+    engines = []
+
+    def create(name: str = "catalog"):
+        engine = sqlalchemy.create_engine(f"sqlite:///{tmp_path / f'{name}.sqlite3'}")
+        Base.metadata.create_all(engine)
+        engines.append(engine)
+        return engine
+
+    yield create
+    for engine in engines:
+        engine.dispose()
+
+
+@pytest.fixture
+def statement_counter(session: Session):
+    """`with statement_counter() as log:` records what the test's session executes; see `log.count`."""
+    return lambda: count_statements(session.get_bind())
+
+
+@pytest.fixture
+def add_collection(session: Session):
+    """Adds a harvested-looking collection with `num_objects` objects of `num_canvases` pages."""
+    from dor.builder import build_collection, build_intellectual_object
+
+    def add(collid: str, num_objects: int, num_canvases: int = 2, object_type: str = "types:monograph"):
+        collection = build_collection(
+            {"@id": f"https://example.org/collection/{collid}", "label": collid, "attribution": ""},
+            "types:box"
+        )
+        session.add(collection)
+        for index in range(num_objects):
+            collection.objects.append(build_intellectual_object(
+                collid, make_manifest_data(f"{collid}:{index:04d}", num_canvases), object_type
+            ))
+        session.commit()
+        return collection
+
+    return add
+
+
+@pytest.fixture
+def cli_catalog(tmp_path, monkeypatch):
+    """Points the catalog commands at a new SQLite catalog in `tmp_path`."""
+    from dor.cli import catalog as catalog_cli
+
+    cached = [catalog_cli.get_connection, catalog_cli.get_connections, catalog_cli.get_session]
+    monkeypatch.setattr(config, "database_url", f"sqlite:///{tmp_path / 'catalog.sqlite3'}")
+    for function in cached:
+        function.cache_clear()
+    yield
+    catalog_cli.get_connection().close()
+    catalog_cli.get_connection().engine.dispose()
+    for function in cached:
+        function.cache_clear()
@@ -0,0 +1,62 @@
+from pathlib import Path
+
+import sqlalchemy
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from dor.adapters.sqlalchemy import Base
+from dor.config import config
+from dor.entrypoints.api import main
+from dor.entrypoints.api.console import templates
+from dor.entrypoints.api.dependencies import get_db_session
+
+
+def test_lifespan_warms_engine_and_templates(monkeypatch, tmp_path):
+    engine = sqlalchemy.create_engine(f"sqlite:///{tmp_path / 'catalog.sqlite3'}")
+    monkeypatch.setattr(main, "get_engine", lambda: engine)
+    templates.env.cache.clear()
+
+    with TestClient(main.app):
+        assert engine.pool.checkedin() == 1
+        cached = {template.name for template in templates.env.cache.values()}
+        assert {"objects.html", "events.html", "partials/_side-nav.html"} <= cached
+
+
+def test_profile_request(monkeypatch, tmp_path):
+    engine = sqlalchemy.create_engine(f"sqlite:///{tmp_path / 'catalog.sqlite3'}")
+    Base.metadata.create_all(engine)
+    # the request's session reads another engine, as a shard or snapshot would
+    served = sqlalchemy.create_engine("sqlite://")
+    monkeypatch.setattr(main, "get_engine", lambda: served)
+    monkeypatch.setattr(config, "profile_requests", True)
+    monkeypatch.setattr(config, "profile_token", "sesame")
+    monkeypatch.setenv("DOR_PROFILE_ROOT", str(tmp_path / "profiles"))
+
+    def get_test_session():
+        with Session(engine) as session:
+            yield session
+
+    main.app.dependency_overrides[get_db_session] = get_test_session
+    try:
+        with TestClient(main.app) as client:
+            page = client.get("/admin/console/collections/")
+            profile = client.get(
+                "/admin/console/collections/?_profile=1", headers={main.PROFILE_TOKEN_HEADER: "sesame"}
+            ).json()
+            refused = [
+                client.get("/admin/console/collections/?_profile=1", headers=headers)
+                for headers in [{}, {main.PROFILE_TOKEN_HEADER: "open"}]
+            ]
+            monkeypatch.setattr(config, "profile_requests", False)
+            disabled = client.get("/admin/console/collections/?_profile=1")
+    finally:
+        main.app.dependency_overrides.clear()
+
+    assert page.headers["content-type"].startswith("text/html")
+    assert profile["status_code"] == 200
+    assert profile["sql"]["statements"] == 2
+    assert profile["templates"]["time"] > 0
+    assert any("get_collections" in row["function"] for row in profile["functions"])
+    assert sorted(Path(path).suffix for path in profile["files"]) == [".collapsed", ".pstats", ".txt"]
+    assert [response.status_code for response in refused] == [403, 403]
+    assert disabled.headers["content-type"].startswith("text/html")
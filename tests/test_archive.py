@@ -0,0 +1,123 @@
+import json
+import tarfile
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from typer.testing import CliRunner
+
+from dor.adapters.archive import ArchiveMiss, open_archive, url_key, write_archive
+from dor.cli import catalog as catalog_cli
+from dor.cli.main import app
+from dor.manifest import open_manifest
+from dor.models.intellectual_object import IntellectualObject
+from dor.services import harvest
+from dor.services.harvest import harvest_collection
+from dor.telemetry import ImportTelemetry
+
+
+@pytest.fixture
+def iiif_directory(tmp_path, dlxs_collection_factory):
+    """Two collections' pages and manifests under their cache names, the way `tmp/cache` keeps them."""
+    directory = tmp_path / "cache"
+    directory.mkdir()
+    collection_urls, responses = {}, {}
+    for collid, num_objects in [("amjewess", 5), ("bhl", 3)]:
+        collection_urls[collid], collection_responses = dlxs_collection_factory(collid, num_objects)
+        responses |= collection_responses
+    for url, data in responses.items():
+        (directory / url_key(url)).write_text(json.dumps(data))
+    return directory, collection_urls, responses
+
+
+@pytest.fixture
+def offline(monkeypatch):
+    """Fails any fetch, so only an archive can be read."""
+    def fetch(url, limiter=None):
+        raise AssertionError(f"fetched {url}")
+
+    for module in [harvest, catalog_cli]:
+        monkeypatch.setattr(module, "fetch", fetch)
+        monkeypatch.setattr(module, "fetch_path", fetch)
+
+
+def make_archive(kind: str, directory, tmp_path, responses):
+    if kind == "directory":
+        return directory
+    if kind == "tar":
+        path = tmp_path / "cache.tar"
+        with tarfile.open(path, "w") as tar:
+            tar.add(directory, arcname=".")
+        return path
+    path = tmp_path / "cache.zip"
+    write_archive(path, ((url, directory / url_key(url)) for url in responses))
+    return path
+
+
+@pytest.mark.parametrize("kind", ["directory", "tar", "zip"])
+def test_archive_reads_by_url(kind, tmp_path, iiif_directory):
+    directory, collection_urls, responses = iiif_directory
+    manifest_url = responses[collection_urls["bhl"]]["manifests"][0]["@id"]
+
+    with open_archive(make_archive(kind, directory, tmp_path, responses)) as archive:
+        page = archive.read_json(collection_urls["bhl"])
+        with open_manifest(lambda: archive.open(manifest_url)) as streamed:
+            header, canvases = streamed.header, list(streamed.canvases)
+
+        assert len(archive) == len(responses)
+        assert page == responses[collection_urls["bhl"]]
+        assert header["@id"] == manifest_url
+        assert len(canvases) == 2
+        assert f"{collection_urls['bhl']}?start=99" not in archive
+        with pytest.raises(ArchiveMiss):
+            archive.read_json(f"{collection_urls['bhl']}?start=99")
+
+
+def test_compressed_tar_is_refused(tmp_path, iiif_directory):
+    directory, _, _ = iiif_directory
+    path = tmp_path / "cache.tar.gz"
+    with tarfile.open(path, "w:gz") as tar:
+        tar.add(directory, arcname=".")
+
+    with pytest.raises(ValueError, match="gzip-compressed"):
+        open_archive(path)
+
+
+def test_harvest_collection_from_archive(session: Session, tmp_path, iiif_directory, offline):
+    directory, collection_urls, responses = iiif_directory
+    telemetry = ImportTelemetry(collid="amjewess")
+
+    with open_archive(make_archive("tar", directory, tmp_path, responses)) as archive:
+        progress = list(harvest_collection(
+            session, "amjewess", collection_urls["amjewess"], "types:monograph", telemetry=telemetry, archive=archive,
+        ))
+
+    assert [p.num_processed for p in progress] == [1, 2, 3, 4, 5]
+    assert {manifest.cache for manifest in telemetry.manifests} == {"archive"}
+    assert "page read (archive)" in telemetry.stages
+
+
+def test_pack_and_replay_archive(tmp_path, monkeypatch, iiif_directory, cli_catalog):
+    directory, _, responses = iiif_directory
+    # packed from the fetch cache, then replayed without it
+    monkeypatch.setattr(catalog_cli, "fetch_path", lambda url, limiter=None: directory / url_key(url))
+    monkeypatch.setattr(catalog_cli, "fetch", lambda url, limiter=None: responses[url])
+    runner = CliRunner()
+    path = tmp_path / "hart.zip"
+
+    packed = runner.invoke(app, ["catalog", "pack-archive", str(path), "amjewess:image", "bhl:image", "--limit", "3"])
+    monkeypatch.setattr(harvest, "fetch_path", lambda url, limiter=None: pytest.fail(f"fetched {url}"))
+    monkeypatch.setattr(harvest, "fetch", lambda url, limiter=None: pytest.fail(f"fetched {url}"))
+    initialized = runner.invoke(app, ["catalog", "initialize"])
+    imported = runner.invoke(app, [
+        "catalog", "collection", "amjewess", "--class", "image", "--limit", "3", "--archive", str(path)
+    ])
+
+    assert packed.exit_code == 0, packed.output
+    assert initialized.exit_code == 0, initialized.output
+    assert imported.exit_code == 0, imported.output
+    with open_archive(path) as archive:
+        # amjewess's first two pages, and bhl's only two
+        assert len(archive) == 3 + 2 + 3 + 2
+    with Session(catalog_cli.get_connection()) as session:
+        assert session.execute(select(func.count()).select_from(IntellectualObject)).scalar_one() == 3
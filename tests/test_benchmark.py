@@ -0,0 +1,59 @@
+import asyncio
+
+import sqlalchemy
+from sqlalchemy.orm import Session
+
+from dor.adapters.sqlalchemy import Base
+from dor.benchmark import (
+    BenchmarkReport,
+    build_synthetic_catalog,
+    compare_reports,
+    make_manager_benchmarks,
+    make_scenarios,
+    run_endpoint_benchmarks,
+    run_manager_benchmarks,
+    select_targets,
+)
+from dor.entrypoints.api.dependencies import get_db_session
+from dor.entrypoints.api.main import app
+
+
+def test_benchmark_smoke(tmp_path):
+    engine = sqlalchemy.create_engine(f"sqlite:///{tmp_path / 'bench.sqlite3'}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        build_synthetic_catalog(session, num_collections=2, num_objects=6, num_canvases=2)
+        targets = select_targets(session)
+        managers = run_manager_benchmarks(session, make_manager_benchmarks(targets), iterations=2)
+
+    def get_benchmark_session():
+        with Session(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_db_session] = get_benchmark_session
+    try:
+        endpoints = asyncio.run(run_endpoint_benchmarks(app, make_scenarios(targets), num_requests=4, concurrency=2))
+    finally:
+        app.dependency_overrides.clear()
+
+    assert targets.num_objects == 6
+    assert {"collections", "objects (deep page)", "object (json)", "event"} <= endpoints.keys()
+    assert all(summary["errors"] == 0 and summary["count"] == 4 for summary in endpoints.values())
+    assert "duplicates.get_files" in managers
+
+    report = BenchmarkReport(parameters={}, endpoints=endpoints, managers=managers)
+    report.write(tmp_path / "report.json")
+    assert BenchmarkReport.read(tmp_path / "report.json") == report
+
+
+def test_compare_reports():
+    def result(p95, per_second):
+        return {"count": 10, "elapsed": 1.0, "p50": p95, "p95": p95, "p99": p95, "per_second": per_second}
+
+    baseline = BenchmarkReport(parameters={}, endpoints={"objects": result(0.010, 100), "object": result(0.010, 100)})
+    current = BenchmarkReport(parameters={}, endpoints={"objects": result(0.011, 95), "object": result(0.020, 50)})
+
+    regressions = compare_reports(baseline, current, threshold=0.2)
+
+    assert [(r.name, r.metric) for r in regressions] == [("object", "p95"), ("object", "per_second")]
+    assert regressions[0].change == 1.0
@@ -0,0 +1,56 @@
+import os
+
+import pytest
+import sqlalchemy
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from dor.adapters.bulk import CopyLoader
+from dor.adapters.sqlalchemy import Base
+from dor.builder import build_intellectual_object
+from dor.models.checksum import Checksum
+from dor.models.object_file import ObjectFile
+from dor.models.premis_event import PremisEvent
+
+
+def test_copy_loader_detaches_children(manifest_data: dict):
+    intellectual_object = build_intellectual_object("amjewess", manifest_data, "types:monograph")
+
+    loader = CopyLoader()
+    loader.detach(intellectual_object)
+
+    # 5 object-level files, plus 7 per jp2 canvas
+    assert len(loader.object_files) == 5 + 3 * 7
+    assert len(loader.checksums) == len(loader.object_files)
+    # 2 per object, 2 per fileset, 2 per object-level file
+    assert len(loader.premis_events) == 2 + 3 * 2 + 5 * 2
+    assert list(intellectual_object.object_files) == []
+    assert all(list(fileset.object_files) == [] for fileset in intellectual_object.filesets)
+    assert intellectual_object.premis_events == []
+
+
+@pytest.mark.skipif(
+    not os.getenv("DOR_TEST_DATABASE_URL"),
+    reason="set DOR_TEST_DATABASE_URL to a throwaway PostgreSQL database"
+)
+def test_copy_loader_copies_into_postgres(manifest_data: dict):
+    engine = sqlalchemy.create_engine(os.environ["DOR_TEST_DATABASE_URL"])
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+    intellectual_object = build_intellectual_object("amjewess", manifest_data, "types:monograph")
+    with Session(engine) as session:
+        loader = CopyLoader()
+        loader.detach(intellectual_object)
+        session.add(intellectual_object)
+        session.flush()
+        rows = loader.copy(session)
+        session.commit()
+
+        assert rows["catalog_object_file"] == 26
+        assert session.execute(select(func.count()).select_from(ObjectFile)).scalar_one() == 26
+        assert session.execute(select(func.count()).select_from(Checksum)).scalar_one() == 26
+        assert session.execute(select(func.count()).select_from(PremisEvent)).scalar_one() == 18
+        assert intellectual_object.filesets[0].object_files.count() == 7
+
+    Base.metadata.drop_all(engine)
@@ -0,0 +1,141 @@
+from datetime import datetime
+from uuid import uuid4
+
+from sqlalchemy.orm import Session
+
+from dor.models.premis_event import PremisEvent
+from dor.services.catalog import catalog
+
+
+def test_duplicates_groups_identical_digests(session: Session, add_collection):
+    amjewess = add_collection("amjewess", num_objects=2)
+    bhl = add_collection("bhl", num_objects=1)
+    files = [
+        amjewess.objects[0].filesets[0].source_object_file,
+        amjewess.objects[1].filesets[0].source_object_file,
+        bhl.objects[0].filesets[1].source_object_file,
+    ]
+    for object_file in files:
+        object_file.digest = files[0].digest
+        object_file.size = 1000
+    session.commit()
+
+    page = catalog.duplicates.find(session)
+
+    assert page.total_items == 1
+    [duplicate] = page.items
+    assert (duplicate.num_files, duplicate.num_objects, duplicate.num_collections) == (3, 3, 2)
+    assert duplicate.reclaimable_bytes == 2000
+    assert catalog.duplicates.get_totals(session).reclaimable_bytes == 2000
+    assert len(catalog.duplicates.get_files(session, [files[0].digest])[files[0].digest]) == 3
+    assert catalog.duplicates.find(session, file_format="image/jp2").total_items == 0
+
+
+def test_sample_objects_in_one_query(session: Session, add_collection):
+    amjewess = add_collection("amjewess", num_objects=8)
+    add_collection("bhl", num_objects=4, object_type="types:slide")
+
+    sample = catalog.objects.sample(session, size=5, seed=42)
+
+    assert len(sample) == 5
+    assert {row.identifier for row in sample} == {
+        row.identifier for row in catalog.objects.sample(session, size=5, seed=42)
+    }
+    assert len(catalog.objects.sample(session, size=100, seed=7)) == 12
+    assert {row.collections_summary for row in catalog.objects.sample(session, collection_alt_identifier="bhl")} == {"bhl"}
+    assert {row.type for row in catalog.objects.sample(session, object_type="types:slide")} == {"types:slide"}
+
+    expected = {o.identifier: o.total_data_size for o in amjewess.objects}
+    for row in catalog.objects.sample(session, collection_alt_identifier="amjewess", size=3, seed=1):
+        assert row.total_data_size == expected[row.identifier]
+
+
+def test_sample_objects_differs_by_seed(session: Session, add_collection):
+    add_collection("amjewess", num_objects=40, num_canvases=1)
+
+    samples = [
+        {row.identifier for row in catalog.objects.sample(session, size=10, seed=seed)} for seed in [1, 2, 1]
+    ]
+
+    assert all(len(sample) == 10 for sample in samples)
+    assert samples[0] != samples[1]
+    assert samples[0] == samples[2]
+
+
+def test_sample_one_collection_of_a_larger_catalog(session: Session, add_collection):
+    small = add_collection("small", num_objects=10, num_canvases=1)
+    add_collection("large", num_objects=40, num_canvases=1)
+    [lowest, *_] = small.objects
+
+    samples = [
+        {row.identifier for row in catalog.objects.sample(session, collection_alt_identifier="small", size=3, seed=seed)}
+        for seed in range(20)
+    ]
+
+    assert all(len(sample) == 3 for sample in samples)
+    # not topped up from the lowest ids, as when seeks land past the collection's last object
+    assert sum(lowest.identifier in sample for sample in samples) < 10
+    assert len(set().union(*samples)) == 10
+
+
+def test_summarize_filesets(session: Session, add_collection):
+    [intellectual_object] = add_collection("amjewess", num_objects=1, num_canvases=5).objects
+
+    summary = catalog.filesets.get_object_summary(session, intellectual_object.bin_identifier)
+    assert (summary.collections_summary, summary.num_filesets) == ("amjewess", 5)
+
+    rows = list(catalog.filesets.summarize(session, summary.id))
+    assert [row.identifier for row in rows] == [f.identifier for f in intellectual_object.filesets]
+    for row, fileset in zip(rows, intellectual_object.filesets):
+        assert row.num_files == fileset.object_files.count()
+        assert row.num_source_files == 1
+        assert row.total_data_size == fileset.total_data_size
+
+    page = list(catalog.filesets.summarize(session, summary.id, start=1, limit=2))
+    assert [row.identifier for row in page] == [row.identifier for row in rows[1:3]]
+
+
+def test_fileset_views_page_without_the_object(session: Session, add_collection, statement_counter):
+    [intellectual_object] = add_collection("amjewess", num_objects=1, num_canvases=25).objects
+    view = catalog.objects.get_view(session, intellectual_object.identifier)
+    session.expunge_all()
+
+    with statement_counter() as log:
+        page = catalog.filesets.get_views(session, intellectual_object.identifier, start=20, limit=10)
+
+    assert log.count == 3
+    assert (page.total_items, page.range, page.next_offset) == (25, "21-25", -1)
+    assert [fileset.identifier for fileset in page.items] == [fileset.identifier for fileset in view.filesets[20:]]
+    assert [fileset.object_files for fileset in page.items] == [fileset.object_files for fileset in view.filesets[20:]]
+    assert catalog.filesets.get_views(session, uuid4()) is None
+
+
+def test_event_timeline_pages_across_levels(session: Session, add_collection):
+    amjewess = add_collection("amjewess", num_objects=2)
+    add_collection("bhl", num_objects=2)
+    object_file = amjewess.objects[0].filesets[0].source_object_file
+    session.add(PremisEvent(
+        identifier=uuid4(), type="fixity check", date_time=datetime(2030, 1, 1), object_file=object_file
+    ))
+    session.commit()
+
+    every_event = list(catalog.events.stream(session))
+    keys = [(row.date_time, row.id) for row in every_event]
+    assert keys == sorted(keys)
+
+    paged, cursor = [], None
+    while True:
+        page = catalog.events.timeline(session, cursor=cursor, limit=3)
+        paged.extend(page.items)
+        if not page.next_cursor:
+            break
+        cursor = page.next_cursor
+    assert [row.identifier for row in paged] == [row.identifier for row in every_event]
+
+    amjewess_events = list(catalog.events.stream(session, collection_alt_identifier="amjewess"))
+    assert 0 < len(amjewess_events) < len(every_event)
+    assert {row.object_alternate_identifiers.split(":")[0] for row in amjewess_events} == {"amjewess"}
+
+    [fixity] = catalog.events.timeline(session, event_types=["fixity check"], start_date=datetime(2029, 1, 1)).items
+    assert (fixity.level, fixity.object_file_identifier) == ("file", object_file.identifier)
+    assert fixity.object_identifier == amjewess.objects[0].identifier
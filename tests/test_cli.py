@@ -0,0 +1,75 @@
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from dor.cli.main import app
+
+REPO_ROOT = Path(__file__).parent.parent
+
+# cron wrappers start the CLI hundreds of times a day; importing it costs ~40ms
+IMPORT_BUDGET_US = 250_000
+HEAVY_MODULES = ["sqlalchemy", "faker", "fastapi", "dor.cli.catalog", "dor.cli.fixity", "dor.cli.server"]
+
+
+def run_python(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+    )
+
+
+def test_import_time_budget():
+    result = run_python("-X", "importtime", "-c", "import dor.cli.main")
+    [cumulative_us] = re.findall(r"\|\s*(\d+) \| dor\.cli\.main$", result.stderr, re.MULTILINE)
+    assert int(cumulative_us) < IMPORT_BUDGET_US
+
+
+def test_help_loads_no_subcommands():
+    result = run_python("-c", (
+        "import sys\n"
+        "from dor.cli.main import app\n"
+        "try:\n"
+        "    app(['--help'])\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        f"print('loaded:', [name for name in {HEAVY_MODULES!r} if name in sys.modules])\n"
+    ))
+    assert "catalog" in result.stdout
+    assert result.stdout.strip().splitlines()[-1] == "loaded: []"
+
+
+def test_subcommands_load_on_demand():
+    result = CliRunner().invoke(app, ["fixity", "run", "--help"])
+    assert result.exit_code == 0
+    assert "--older-than-days" in result.stdout
+
+
+def test_server_production_mode(monkeypatch):
+    import uvicorn
+    calls = []
+    monkeypatch.setattr(uvicorn, "run", lambda app, **kwargs: calls.append(kwargs))
+
+    result = CliRunner().invoke(app, ["server", "start", "--production", "--workers", "3", "--port", "9000"])
+
+    assert result.exit_code == 0
+    [kwargs] = calls
+    assert (kwargs["workers"], kwargs["port"], kwargs["loop"], kwargs["http"]) == (3, 9000, "uvloop", "httptools")
+    assert "reload" not in kwargs
+
+
+def test_profile_option(monkeypatch, tmp_path):
+    monkeypatch.setenv("DOR_PROFILE_ROOT", str(tmp_path / "profiles"))
+    report = tmp_path / "report.json"
+    report.write_text('{"parameters": {}, "endpoints": {}, "managers": {}}')
+
+    for option in ["--profile", "--profile=alloc"]:
+        result = CliRunner().invoke(app, [option, "bench", "compare", str(report), str(report)])
+        assert result.exit_code == 0, result.output
+
+    profiles = sorted(path.name for path in (tmp_path / "profiles").iterdir())
+    assert all(name.startswith("bench-compare-") for name in profiles)
+    assert sorted(".".join(name.rsplit(".", 2)[-2:]) for name in profiles) == [
+        "alloc.collapsed", "alloc.txt", "cpu.collapsed", "cpu.pstats", "cpu.txt"
+    ]
@@ -0,0 +1,81 @@
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from dor.models.object_document import ObjectDocument
+from dor.services.catalog import catalog
+from dor.services.documents import (
+    ObjectView,
+    build_object_document,
+    build_object_view,
+    decode_document,
+    encode_document,
+    load_object_view,
+    rebuild_object_documents,
+)
+from dor.services.purge import purge_collection
+
+
+def test_document_matches_models(session: Session, add_collection):
+    [intellectual_object] = add_collection("amjewess", num_objects=1, num_canvases=3).objects
+
+    view = decode_document(build_object_document(intellectual_object, intellectual_object.collections).document)
+
+    assert view.identifier == intellectual_object.identifier
+    assert view.collections_summary == "amjewess"
+    assert view.total_data_size == intellectual_object.total_data_size
+    assert [f.identifier for f in view.filesets] == [f.identifier for f in intellectual_object.filesets]
+    for fileset_view, fileset in zip(view.filesets, intellectual_object.filesets):
+        assert fileset_view.total_data_size == fileset.total_data_size
+        assert fileset_view.source_object_file.name == fileset.source_object_file.name
+        assert len(fileset_view.object_files) == fileset.object_files.count()
+    assert [e.identifier for e in view.premis_events] == [e.identifier for e in intellectual_object.premis_events]
+
+
+def test_get_from_document(session: Session, add_collection):
+    [intellectual_object] = add_collection("amjewess", num_objects=1).objects
+    identifier = intellectual_object.identifier
+    assert catalog.objects.get(session, identifier, from_document=True) is intellectual_object
+
+    assert list(rebuild_object_documents(session)) == [1]
+    view = catalog.objects.get(session, identifier, from_document=True)
+    assert isinstance(view, ObjectView)
+    intellectual_object = catalog.objects.get(session, identifier)
+    assert view == decode_document(encode_document(
+        build_object_view(intellectual_object, intellectual_object.collections)
+    ))
+
+    # documents from an older layout are ignored
+    session.execute(update(ObjectDocument).values(version=0))
+    assert not isinstance(catalog.objects.get(session, identifier, from_document=True), ObjectView)
+
+
+def test_rebuild_object_documents_in_chunks(session: Session, add_collection):
+    add_collection("amjewess", num_objects=5)
+    add_collection("bhl", num_objects=2)
+
+    assert list(rebuild_object_documents(session, "amjewess", chunk_size=2)) == [2, 4, 5]
+    assert session.execute(select(func.count()).select_from(ObjectDocument)).scalar_one() == 5
+
+
+def test_load_object_view(session: Session, add_collection, statement_counter):
+    [small] = add_collection("amjewess", num_objects=1, num_canvases=2).objects
+    [large] = add_collection("bhl", num_objects=1, num_canvases=20).objects
+
+    counts = []
+    for intellectual_object in [small, large]:
+        session.expire_all()
+        with statement_counter() as log:
+            view = load_object_view(session, intellectual_object)
+        counts.append(log.count)
+        assert view == build_object_view(intellectual_object, intellectual_object.collections)
+
+    assert counts[0] == counts[1]
+
+
+def test_purge_removes_documents(session: Session, add_collection):
+    add_collection("amjewess", num_objects=2)
+    list(rebuild_object_documents(session))
+
+    list(purge_collection(session, "amjewess"))
+
+    assert session.execute(select(func.count()).select_from(ObjectDocument)).scalar_one() == 0
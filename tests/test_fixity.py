@@ -0,0 +1,123 @@
+import hashlib
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+import sqlalchemy
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from dor.adapters.sqlalchemy import Base
+from dor.models.checksum import Checksum
+from dor.models.object_file import ObjectFile
+from dor.models.premis_event import PremisEvent
+from dor.services.catalog import catalog
+from dor.services.documents import (
+    ObjectView, decode_document, encode_document, load_object_view, rebuild_object_documents
+)
+from dor.services.fixity import FixityEngine
+from dor.services.hashing import hash_file
+
+
+@pytest.fixture
+def session():
+    engine = sqlalchemy.create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
+def add_object_file(session: Session, identifier: str, digest: bytes, last_fixity_check: datetime | None):
+    created_at = last_fixity_check or datetime(2000, 1, 1)
+    object_file = ObjectFile(
+        identifier=identifier,
+        file_format="image/tiff",
+        file_function="function:source",
+        size=0,
+        digest=digest,
+        revision_number=1,
+        created_at=created_at,
+        updated_at=created_at,
+        last_fixity_check=last_fixity_check,
+    )
+    object_file.checksums.append(Checksum(
+        algorithm="sha256", digest=digest, created_at=created_at, updated_at=created_at
+    ))
+    session.add(object_file)
+    return object_file
+
+
+def test_hash_file_streams_in_small_buffers(tmp_path: Path):
+    path = tmp_path / "page.tif"
+    path.write_bytes(b"x" * 10_000)
+
+    file_hash = hash_file(path, buffer_size=1024)
+
+    assert file_hash.size == 10_000
+    assert file_hash.digest == hashlib.sha256(b"x" * 10_000).digest()
+
+
+def test_fixity_engine_checks_most_overdue_files(session: Session, tmp_path: Path):
+    (tmp_path / "good.tif").write_bytes(b"good")
+    (tmp_path / "bad.tif").write_bytes(b"corrupted")
+    long_ago = datetime(2000, 1, 1)
+    good = add_object_file(session, "good.tif", hashlib.sha256(b"good").digest(), long_ago)
+    bad = add_object_file(session, "bad.tif", hashlib.sha256(b"bad").digest(), long_ago + timedelta(days=1))
+    missing = add_object_file(session, "missing.tif", hashlib.sha256(b"").digest(), long_ago + timedelta(days=2))
+    recent = add_object_file(session, "recent.tif", hashlib.sha256(b"").digest(), datetime.now())
+    session.commit()
+
+    engine = FixityEngine(storage_root=tmp_path, workers=2, batch_size=2)
+    batches = list(engine.run(session, older_than=timedelta(days=30)))
+
+    assert [len(batch.results) for batch in batches] == [2, 1]
+    outcomes = {result.identifier: result.outcome for batch in batches for result in batch.results}
+    assert outcomes == {"good.tif": "success", "bad.tif": "failure", "missing.tif": "failure"}
+
+    events = session.execute(select(PremisEvent).filter_by(type="fixity check")).scalars().all()
+    assert sorted(event.object_file_id for event in events) == sorted([good.id, bad.id, missing.id])
+    session.expire_all()
+    assert good.last_fixity_check > long_ago
+    assert recent.premis_events == []
+
+
+def test_fixity_engine_checks_each_file_once_per_run(session: Session, tmp_path: Path):
+    (tmp_path / "good.tif").write_bytes(b"good")
+    add_object_file(session, "good.tif", hashlib.sha256(b"good").digest(), datetime.now())
+    session.commit()
+
+    engine = FixityEngine(storage_root=tmp_path, batch_size=1)
+    batches = list(engine.run(session, older_than=timedelta(days=-1)))
+
+    assert len(batches) == 1
+
+
+def test_fixity_engine_checks_never_checked_files_first(session: Session, tmp_path: Path):
+    (tmp_path / "new.tif").write_bytes(b"new")
+    (tmp_path / "old.tif").write_bytes(b"old")
+    new = add_object_file(session, "new.tif", hashlib.sha256(b"new").digest(), None)
+    add_object_file(session, "old.tif", hashlib.sha256(b"old").digest(), datetime(2000, 1, 1))
+    session.commit()
+
+    engine = FixityEngine(storage_root=tmp_path, batch_size=1)
+    batches = list(engine.run(session, older_than=timedelta(days=30)))
+
+    assert [result.identifier for batch in batches for result in batch.results] == ["new.tif", "old.tif"]
+    session.expire_all()
+    assert new.last_fixity_check is not None
+
+
+def test_fixity_engine_rewrites_checked_objects_documents(session: Session, tmp_path: Path, add_collection):
+    [intellectual_object] = add_collection("amjewess", num_objects=1).objects
+    identifier = intellectual_object.identifier
+    session.execute(update(ObjectFile).values(last_fixity_check=datetime(2000, 1, 1)))
+    list(rebuild_object_documents(session))
+
+    engine = FixityEngine(storage_root=tmp_path)
+    list(engine.run(session, older_than=timedelta(days=30)))
+
+    view = catalog.objects.get_view(session, identifier)
+    intellectual_object = catalog.objects.get(session, identifier)
+    assert isinstance(view, ObjectView)
+    assert view == decode_document(encode_document(load_object_view(session, intellectual_object)))
+    assert all(f.last_fixity_check.year > 2000 for fileset in view.filesets for f in fileset.object_files)
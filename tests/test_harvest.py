@@ -0,0 +1,115 @@
+import json
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from dor.adapters.archive import url_key
+from dor.adapters.shards import ShardRouter
+from dor.models.collection import Collection
+from dor.models.intellectual_object import IntellectualObject
+from dor.services import harvest
+from dor.services.generation import get_generation
+from dor.services.harvest import (
+    JOB_DONE,
+    JOB_FAILED,
+    ImportJobSpec,
+    ImportQueue,
+    get_unfinished_jobs,
+    harvest_collection,
+    queue_import_jobs,
+)
+from dor.telemetry import ImportTelemetry
+
+API_URL = "https://quod.lib.umich.edu/cgi/i/image/api"
+
+
+@pytest.fixture
+def dlxs(tmp_path, monkeypatch, dlxs_collection_factory):
+    """A DLXS host in `tmp_path`: `add` a collection, paged `page_size` manifests at a time."""
+    pages, manifests = {}, {}
+
+    def add(collid: str, num_objects: int, page_size: int = 2):
+        collection_url, responses = dlxs_collection_factory(collid, num_objects, page_size=page_size)
+        for url, data in responses.items():
+            if "manifests" in data:
+                pages[url] = data
+            else:
+                manifests[url] = tmp_path / f"{url_key(url)}.json"
+                manifests[url].write_text(json.dumps(data))
+        return collection_url
+
+    def fetch(url, limiter=None):
+        if url not in pages:
+            raise RuntimeError(f"not found: {url}")
+        return pages[url]
+
+    monkeypatch.setattr(harvest, "fetch", fetch)
+    monkeypatch.setattr(harvest, "fetch_path", lambda url, limiter=None: manifests[url])
+    monkeypatch.setattr(harvest, "is_cached", lambda url: True)
+    return add
+
+
+@pytest.fixture
+def engine(engine_factory):
+    return engine_factory()
+
+
+def count_objects(engine, collid: str) -> int:
+    with Session(engine) as session:
+        return session.execute(
+            select(func.count())
+            .select_from(IntellectualObject)
+            .where(IntellectualObject.alternate_identifiers.startswith(f"{collid}:"))
+        ).scalar_one()
+
+
+def test_harvest_collection_pages_up_to_limit(session: Session, dlxs):
+    collection_url = dlxs("amjewess", num_objects=5)
+    telemetry = ImportTelemetry(collid="amjewess")
+
+    progress = list(harvest_collection(
+        session, "amjewess", collection_url, "types:monograph", limit=3, telemetry=telemetry
+    ))
+
+    assert [(p.page, p.num_processed) for p in progress] == [(1, 1), (1, 2), (2, 3)]
+    [collection] = session.execute(select(Collection)).scalars().all()
+    assert len(collection.objects) == 3
+    assert telemetry.rows["catalog_intellectual_object"] == 3
+    assert get_generation(session) == 1
+
+
+def test_import_queue_runs_jobs_side_by_side(engine, dlxs):
+    urls = {
+        collid: dlxs(collid, num_objects=num_objects)
+        for collid, num_objects in [("amjewess", 5), ("bhl", 3), ("moaahbic", 4)]
+    }
+    urls["missing"] = f"{API_URL}/collection/missing"
+    router = ShardRouter(engines=[engine])
+
+    with router.session() as session:
+        jobs = queue_import_jobs(session.sessions[0], [
+            dict(
+                collid=collid, dlxs_class="image", object_type="types:slide", collection_type="types:box", max_objects=-1
+            )
+            for collid in urls
+        ])
+        specs = [
+            ImportJobSpec(
+                id=job.id, collid=job.collid, collection_url=urls[job.collid], object_type=job.object_type,
+                collection_type=job.collection_type, max_objects=job.max_objects,
+            )
+            for job in jobs
+        ]
+        statuses = ImportQueue(session=session, workers=3).run(specs)
+
+    assert statuses == {"amjewess": JOB_DONE, "bhl": JOB_DONE, "moaahbic": JOB_DONE, "missing": JOB_FAILED}
+    assert [count_objects(engine, collid) for collid in ["amjewess", "bhl", "moaahbic"]] == [5, 3, 4]
+    with Session(engine) as session:
+        [unfinished] = get_unfinished_jobs(session)
+        assert (unfinished.collid, unfinished.num_objects) == ("missing", 0)
+        assert "not found" in unfinished.error
+        values = dict(collid="bhl", dlxs_class="image", object_type="types:slide", collection_type="types:box")
+        assert queue_import_jobs(session, [values]) == []
+        assert [job.collid for job in queue_import_jobs(session, [values], restart=True)] == ["bhl"]
+    router.dispose()
@@ -0,0 +1,70 @@
+import hashlib
+from datetime import datetime
+import uuid
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from dor.cli.main import app
+from dor.services.hashing import hash_files
+from dor.services.ingest import build_intellectual_object_from_package, get_file_function, scan_package
+
+
+@pytest.fixture
+def package_path(tmp_path: Path) -> Path:
+    object_identifier = uuid.uuid4()
+    object_path = tmp_path / str(object_identifier)
+    (object_path / "descriptor").mkdir(parents=True)
+    (object_path / "metadata").mkdir()
+    (object_path / "descriptor" / f"{object_identifier}.types:monograph.mets2.xml").write_text("<mets/>")
+    (object_path / "metadata" / f"{object_identifier}.function:source.json").write_text("{}")
+
+    for index in [2, 1]:
+        fileset_identifier = uuid.uuid4()
+        fileset_path = tmp_path / str(fileset_identifier)
+        for subdirectory in ["descriptor", "data", "metadata"]:
+            (fileset_path / subdirectory).mkdir(parents=True)
+        (fileset_path / "descriptor" / f"{fileset_identifier}.types:fileset.mets2.xml").write_text("<mets/>")
+        (fileset_path / "data" / f"0000000{index}.function:source.format:image.tif").write_bytes(b"tiff" * index)
+        (fileset_path / "metadata" / f"0000000{index}.function:source.format:image.function:technical.mix.xml").write_text("<mix/>")
+    return tmp_path
+
+
+def test_get_file_function_uses_last_function_segment():
+    assert get_file_function(Path("x/metadata/01.function:source.format:image.function:technical.mix.xml")) == "function:technical"
+    assert get_file_function(Path("x/data/01.function:source.format:image.tif")) == "function:source"
+    assert get_file_function(Path("x/descriptor/x.types:fileset.mets2.xml")) == "function:descriptor"
+
+
+def test_scan_package_finds_object_and_ordered_filesets(package_path: Path):
+    package = scan_package(package_path, root=package_path)
+
+    assert package.object.type == "types:monograph"
+    assert len(package.object.files) == 2
+    assert [fileset.data_files[0].path.name[:8] for fileset in package.filesets] == ["00000001", "00000002"]
+    assert package.filesets[0].data_files[0].file_format == "image/tiff"
+
+
+def test_build_intellectual_object_from_package_uses_real_digests(package_path: Path):
+    package = scan_package(package_path, root=package_path)
+    hashes = {file_hash.path: file_hash for file_hash in hash_files([f.path for f in package.files], workers=2)}
+
+    intellectual_object = build_intellectual_object_from_package(
+        package, hashes, alternate_identifier="book", title="A Book", started_at=datetime.now()
+    )
+
+    source = intellectual_object.filesets[1].source_object_file
+    assert source.identifier.startswith(f"{package.filesets[1].identifier}/data/")
+    assert source.size == 8
+    assert source.digest == hashlib.sha256(b"tifftiff").digest()
+    assert intellectual_object.filesets[0].order_label == "#1"
+
+
+def test_ingest_into_unknown_collection(package_path: Path, cli_catalog):
+    runner = CliRunner()
+    runner.invoke(app, ["catalog", "initialize"])
+    result = runner.invoke(app, ["catalog", "ingest", str(package_path), "--collid", "nosuchcoll"])
+
+    assert result.exit_code == 1
+    assert "nosuchcoll is not in the catalog" in result.output
@@ -0,0 +1,53 @@
+import json
+
+from dor.builder import build_intellectual_object
+from dor.manifest import open_manifest, read_header
+
+
+def test_open_manifest_streams_canvases(tmp_path, manifest_factory):
+    manifest_data = manifest_factory("amjewess:0001", 25)
+    path = tmp_path / "manifest.json"
+    path.write_text(json.dumps(manifest_data))
+
+    with open_manifest(path) as streamed:
+        assert streamed.header["@id"] == manifest_data["@id"]
+        assert "sequences" not in streamed.header
+        assert list(streamed.canvases) == manifest_data["sequences"][0]["canvases"]
+
+
+def test_open_manifest_reads_the_first_sequence(tmp_path, manifest_factory):
+    manifest_data = manifest_factory("amjewess:0001", 3)
+    other_sequence = manifest_factory("amjewess:0002", 2)["sequences"][0]
+    manifest_data["sequences"].append(other_sequence)
+    path = tmp_path / "manifest.json"
+    path.write_text(json.dumps(manifest_data))
+
+    with open_manifest(path) as streamed:
+        assert list(streamed.canvases) == manifest_data["sequences"][0]["canvases"]
+
+
+def test_read_header_after_sequences(tmp_path, manifest_factory):
+    manifest_data = manifest_factory("amjewess:0001", 3)
+    reordered = {"sequences": manifest_data["sequences"]} | {
+        key: value for key, value in manifest_data.items() if key != "sequences"
+    }
+    path = tmp_path / "manifest.json"
+    path.write_text(json.dumps(reordered))
+
+    assert read_header(path) == {key: value for key, value in manifest_data.items() if key != "sequences"}
+
+
+def test_build_from_streamed_manifest(tmp_path, manifest_factory):
+    manifest_data = manifest_factory("amjewess:0001", 4)
+    path = tmp_path / "manifest.json"
+    path.write_text(json.dumps(manifest_data))
+
+    with open_manifest(path) as streamed:
+        intellectual_object = build_intellectual_object(
+            "amjewess", streamed.header, "types:monograph", canvases=streamed.canvases
+        )
+
+    assert intellectual_object.alternate_identifiers == "amjewess:0001"
+    assert [fileset.order_label for fileset in intellectual_object.filesets] == [
+        canvas["label"].removeprefix("Page ") for canvas in manifest_data["sequences"][0]["canvases"]
+    ]
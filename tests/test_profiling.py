@@ -0,0 +1,30 @@
+from dor.profiling import profile_alloc, profile_cpu
+
+
+def fibonacci(n: int) -> int:
+    return n if n < 2 else fibonacci(n - 1) + fibonacci(n - 2)
+
+
+def allocate() -> list[bytes]:
+    return [bytes(1000) for _ in range(1000)]
+
+
+def test_profile_cpu():
+    with profile_cpu() as result:
+        fibonacci(18)
+
+    assert "fibonacci" in result.report
+    stacks = dict(line.rsplit(" ", 1) for line in result.collapsed)
+    # recursion is folded into the outermost call
+    [stack] = [stack for stack in stacks if stack.startswith("fibonacci")]
+    assert stack == "fibonacci (test_profiling.py:4)"
+    assert int(stacks[stack]) > 0
+
+
+def test_profile_alloc():
+    with profile_alloc() as result:
+        kept = allocate()
+
+    assert "test_profiling.py" in result.report
+    assert any("test_profiling.py" in line and int(line.rsplit(" ", 1)[1]) >= 1_000_000 for line in result.collapsed)
+    assert len(kept) == 1000
@@ -0,0 +1,43 @@
+import pytest
+import sqlalchemy
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from dor.adapters.sqlalchemy import Base
+from dor.builder import build_collection, build_intellectual_object
+from dor.models.checksum import Checksum
+from dor.models.collection import Collection
+from dor.models.fileset import Fileset
+from dor.models.intellectual_object import IntellectualObject
+from dor.models.object_file import ObjectFile
+from dor.models.premis_event import PremisEvent
+from dor.services.purge import purge_collection
+
+
+@pytest.fixture
+def session():
+    engine = sqlalchemy.create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
+def test_purge_collection_deletes_in_chunks(session: Session, manifest_factory):
+    collection = build_collection(
+        {"@id": "https://example.org/collection/amjewess", "label": "American Jewess", "attribution": ""},
+        "types:box"
+    )
+    session.add(collection)
+    for index in range(3):
+        intellectual_object = build_intellectual_object(
+            "amjewess", manifest_factory(f"amjewess:{index}", num_canvases=2), "types:monograph"
+        )
+        collection.objects.append(intellectual_object)
+    session.commit()
+
+    progress = list(purge_collection(session, "amjewess", chunk_size=2))
+
+    assert [p.objects for p in progress] == [2, 3]
+    assert progress[-1].total_objects == 3
+    for model in [IntellectualObject, Fileset, ObjectFile, Checksum, PremisEvent, Collection]:
+        assert session.execute(select(func.count()).select_from(model)).scalar_one() == 0
@@ -0,0 +1,155 @@
+from contextlib import contextmanager, nullcontext
+
+import pytest
+import sqlalchemy
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from dor.adapters.sqlalchemy import Base
+from dor.benchmark import BenchmarkTargets, build_synthetic_catalog, make_manager_benchmarks, select_targets
+from dor.config import config
+from dor.entrypoints.api import main
+from dor.entrypoints.api.dependencies import get_db_session
+from dor.entrypoints.api.main import app
+from dor.models.object_document import ObjectDocument
+from dor.services.documents import DOCUMENT_VERSION
+from dor.telemetry import count_statements
+
+# the most statements each may execute, whatever the size of the object;
+# lower these as paths get cheaper, never raise them to make a test pass
+ROUTE_BUDGETS = {
+    "/admin/console/collections/": 2,
+    "/admin/console/collections/{collection}/stats": 3,
+    "/admin/console/objects/": 5,
+    "/admin/console/objects/?collection_alt_identifier={collid}&object_type=types:monograph": 5,
+    "/admin/console/objects/{object}/": 1,
+    "/admin/console/objects/{object}/ (json)": 1,
+    "/admin/console/objects/{object}/filesets?fileset_start=5": 3,
+    "/admin/console/objects/{undocumented_object}/": 8,
+    "/admin/console/objects/{undocumented_object}/ (json)": 9,
+    "/admin/console/events/": 4,
+    "/admin/console/events/?event_type={event_type}": 4,
+    "/admin/console/events/{event}": 2,
+    "/admin/console/duplicates/": 4,
+}
+
+MANAGER_BUDGETS = {
+    "objects.find": 2,
+    "objects.find (filtered)": 2,
+    "objects.find (deep page)": 2,
+    "objects.get": 1,
+    "objects.get (document)": 1,
+    "objects.get_document": 1,
+    "objects.sample": 2,
+    "objects.get_distinct_types": 1,
+    "collections.find": 2,
+    "collections.get": 1,
+    "collections.get_stats": 2,
+    "filesets.find": 2,
+    "filesets.get_object_summary": 1,
+    "filesets.get_views": 3,
+    "filesets.summarize": 1,
+    "events.get": 1,
+    "events.get_distinct_types": 1,
+    "events.timeline": 1,
+    "events.stream": 1,
+    "duplicates.find": 2,
+    "duplicates.get_totals": 1,
+    "duplicates.get_files": 1,
+    "duplicates.stream": 1,
+}
+
+NUM_FILESETS = [10, 1000]
+
+
+@pytest.fixture(scope="module")
+def catalogs(tmp_path_factory) -> dict[int, tuple[sqlalchemy.Engine, BenchmarkTargets]]:
+    """Two catalogs that differ only in how many filesets their object has."""
+    catalogs = {}
+    for num_filesets in NUM_FILESETS:
+        path = tmp_path_factory.mktemp("budgets") / f"{num_filesets}.sqlite3"
+        engine = sqlalchemy.create_engine(f"sqlite:///{path}")
+        Base.metadata.create_all(engine)
+        with Session(engine) as session, config.console.capture():
+            build_synthetic_catalog(session, num_collections=1, num_objects=1, num_canvases=num_filesets)
+            catalogs[num_filesets] = (engine, select_targets(session))
+    yield catalogs
+    for engine, _ in catalogs.values():
+        engine.dispose()
+
+
+@contextmanager
+def documents_hidden(engine: sqlalchemy.Engine):
+    """Serves objects from the models, as if they had no documents."""
+    with engine.begin() as connection:
+        connection.execute(update(ObjectDocument).values(version=DOCUMENT_VERSION - 1))
+    try:
+        yield
+    finally:
+        with engine.begin() as connection:
+            connection.execute(update(ObjectDocument).values(version=DOCUMENT_VERSION))
+
+
+def count_route_statements(client: TestClient, engine: sqlalchemy.Engine, targets: BenchmarkTargets, route: str) -> int:
+    path, json = route.removesuffix(" (json)"), route.endswith(" (json)")
+    path = path.format(
+        collection=targets.collection_identifiers[0],
+        collid=targets.collection_alt_identifiers[0],
+        object=targets.object_identifiers[0],
+        undocumented_object=targets.object_identifiers[0],
+        event=targets.event_identifiers[0],
+        event_type=targets.event_types[0],
+    )
+
+    def get_budget_session():
+        with Session(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_db_session] = get_budget_session
+    try:
+        with documents_hidden(engine) if "{undocumented_object}" in route else nullcontext():
+            with count_statements(engine) as log:
+                response = client.get(path, headers={"accept": "application/json"} if json else {})
+    finally:
+        app.dependency_overrides.clear()
+    assert response.status_code == 200, path
+    return log.count
+
+
+@pytest.fixture(scope="module")
+def client(catalogs):
+    # the lifespan warms the configured engine; point it at a budget catalog
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(main, "get_engine", lambda: catalogs[NUM_FILESETS[0]][0])
+        with TestClient(app) as client:
+            yield client
+
+
+@pytest.mark.parametrize("route", ROUTE_BUDGETS)
+def test_route_statement_budget(client, catalogs, route):
+    counts = {
+        num_filesets: count_route_statements(client, engine, targets, route)
+        for num_filesets, (engine, targets) in catalogs.items()
+    }
+
+    assert len(set(counts.values())) == 1, f"statements grow with filesets: {counts}"
+    assert counts[NUM_FILESETS[0]] <= ROUTE_BUDGETS[route]
+
+
+@pytest.mark.parametrize("name", MANAGER_BUDGETS)
+def test_manager_statement_budget(catalogs, name):
+    counts = {}
+    for num_filesets, (engine, targets) in catalogs.items():
+        call = make_manager_benchmarks(targets)[name]
+        with Session(engine) as session, count_statements(engine) as log:
+            call(session, 0)
+        counts[num_filesets] = log.count
+
+    assert len(set(counts.values())) == 1, f"statements grow with filesets: {counts}"
+    assert counts[NUM_FILESETS[0]] <= MANAGER_BUDGETS[name]
+
+
+def test_every_manager_method_has_a_budget(catalogs):
+    _, targets = catalogs[NUM_FILESETS[0]]
+    assert make_manager_benchmarks(targets).keys() == MANAGER_BUDGETS.keys()
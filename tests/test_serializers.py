@@ -0,0 +1,63 @@
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from dor.models.checksum import Checksum
+from dor.models.premis_event import PremisEvent
+from dor.serializers import ModelSerializer, dumps, premis_event_serializer, serializers
+from dor.services.documents import load_object_view
+from dor.utils import converter
+
+
+def test_dumps_matches_converter(session: Session, add_collection):
+    [intellectual_object] = add_collection("amjewess", num_objects=1).objects
+    view = load_object_view(session, intellectual_object)
+
+    assert json.loads(dumps(view)) == converter.unstructure(view)
+
+
+def test_dumps_values():
+    assert dumps({
+        "naive": datetime(2024, 1, 31, 12, 0, 0, 123456),
+        "aware": datetime(2024, 1, 31, 12, 0, 0, tzinfo=timezone.utc),
+        "identifier": UUID(int=1),
+        "digest": b"\x01\xff",
+        "sum": Decimal("42"),
+    }) == (
+        b'{"naive":"2024-01-31T12:00:00Z","aware":"2024-01-31T12:00:00Z",'
+        b'"identifier":"00000000-0000-0000-0000-000000000001","digest":"01ff","sum":42}'
+    )
+
+
+def test_every_model_column(session: Session, add_collection):
+    add_collection("amjewess", num_objects=1)
+
+    for model, serializer in serializers.items():
+        instance = session.scalars(select(model).limit(1)).one()
+        assert serializer.to_dict(instance).keys() == {column.name for column in model.__table__.columns}
+        json.loads(serializer.dumps(instance))
+
+    checksum = session.scalars(select(Checksum).limit(1)).one()
+    assert json.loads(serializers[Checksum].dumps(checksum))["digest"] == checksum.digest.hex()
+
+
+def test_rows_match_instances(session: Session, add_collection):
+    add_collection("amjewess", num_objects=1)
+    events = session.scalars(select(PremisEvent).order_by(PremisEvent.id)).all()
+    rows = session.execute(select(PremisEvent.__table__).order_by(PremisEvent.id)).all()
+
+    assert premis_event_serializer.dumps_many(rows) == premis_event_serializer.dumps_many(events)
+    assert events[0].to_dict() == premis_event_serializer.to_dict(rows[0])
+
+
+def test_dumps_lines_excludes(session: Session, add_collection):
+    add_collection("amjewess", num_objects=1)
+    rows = session.execute(select(PremisEvent.id, PremisEvent.identifier).order_by(PremisEvent.id)).all()
+
+    lines = list(ModelSerializer(PremisEvent, exclude=("id",)).dumps_lines(rows))
+
+    assert lines == [b'{"identifier":"%s"}\n' % str(row.identifier).encode() for row in rows]
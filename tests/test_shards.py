@@ -0,0 +1,126 @@
+from contextlib import ExitStack
+
+import pytest
+from sqlalchemy import select
+
+from dor.adapters.shards import ShardRouter, ShardedSession
+from dor.models.intellectual_object import IntellectualObject
+from dor.models.object_file import ObjectFile
+from dor.services.catalog import catalog
+from dor.services.harvest import add_collection
+from dor.services.stats import apply_stat_deltas, count_object_stats
+from dor.telemetry import count_statements
+
+NUM_SHARDS = 3
+
+
+@pytest.fixture
+def sharded_session(engine_factory, manifest_factory):
+    from dor.builder import build_collection, build_intellectual_object
+
+    engines = [engine_factory(f"shard{shard}") for shard in range(NUM_SHARDS)]
+    router = ShardRouter(engines=engines)
+
+    with router.session() as session:
+        for collid in ["amjewess", "bhl"]:
+            shard_collections = add_collection(session, build_collection(
+                {"@id": f"https://example.org/collection/{collid}", "label": collid, "attribution": ""},
+                "types:box"
+            ))
+            for index in range(6):
+                intellectual_object = build_intellectual_object(
+                    collid, manifest_factory(f"{collid}:{index:04d}", num_canvases=2), "types:monograph"
+                )
+                shard = router.shard_for(intellectual_object.bin_identifier)
+                stats = count_object_stats(intellectual_object)
+                shard_collections[shard].objects.append(intellectual_object)
+                session.sessions[shard].flush()
+                apply_stat_deltas(session.sessions[shard], shard_collections[shard].id, stats)
+            session.commit()
+        yield session
+    router.dispose()
+
+
+def test_objects_live_on_their_shard(sharded_session: ShardedSession):
+    counts = []
+    for shard, shard_session in enumerate(sharded_session.sessions):
+        bins = shard_session.execute(select(IntellectualObject.bin_identifier)).scalars().all()
+        assert all(sharded_session.router.shard_for(bin_identifier) == shard for bin_identifier in bins)
+        counts.append(len(bins))
+
+    assert sum(counts) == 12 and max(counts) < 12
+    assert catalog.collections.find(sharded_session).total_items == 2
+
+
+def test_find_merges_shards_in_order(sharded_session: ShardedSession):
+    page = catalog.objects.find(sharded_session, limit=100)
+    deep_page = catalog.objects.find(sharded_session, start=4, limit=5)
+
+    assert page.total_items == 12
+    alternate_identifiers = [row.alternate_identifiers for row in page.items]
+    assert alternate_identifiers == sorted(alternate_identifiers)
+    assert deep_page.items == page.items[4:9]
+    assert catalog.objects.find(sharded_session, collection_alt_identifier="bhl").total_items == 6
+
+
+def test_point_lookups_touch_one_shard(sharded_session: ShardedSession):
+    [row] = catalog.objects.find(sharded_session, limit=1).items
+    shard = sharded_session.router.shard_for(row.identifier)
+
+    with ExitStack() as stack:
+        logs = [
+            stack.enter_context(count_statements(engine)) for engine in sharded_session.router.engines
+        ]
+        view = catalog.objects.get_view(sharded_session, row.identifier)
+        filesets = catalog.filesets.find(sharded_session, row.identifier)
+        summary = catalog.filesets.get_object_summary(sharded_session, row.identifier)
+        rows = list(catalog.filesets.summarize(sharded_session, summary.id, bin_identifier=summary.bin_identifier))
+
+    assert view.identifier == row.identifier
+    assert filesets.total_items == len(rows) == 2
+    assert [log.count > 0 for log in logs] == [index == shard for index in range(NUM_SHARDS)]
+    with pytest.raises(ValueError):
+        list(catalog.filesets.summarize(sharded_session, summary.id))
+
+
+def test_timeline_pages_across_shards(sharded_session: ShardedSession):
+    streamed = [row.identifier for row in catalog.events.stream(sharded_session)]
+    paged, cursor = [], None
+    while True:
+        page = catalog.events.timeline(sharded_session, cursor=cursor, limit=7)
+        paged += page.items
+        if not page.next_cursor:
+            break
+        cursor = page.next_cursor
+
+    assert [row.identifier for row in paged] == streamed
+    assert len(set(streamed)) == len(streamed) > 7
+    date_times = [row.date_time for row in paged]
+    assert date_times == sorted(date_times)
+    assert catalog.events.get(sharded_session, paged[-1].identifier).identifier == paged[-1].identifier
+
+
+def test_collection_stats_add_up(sharded_session: ShardedSession):
+    collection = next(c for c in catalog.collections.find(sharded_session).items if c.alternate_identifiers == "bhl")
+
+    stats = catalog.collections.get_stats(sharded_session, collection.identifier)
+
+    assert (stats.totals.num_objects, stats.totals.num_filesets) == (6, 12)
+    assert stats.by_object_type["types:monograph"].num_objects == 6
+
+
+def test_duplicates_across_shards(sharded_session: ShardedSession):
+    shards = [s for s in sharded_session.sessions if s.execute(select(ObjectFile.id)).first()][:2]
+    object_files = [s.execute(select(ObjectFile).order_by(ObjectFile.id).limit(1)).scalar_one() for s in shards]
+    for object_file, shard_session in zip(object_files, shards):
+        object_file.digest = b"\x01" * 32
+        object_file.size = 1000
+        shard_session.commit()
+
+    page = catalog.duplicates.find(sharded_session)
+
+    assert page.total_items == 1
+    [duplicate] = page.items
+    assert (duplicate.num_files, duplicate.num_objects, duplicate.reclaimable_bytes) == (2, 2, 1000)
+    assert catalog.duplicates.get_totals(sharded_session).num_files == 2
+    assert len(catalog.duplicates.get_files(sharded_session, [b"\x01" * 32])[b"\x01" * 32]) == 2
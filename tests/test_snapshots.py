@@ -0,0 +1,63 @@
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+import sqlalchemy
+from sqlalchemy import func, select
+
+from dor.adapters.snapshots import (
+    SnapshotEngine, list_snapshots, prune_snapshots, publish_snapshot, read_current_snapshot
+)
+from dor.config import config
+from dor.models.collection import Collection
+
+
+@pytest.fixture
+def staging(engine_factory):
+    return engine_factory("staging")
+
+
+def count_collections(engine) -> int:
+    with engine.connect() as connection:
+        return connection.execute(select(func.count()).select_from(Collection)).scalar_one()
+
+
+def add_collection(engine, alternate_identifier: str):
+    with sqlalchemy.orm.Session(engine) as session:
+        session.add(Collection(
+            identifier=uuid4(),
+            alternate_identifiers=alternate_identifier,
+            type="types:box",
+            created_at=datetime.now(),
+            updated_at=datetime.now(),
+            title=alternate_identifier,
+            description="",
+        ))
+        session.commit()
+
+
+def test_publish_and_swap_snapshots(staging, tmp_path):
+    root = tmp_path / "snapshots"
+    snapshots = SnapshotEngine(root=root, create_engine=config.create_snapshot_engine)
+    with pytest.raises(RuntimeError):
+        snapshots.get()
+
+    add_collection(staging, "amjewess")
+    first = publish_snapshot(staging, root)
+    assert read_current_snapshot(root) == first
+    assert count_collections(snapshots.get()) == 1
+
+    with pytest.raises(sqlalchemy.exc.OperationalError):
+        with snapshots.get().begin() as connection:
+            connection.execute(sqlalchemy.delete(Collection))
+
+    # readers keep the published snapshot until the next one
+    add_collection(staging, "bhl")
+    assert count_collections(snapshots.get()) == 1
+    second = publish_snapshot(staging, root)
+    assert count_collections(snapshots.get()) == 2
+    assert snapshots.path == second
+
+    third = publish_snapshot(staging, root, keep=1)
+    assert list_snapshots(root) == [third]
+    assert prune_snapshots(root, keep=1) == []
@@ -0,0 +1,59 @@
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from dor.models.collection_stat import CollectionStat
+from dor.services.catalog import catalog
+from dor.services.purge import purge_collection, purge_objects
+from dor.services.stats import apply_stat_deltas, count_object_stats, rebuild_collection_stats
+
+
+def read_stats(session: Session) -> set[tuple]:
+    return {
+        (row.collection_id, row.dimension, row.key, row.num_objects, row.num_filesets, row.num_files, row.num_bytes)
+        for row in session.execute(select(CollectionStat)).scalars()
+    }
+
+
+def test_incremental_stats_match_rebuild(session: Session, add_collection):
+    collection = add_collection("amjewess", num_objects=3, num_canvases=2)
+    add_collection("bhl", num_objects=1, num_canvases=4, object_type="types:slide")
+    for intellectual_object in collection.objects:
+        apply_stat_deltas(session, collection.id, count_object_stats(intellectual_object))
+    session.commit()
+    incremental = read_stats(session)
+
+    rebuild_collection_stats(session, [collection.id])
+    assert read_stats(session) == incremental
+
+    stats = catalog.collections.get_stats(session, collection.identifier)
+    assert stats.totals.num_objects == 3
+    assert stats.totals.num_filesets == 6
+    assert stats.totals.num_bytes == sum(
+        object_file.size
+        for intellectual_object in collection.objects
+        for object_file in [*intellectual_object.object_files, *(
+            f for fileset in intellectual_object.filesets for f in fileset.object_files
+        )]
+    )
+    assert {key: counts.num_objects for key, counts in stats.by_object_type.items()} == {"types:monograph": 3}
+    assert sum(counts.num_files for counts in stats.by_file_format.values()) == stats.totals.num_files
+
+
+def test_purge_subtracts_stats(session: Session, add_collection):
+    collection = add_collection("amjewess", num_objects=3)
+    rebuild_collection_stats(session)
+    first = collection.objects[0]
+    before = catalog.collections.get_stats(session, collection.identifier)
+
+    purge_objects(session, [first.id])
+    session.commit()
+
+    after = catalog.collections.get_stats(session, collection.identifier)
+    assert after.totals.num_objects == 2
+    assert after.totals.num_files < before.totals.num_files
+    remaining = read_stats(session)
+    rebuild_collection_stats(session)
+    assert read_stats(session) == remaining
+
+    list(purge_collection(session, "amjewess"))
+    assert read_stats(session) == set()
@@ -0,0 +1,52 @@
+import pytest
+from sqlalchemy import inspect
+
+from dor.adapters.sqlalchemy import Base, bulk_load, get_secondary_indexes
+from dor.config import config
+from dor.models.object_file import ObjectFile
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = config.create_database_engine(
+        f"sqlite:///{tmp_path / 'catalog.sqlite3'}", connect_args={"timeout": 0.1}
+    )
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+def index_names(connection) -> set[str]:
+    inspector = inspect(connection)
+    return {index["name"] for table_name in inspector.get_table_names() for index in inspector.get_indexes(table_name)}
+
+
+def test_bulk_load_defers_indexes_until_the_end(engine):
+    secondary = {index.name for index in get_secondary_indexes()}
+    assert secondary
+
+    with engine.connect() as connection:
+        with bulk_load(connection):
+            assert not secondary & index_names(connection)
+            assert connection.exec_driver_sql("PRAGMA journal_mode").scalar() == "memory"
+        assert secondary <= index_names(connection)
+        assert connection.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+
+
+def test_bulk_load_keeps_indexes_while_others_read(engine):
+    secondary = {index.name for index in get_secondary_indexes()}
+
+    with engine.connect() as reader, engine.connect() as connection:
+        reader.exec_driver_sql(f"SELECT count(*) FROM {ObjectFile.__tablename__}").scalar()
+        with pytest.warns(RuntimeWarning, match="stays in wal journal mode"), bulk_load(connection):
+            assert secondary <= index_names(connection)
+
+
+def test_bulk_load_restores_indexes_a_killed_load_dropped(engine):
+    [index, *_] = ObjectFile.__table__.indexes
+
+    with engine.connect() as connection:
+        index.drop(connection)
+        connection.commit()
+        with bulk_load(connection, defer_indexes=False):
+            assert index.name in index_names(connection)
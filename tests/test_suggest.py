@@ -0,0 +1,90 @@
+import random
+import string
+import time
+
+import pytest
+import sqlalchemy
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from dor.adapters.sqlalchemy import Base
+from dor.benchmark import build_synthetic_catalog
+from dor.config import config
+from dor.entrypoints.api import main
+from dor.services.generation import bump_generation, get_generation
+from dor.services.suggest import PrefixIndex, build_suggestions, refresh_suggestions
+
+
+@pytest.fixture
+def engine(engine_factory):
+    engine = engine_factory()
+    with Session(engine) as session, config.console.capture():
+        build_synthetic_catalog(session, num_collections=2, num_objects=10, num_canvases=1)
+    return engine
+
+
+def test_prefix_index_search():
+    index = PrefixIndex(["bhl:0002", "BHL:0001", "amjewess:0001", "bhl:0002", None, "", "bhlx"])
+
+    assert len(index) == 4
+    assert index.search("bhl:") == ["BHL:0001", "bhl:0002"]
+    assert index.search("Bhl", limit=2) == ["BHL:0001", "bhl:0002"]
+    assert index.search("") == ["amjewess:0001", "BHL:0001", "bhl:0002", "bhlx"]
+    assert index.search("zzz") == []
+    assert PrefixIndex([]).search("a") == []
+
+
+def test_prefix_index_search_is_fast_at_size():
+    rng = random.Random(1)
+    values = [
+        f"{''.join(rng.choices(string.ascii_lowercase, k=6))}:{number:07d}" for number in range(200_000)
+    ]
+    index = PrefixIndex(values)
+    prefixes = [value[:rng.randint(1, 10)] for value in rng.sample(values, 1000)]
+
+    started_at = time.perf_counter()
+    results = [index.search(prefix) for prefix in prefixes]
+    elapsed = (time.perf_counter() - started_at) / len(prefixes)
+
+    assert all(results) and all(result[0].startswith(prefix) for prefix, result in zip(prefixes, results))
+    assert elapsed < 0.005
+
+
+def test_suggestions_follow_generation(engine):
+    with Session(engine) as session:
+        suggestions = build_suggestions(session)
+        collection = suggestions.search("collection", "")[0]
+
+        assert refresh_suggestions(session, suggestions) is suggestions
+        bump_generation(session)
+        session.commit()
+        refreshed = refresh_suggestions(session, suggestions)
+
+    assert len(suggestions.indexes["alt_identifier"]) == 10
+    assert len(suggestions.search("alt_identifier", collection, limit=50)) == 5
+    assert refreshed is not suggestions
+    assert refreshed.generation == suggestions.generation + 1
+
+
+def test_generation_starts_at_zero(tmp_path):
+    engine = sqlalchemy.create_engine(f"sqlite:///{tmp_path / 'empty.sqlite3'}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        assert get_generation(session) == 0
+        bump_generation(session)
+        bump_generation(session)
+        assert get_generation(session) == 2
+
+
+def test_suggest_route(engine, monkeypatch):
+    monkeypatch.setattr(main, "get_engine", lambda: engine)
+
+    with TestClient(main.app) as client:
+        [alt_identifier] = main.app.state.suggestions.search("alt_identifier", "", limit=1)
+        response = client.get("/admin/console/suggest", params={
+            "field": "alt_identifier", "prefix": alt_identifier.upper(),
+        })
+        invalid = client.get("/admin/console/suggest", params={"field": "nope"})
+
+    assert response.json()["suggestions"] == [alt_identifier]
+    assert invalid.status_code == 422
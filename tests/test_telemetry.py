@@ -0,0 +1,66 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from pathlib import Path
+
+import sqlalchemy
+
+from dor.telemetry import ImportTelemetry, count_context_statements, percentile
+
+
+def test_percentile_uses_nearest_rank():
+    values = [0.5, 0.1, 0.4, 0.2, 0.3]
+
+    assert percentile(values, 50) == 0.3
+    assert percentile(values, 95) == 0.5
+    assert percentile([], 50) == 0.0
+
+
+def test_telemetry_records_stages_per_manifest():
+    telemetry = ImportTelemetry(collid="amjewess")
+    manifest = telemetry.start_manifest("https://example.org/manifest/1", cached=True)
+    manifest.canvases = 3
+
+    with telemetry.measure("build", manifest):
+        pass
+
+    assert manifest.cache == "hit"
+    assert "build" in manifest.stages
+    assert telemetry.summarize_stages()["build"]["count"] == 1
+    assert telemetry.num_canvases == 3
+
+
+def test_telemetry_writes_report(tmp_path: Path):
+    telemetry = ImportTelemetry(collid="amjewess")
+    telemetry.start_manifest("https://example.org/manifest/1", cached=False)
+    telemetry.rows["catalog_fileset"] += 2
+    telemetry.finish()
+
+    report_path = tmp_path / "report.json"
+    telemetry.write_report(report_path)
+
+    report = json.loads(report_path.read_text())
+    assert report["objects"] == 1
+    assert report["rows"] == {"catalog_fileset": 2}
+    assert report["manifests"][0]["cache"] == "miss"
+
+
+def test_count_context_statements_counts_only_its_context():
+    engines = [sqlalchemy.create_engine("sqlite://") for _ in range(2)]
+    select_one = sqlalchemy.text("SELECT 1")
+
+    def run(engine):
+        with engine.connect() as connection:
+            connection.execute(select_one)
+
+    with count_context_statements() as log, ThreadPoolExecutor(max_workers=1) as executor:
+        for engine in engines:
+            executor.submit(copy_context().run, run, engine).result()
+        # another request's thread, which doesn't share the context
+        outside = threading.Thread(target=run, args=(engines[0],))
+        outside.start()
+        outside.join()
+
+    assert log.count == 2
+    assert all(duration is not None for duration in log.durations)
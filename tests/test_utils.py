@@ -1,8 +1,9 @@
 from dataclasses import dataclass
+from datetime import datetime
 
 import pytest
 
-from dor.utils import Filter, FilterLabel, Page, remove_parameter
+from dor.utils import Filter, FilterLabel, HostRateLimiter, Page, TokenBucket, decode_cursor, encode_cursor, remove_parameter
 
 
 @pytest.fixture
@@ -86,3 +87,54 @@ def test_page_updates_offsets_at_end_of_range(dummy_items: list[DummyItem]):
 
     assert page.previous_offset == 5
     assert page.next_offset == -1
+
+
+# TokenBucket
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_token_bucket_allows_burst_up_to_capacity():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=10, capacity=10, clock=clock, sleep=clock.sleep)
+
+    assert bucket.acquire(10) == 0.0
+    assert clock.sleeps == []
+
+
+def test_token_bucket_waits_when_empty():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=10, capacity=10, clock=clock, sleep=clock.sleep)
+
+    bucket.acquire(10)
+    bucket.acquire(5)
+
+    assert clock.sleeps == [0.5]
+
+
+def test_host_rate_limiter_shares_a_bucket_per_host():
+    clock = FakeClock()
+    limiter = HostRateLimiter(rate=2, clock=clock, sleep=clock.sleep)
+
+    for path in ["a", "b", "c"]:
+        limiter.acquire(f"https://quod.lib.umich.edu/cgi/i/image/api/{path}")
+    limiter.acquire("https://other.example.org/api")
+
+    assert clock.sleeps == [0.5]
+
+
+def test_cursor_round_trip():
+    date_time = datetime(2024, 5, 6, 7, 8, 9, 123456)
+    assert decode_cursor(encode_cursor(date_time, 42)) == (date_time, 42)
+    with pytest.raises(ValueError):
+        decode_cursor("not a cursor")